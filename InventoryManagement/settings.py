@@ -15,6 +15,7 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 import dj_database_url
 
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
+    "django.contrib.postgres",
     # Cloudinary
     "cloudinary_storage",
     "django.contrib.staticfiles",
@@ -70,9 +72,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "InventoryManagement.utils.compression.CompressionMiddleware",  # br / gzip responses
     "debug_toolbar.middleware.DebugToolbarMiddleware",  # Debug toolbar
+    "InventoryManagement.utils.query_metrics.QueryMetricsMiddleware",  # Query count and timings
     "corsheaders.middleware.CorsMiddleware",  # Cors Header
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Whitenoise
+    "InventoryManagement.utils.db_router.ReadReplicaMiddleware",  # Read replica routing
     "easyaudit.middleware.easyaudit.EasyAuditMiddleware",  # Easy audit
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -83,11 +88,120 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Category catalog
+# List pages kept CATEGORY_CACHE_TIMEOUT seconds in the cache (dropped on any
+# category change) and CATEGORY_CACHE_MAX_AGE seconds by browsers and proxies
+CATEGORY_CACHE_TIMEOUT = int(os.environ.get("CATEGORY_CACHE_TIMEOUT", 3600))
+CATEGORY_CACHE_MAX_AGE = int(os.environ.get("CATEGORY_CACHE_MAX_AGE", 60))
+
+# Product fragments
+# Serialized products kept PRODUCT_FRAGMENT_CACHE_TIMEOUT seconds in the cache,
+# keyed on their modified_at (0 turns it off)
+PRODUCT_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_FRAGMENT_CACHE_TIMEOUT", 3600))
+
+# Compiled list serializers
+# Product, order and employee lists rendered from values_list() rows
+# (warehouse_app.compiled) instead of model instances and DRF fields
+COMPILED_LIST_SERIALIZERS = os.environ.get("COMPILED_LIST_SERIALIZERS", "True") == "True"
+
+# Exports
+# Rows of the product and order exports read (server-side cursor) and written
+# EXPORT_CHUNK_SIZE at a time
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+# Employee imports
+# Most employees a single POST /employees/import/ may create
+EMPLOYEE_IMPORT_MAX_ROWS = int(os.environ.get("EMPLOYEE_IMPORT_MAX_ROWS", 1000))
+# Most employees a single bulk block / unblock / set-manager / set-employee may change
+EMPLOYEE_BULK_ACTION_MAX_IDS = int(os.environ.get("EMPLOYEE_BULK_ACTION_MAX_IDS", 1000))
+
+# Product imports
+# Rows of POST /products/import/ validated and saved together, each chunk in its own transaction
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.environ.get("PRODUCT_IMPORT_CHUNK_SIZE", 1000))
+# Most row errors listed in the response, the failed count has them all
+PRODUCT_IMPORT_MAX_ERRORS = int(os.environ.get("PRODUCT_IMPORT_MAX_ERRORS", 1000))
+
+# Response compression
+# br or gzip, as negotiated with Accept-Encoding, for bodies of at least
+# COMPRESSION_MIN_SIZE bytes. COMPRESSION_LEVELS overrides the levels per media
+# type or type ({"br": quality 0-11, "gzip": level 1-9}), None skips the type
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 5))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_LEVELS = {
+    # Already compressed
+    "image/*": None,
+    "image/svg+xml": {},
+    "audio/*": None,
+    "video/*": None,
+    "font/woff": None,
+    "font/woff2": None,
+    "application/zip": None,
+    "application/gzip": None,
+    "application/pdf": None,
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": None,
+    # Large streamed exports: faster levels
+    "text/csv": {"br": 4, "gzip": 5},
+    "application/x-ndjson": {"br": 4, "gzip": 5},
+}
+
+# Query metrics
+# Query count, database time and total time of every request, sent as response
+# headers (QUERY_METRICS_HEADERS) and aggregated per endpoint on /monitoring/metrics/
+QUERY_METRICS_ENABLED = os.environ.get("QUERY_METRICS_ENABLED", "True") == "True"
+QUERY_METRICS_HEADERS = os.environ.get("QUERY_METRICS_HEADERS", "True") == "True"
+
+
+# Stateless JWT authentication
+# Safe requests get a principal built from the token claims instead of the user row.
+# Deactivations and revoked tokens are checked through a cache kept
+# JWT_USER_STATE_CACHE_TIMEOUT seconds
+JWT_STATELESS_AUTH = os.environ.get("JWT_STATELESS_AUTH", "False") == "True"
+JWT_USER_STATE_CACHE_TIMEOUT = int(os.environ.get("JWT_USER_STATE_CACHE_TIMEOUT", 60))
+
+
+# JSON
+# Responses are rendered and request bodies parsed with orjson, JSON_BACKEND=stdlib
+# goes back to DRF's json based renderer and parser
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson").lower()
+
+JSON_RENDERERS = {
+    "orjson": "InventoryManagement.utils.renderers.ORJSONRenderer",
+    "stdlib": "rest_framework.renderers.JSONRenderer",
+}
+JSON_PARSERS = {
+    "orjson": "InventoryManagement.utils.renderers.ORJSONParser",
+    "stdlib": "rest_framework.parsers.JSONParser",
+}
+
+
+# MessagePack
+# Clients sending "Accept: application/msgpack" get MessagePack responses and may
+# send MessagePack bodies (Decimal and UUID are extension types 1 and 2)
+MSGPACK_ENABLED = os.environ.get("MSGPACK_ENABLED", "True") == "True"
+
+MSGPACK_RENDERERS = ["InventoryManagement.utils.renderers.MessagePackRenderer"] if MSGPACK_ENABLED else []
+MSGPACK_PARSERS = ["InventoryManagement.utils.renderers.MessagePackParser"] if MSGPACK_ENABLED else []
+
 
 REST_FRAMEWORK = {
     # "NON_FIELD_ERRORS_KEY":"errors",
+    "DEFAULT_RENDERER_CLASSES": [
+        JSON_RENDERERS[JSON_BACKEND],
+        *MSGPACK_RENDERERS,
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        JSON_PARSERS[JSON_BACKEND],
+        *MSGPACK_PARSERS,
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
@@ -96,6 +210,13 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+# Page counts (CustomPageNumberPagination)
+# Above PAGINATION_ESTIMATE_COUNT_THRESHOLD rows the PostgreSQL planner estimate
+# is returned instead of an exact COUNT(*), and exact counts are cached for
+# PAGINATION_COUNT_CACHE_TIMEOUT seconds per query. 0 turns either one off
+PAGINATION_ESTIMATE_COUNT_THRESHOLD = int(os.environ.get("PAGINATION_ESTIMATE_COUNT_THRESHOLD", 0))
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.environ.get("PAGINATION_COUNT_CACHE_TIMEOUT", 0))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=48),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -132,6 +253,9 @@ CORS_ALLOWED_ORIGINS = [
     os.environ.get("FRONTEND_URL")
 ]
 
+# Let the front-end read the query metrics headers
+CORS_EXPOSE_HEADERS = ["X-DB-Query-Count", "X-DB-Time-Ms", "X-Total-Time-Ms"]
+
 DJANGO_EASY_AUDIT_WATCH_MODEL_EVENTS = True
 DJANGO_EASY_AUDIT_UNREGISTERED_CLASSES_EXTRA = [
     "warehouse_app.Warehouse",
@@ -188,6 +312,115 @@ else:
     }
 
 
+# Read replica
+# Safe-method requests of warehouse_app and accounts read from REPLICA_DB_URL when
+# it is set (any dj_database_url, e.g. a second PostgreSQL or a SQLite file).
+# A client stays on the primary for REPLICA_PIN_SECONDS after each of its writes,
+# pinned in the default cache, so the replica needs a shared CACHE_BACKEND.
+
+if os.environ.get("REPLICA_DB_URL"):
+    DATABASES["replica"] = dj_database_url.parse(os.environ.get("REPLICA_DB_URL"))
+    # Tests run the replica alias against the test primary
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["InventoryManagement.utils.db_router.PrimaryReplicaRouter"]
+
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+
+# Connection reuse
+# Persistent connections are kept for DB_CONN_MAX_AGE seconds and checked before
+# being reused. Setting DB_POOL=True switches the PostgreSQL databases to psycopg3
+# connection pooling instead (requires the "psycopg[pool]" package, which is not
+# in requirements.txt), sized for the worker model the app is served with (see
+# run_gunicorn.py)
+
+GUNICORN_WORKER_CLASS = os.environ.get("GUNICORN_WORKER_CLASS", "gthread").lower()
+
+DB_POOL_SIZES_PER_WORKER_CLASS = {
+    "sync": 1,
+    "gthread": int(os.environ.get("GUNICORN_THREADS", 4)),
+    "gevent": 20,
+    "uvicorn": 10,
+}
+
+# Persistent connections are not safe with async workers, they rely on the pool
+DB_CONN_MAX_AGE = int(
+    os.environ.get(
+        "DB_CONN_MAX_AGE", 0 if GUNICORN_WORKER_CLASS == "uvicorn" else 60
+    )
+)
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+
+DB_POOL = os.environ.get("DB_POOL", "False") == "True"
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(
+    os.environ.get(
+        "DB_POOL_MAX_SIZE",
+        DB_POOL_SIZES_PER_WORKER_CLASS.get(GUNICORN_WORKER_CLASS, 4),
+    )
+)
+DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 10))
+
+if DB_POOL:
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        # requirements.txt ships psycopg2 (which psycogreen patches for gevent)
+        raise ImproperlyConfigured(
+            'DB_POOL=True needs psycopg 3 and its pool: pip install "psycopg[binary,pool]"'
+        )
+
+for database in DATABASES.values():
+    database["CONN_HEALTH_CHECKS"] = DB_CONN_HEALTH_CHECKS
+    # Only the PostgreSQL backend pools, a SQLite replica keeps its connections
+    if DB_POOL and database.get("ENGINE") == "django.db.backends.postgresql":
+        # Django refuses persistent connections on top of a pool
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+    else:
+        database["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+
+
+# Cache
+# CACHE_BACKEND selects local memory (per process, for development), a shared
+# directory (file) or a Redis compatible server (redis), at CACHE_LOCATION.
+# Keys are prefixed with CACHE_KEY_PREFIX so that deployments sharing a server
+# do not read each other's entries. Hits, misses and health on /monitoring/cache/
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem").lower()
+
+CACHE_BACKENDS = {
+    "locmem": "InventoryManagement.utils.cache_backends.InstrumentedLocMemCache",
+    "file": "InventoryManagement.utils.cache_backends.InstrumentedFileBasedCache",
+    "redis": "InventoryManagement.utils.cache_backends.InstrumentedRedisCache",
+}
+
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "inventory-management",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://127.0.0.1:6379/0",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.environ.get("CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "inventory"),
+        "TIMEOUT": int(os.environ.get("CACHE_DEFAULT_TIMEOUT", 300)),
+        "OPTIONS": {"ALIAS": "default"},
+    }
+}
+
+if CACHE_BACKEND != "redis":
+    # Redis evicts by itself (maxmemory-policy), the others cull above MAX_ENTRIES
+    CACHES["default"]["OPTIONS"]["MAX_ENTRIES"] = int(os.environ.get("CACHE_MAX_ENTRIES", 10000))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -284,7 +517,32 @@ USE_TZ = True
 
 
 MEDIA_URL = "/media/"
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.join(BASE_DIR, "media"))
+
+# Product and employee images
+# Uploads are written to MEDIA_STAGING_ROOT and answered at once, the
+# process_images command then resizes them (IMAGE_MAX_SIZE, and WebP variants
+# with IMAGE_THUMBNAIL_SIZE thumbnails) and pushes them to MEDIA_STORAGE_BACKEND.
+# django.core.files.storage.FileSystemStorage (under MEDIA_ROOT) stands in for Cloudinary
+MEDIA_STORAGE_BACKEND = os.environ.get(
+    "MEDIA_STORAGE_BACKEND", "cloudinary_storage.storage.MediaCloudinaryStorage"
+)
+MEDIA_STAGING_ROOT = os.environ.get("MEDIA_STAGING_ROOT", os.path.join(BASE_DIR, "media_staging"))
+IMAGE_MAX_SIZE = int(os.environ.get("IMAGE_MAX_SIZE", 1600))
+IMAGE_THUMBNAIL_SIZE = int(os.environ.get("IMAGE_THUMBNAIL_SIZE", 320))
+IMAGE_WEBP_QUALITY = int(os.environ.get("IMAGE_WEBP_QUALITY", 80))
+# Seconds after which an image claimed by a worker that died is claimed again
+IMAGE_PROCESSING_TIMEOUT = int(os.environ.get("IMAGE_PROCESSING_TIMEOUT", 600))
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "media": {"BACKEND": MEDIA_STORAGE_BACKEND},
+    "image_staging": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": MEDIA_STAGING_ROOT},
+    },
+}
 
 CLOUDINARY_STORAGE = {
     "CLOUD_NAME": os.environ.get("CLOUDINARY_CLOUD_NAME"),
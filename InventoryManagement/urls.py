@@ -6,6 +6,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from InventoryManagement.views import CacheStatsView, DatabaseStatsView, QueryMetricsView
+
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -30,6 +32,9 @@ urlpatterns = [
 
     path('admin/', admin.site.urls),
     path('auth/', include('accounts.urls')),
+    path('monitoring/database/', DatabaseStatsView.as_view(), name='monitoring-database'),
+    path('monitoring/metrics/', QueryMetricsView.as_view(), name='monitoring-metrics'),
+    path('monitoring/cache/', CacheStatsView.as_view(), name='monitoring-cache'),
     path('', include('warehouse_app.urls')),
 
 ]
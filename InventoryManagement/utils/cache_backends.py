@@ -0,0 +1,89 @@
+import threading
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+
+class CacheStats:
+    """Per-process hit and miss counters of the cache aliases."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases = {}
+
+    def record(self, alias, hits, misses):
+        with self._lock:
+            counters = self._aliases.setdefault(alias, {"hits": 0, "misses": 0})
+            counters["hits"] += hits
+            counters["misses"] += misses
+
+    def get(self, alias):
+        with self._lock:
+            counters = dict(self._aliases.get(alias, {"hits": 0, "misses": 0}))
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+        return counters
+
+    def reset(self):
+        with self._lock:
+            self._aliases = {}
+
+
+cache_stats = CacheStats()
+
+
+class InstrumentedCacheMixin:
+    """
+    Counts the hits and misses of get() and get_many() in cache_stats, under
+    the alias of the cache (the ALIAS option, "default" if missing).
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get("OPTIONS", {}))
+        self.alias = options.pop("ALIAS", "default")
+        super().__init__(location, {**params, "OPTIONS": options})
+        # The base get_many() goes through get(), its lookups must not count twice
+        self._in_get_many = False
+
+    def get(self, key, default=None, version=None):
+        sentinel = object()
+        value = super().get(key, sentinel, version=version)
+        if not self._in_get_many:
+            cache_stats.record(self.alias, int(value is not sentinel), int(value is sentinel))
+        return default if value is sentinel else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        self._in_get_many = True
+        try:
+            values = super().get_many(keys, version=version)
+        finally:
+            self._in_get_many = False
+        cache_stats.record(self.alias, len(values), len(keys) - len(values))
+        return values
+
+    def get_server_info(self):
+        """Helper method returning what the server reports about itself, if anything."""
+        return None
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedFileBasedCache(InstrumentedCacheMixin, FileBasedCache):
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def get_server_info(self):
+        info = self._cache.get_client().info()
+        return {
+            "redis_version": info.get("redis_version"),
+            "used_memory": info.get("used_memory_human"),
+            "connected_clients": info.get("connected_clients"),
+            "evicted_keys": info.get("evicted_keys"),
+            "keyspace_hits": info.get("keyspace_hits"),
+            "keyspace_misses": info.get("keyspace_misses"),
+        }
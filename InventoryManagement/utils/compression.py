@@ -0,0 +1,181 @@
+import zlib
+
+import brotli
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+
+def parse_accept_encoding(header):
+    """Helper method returning the {coding: q value} of an Accept-Encoding header."""
+    codings = {}
+    for part in header.split(","):
+        coding, *params = [value.strip() for value in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding.lower()] = quality
+    return codings
+
+
+class BrotliEncoder:
+    def __init__(self, level):
+        self.level = level
+        self.compressor = None
+
+    def get_compressor(self):
+        if self.compressor is None:
+            self.compressor = brotli.Compressor(quality=self.level)
+        return self.compressor
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def compress_chunk(self, data):
+        # Flushed after every chunk, so that clients get the rows as they come
+        compressor = self.get_compressor()
+        return compressor.process(data) + compressor.flush()
+
+    def finish(self):
+        return self.get_compressor().finish()
+
+
+class GzipEncoder:
+    def __init__(self, level):
+        self.level = level
+        self.compressor = None
+
+    def get_compressor(self):
+        if self.compressor is None:
+            # wbits 31: gzip header and trailer
+            self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return self.compressor
+
+    def compress(self, data):
+        compressor = self.get_compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_chunk(self, data):
+        compressor = self.get_compressor()
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.get_compressor().flush()
+
+
+class CompressionMiddleware:
+    """
+    Compresses the responses with br or gzip, whichever the Accept-Encoding of
+    the client prefers (br on ties). Bodies under COMPRESSION_MIN_SIZE bytes,
+    already encoded ones and partial contents are sent as they are, streaming
+    responses are compressed chunk by chunk.
+
+    The levels come from COMPRESSION_LEVELS, by media type ("text/csv") or
+    type ("image/*"): {"br": quality, "gzip": level}, where a missing coding
+    uses COMPRESSION_BROTLI_QUALITY / COMPRESSION_GZIP_LEVEL, or None for
+    content that is not worth compressing (images, archives...).
+    """
+
+    # Preference order on equal q values
+    encoders = {"br": BrotliEncoder, "gzip": GzipEncoder}
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def get_levels(self, response):
+        """Helper method returning the {coding: level} of the response, None to not compress it."""
+        media_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        levels = {
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        }
+        for key in (media_type, f"{media_type.split('/')[0]}/*"):
+            if key in settings.COMPRESSION_LEVELS:
+                overrides = settings.COMPRESSION_LEVELS[key]
+                return None if overrides is None else {**levels, **overrides}
+        return levels
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding") or response.status_code == 206:
+            return False
+        if "no-transform" in response.get("Cache-Control", "").lower():
+            return False
+        if response.streaming:
+            # File responses know their size, generators do not
+            length = response.get("Content-Length")
+            return length is None or int(length) >= settings.COMPRESSION_MIN_SIZE
+        return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+    def negotiate(self, request):
+        """Helper method returning the coding to compress the response with, None for none."""
+        codings = parse_accept_encoding(request.headers.get("Accept-Encoding", ""))
+        best, best_quality = None, 0.0
+        for coding in self.encoders:
+            quality = codings.get(coding, codings.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+        levels = self.get_levels(response)
+        if levels is None:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = self.negotiate(request)
+        if coding is None:
+            return response
+        encoder = self.encoders[coding](levels[coding])
+
+        if response.streaming:
+            if response.is_async:
+                original_iterator = response.streaming_content
+
+                async def compress_async_stream():
+                    async for chunk in original_iterator:
+                        data = encoder.compress_chunk(chunk)
+                        if data:
+                            yield data
+                    yield encoder.finish()
+
+                response.streaming_content = compress_async_stream()
+            else:
+                response.streaming_content = self.compress_stream(encoder, response.streaming_content)
+            # The compressed size is only known once streamed
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = encoder.compress(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(compressed_content))
+
+        # The compressed body is not byte for byte the one of a strong ETag
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
+
+    def compress_stream(self, encoder, chunks):
+        for chunk in chunks:
+            data = encoder.compress_chunk(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
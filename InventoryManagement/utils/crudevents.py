@@ -37,18 +37,18 @@ def bulk_create_crudevents(objects):
     # Get user making the request from the thread
     request_user = get_current_user()
     
-    # Get ContentTypes for all models in objects in a single query
-    content_types = ContentType.objects.get_for_models(*[obj.__class__ for obj in objects]).values()
+    # Get ContentTypes for all models in objects in a single query, keyed by model
+    content_types = ContentType.objects.get_for_models(*[obj.__class__ for obj in objects])
 
     # Prepare a list to hold the CRUD event data
     crud_event_data = []
 
-    for obj, content_type in zip(objects, content_types):
+    for obj in objects:
         crud_event_data.append({
             'user': request_user,
             'event_type': CRUDEvent.CREATE,
             'object_id': str(obj.id),
-            'content_type': content_type,
+            'content_type': content_types[obj.__class__],
             'object_repr': str(obj),
             'object_json_repr': serializers.serialize('json', [obj]),
             'user_pk_as_string': str(request_user.id),
@@ -130,19 +130,19 @@ def bulk_delete_crudevents(objects):
     # Get user making the request from the thread
     request_user = get_current_user()
 
-    # Get ContentTypes for all models in objects in a single query
-    content_types = ContentType.objects.get_for_models(*[obj.__class__ for obj in objects]).values()
+    # Get ContentTypes for all models in objects in a single query, keyed by model
+    content_types = ContentType.objects.get_for_models(*[obj.__class__ for obj in objects])
 
     # Prepare a list to hold the CRUD event data
     crud_event_data = []
     
     # Iterate over each object
-    for obj, content_type in zip(objects, content_types):
+    for obj in objects:
         crud_event_data.append({
             'user': request_user,
             'event_type': CRUDEvent.DELETE,
             'object_id': str(obj.id),
-            'content_type': content_type,
+            'content_type': content_types[obj.__class__],
             'object_repr': obj.__str__(),  # Use str() instead of obj.str()
             'object_json_repr': serializers.serialize('json', [obj]),
             'user_pk_as_string': str(request_user.id),
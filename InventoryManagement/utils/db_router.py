@@ -0,0 +1,122 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+PRIMARY_DB_ALIAS = "default"
+
+# Apps whose reads are allowed to hit the replica
+REPLICA_APP_LABELS = {"warehouse_app", "accounts"}
+
+_routing_state = threading.local()
+
+
+def replica_is_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def get_pin_cache_key(request):
+    """
+    Build the key used to pin a client to the primary after a write.
+    The request user is only known once the view has authenticated it, so the
+    client is identified by its credentials (JWT or session cookie) instead.
+    """
+    credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credentials:
+        return None
+    digest = hashlib.sha256(credentials.encode()).hexdigest()
+    return f"replica-pin:{digest}"
+
+
+def should_read_from_replica():
+    if not getattr(_routing_state, "use_replica", False):
+        return False
+    # Reads made inside transaction.atomic() blocks belong with the writes
+    if connections[PRIMARY_DB_ALIAS].in_atomic_block:
+        return False
+    return True
+
+
+def check_replica_pin_cache(app_configs, **kwargs):
+    """
+    The pins are kept in the default cache, which every worker has to share:
+    with a per-process cache the next request of the client, served by
+    another worker, would read its stale rows from the replica.
+    """
+    if not replica_is_configured():
+        return []
+    backend = import_string(settings.CACHES["default"]["BACKEND"])
+    if issubclass(backend, (LocMemCache, DummyCache)):
+        return [
+            checks.Error(
+                "REPLICA_DB_URL needs a cache shared by the workers to pin the clients to the primary after their writes.",
+                hint="Set CACHE_BACKEND to redis (or file, when every worker runs on the same host).",
+                obj=settings.CACHES["default"]["BACKEND"],
+                id="InventoryManagement.E001",
+            )
+        ]
+    return []
+
+
+class ReadReplicaMiddleware:
+    """
+    Sends the reads of safe-method requests to the replica, unless the client
+    wrote something less than REPLICA_PIN_SECONDS ago (read-your-writes).
+    """
+
+    def __init__(self, get_response):
+        if not replica_is_configured():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pin_key = get_pin_cache_key(request)
+        is_safe = request.method in SAFE_METHODS
+
+        _routing_state.use_replica = is_safe and not (pin_key and cache.get(pin_key))
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.use_replica = False
+
+        if not is_safe and pin_key and response.status_code < 400:
+            cache.set(pin_key, True, settings.REPLICA_PIN_SECONDS)
+
+        return response
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Follow the database the related instance was loaded from
+            return instance._state.db
+
+        if (
+            model._meta.app_label in REPLICA_APP_LABELS
+            and replica_is_configured()
+            and should_read_from_replica()
+        ):
+            return REPLICA_DB_ALIAS
+        return PRIMARY_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,287 @@
+import csv
+import datetime
+import decimal
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+import orjson
+
+from django.utils import timezone
+
+from InventoryManagement.utils.renderers import ORJSON_OPTIONS
+
+
+def to_export_value(value):
+    """Helper method turning a values_list() value into a plain one, datetimes in local time."""
+    if value is None or isinstance(value, (bool, int, float, str, decimal.Decimal)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value) if timezone.is_aware(value) else value
+    if isinstance(value, datetime.date):
+        return value
+    # UUIDs, phone numbers...
+    return str(value)
+
+
+class ExportWriter:
+    """
+    Writes the rows of an export as they come: header() first, rows() for
+    every chunk of rows, footer() last, each one returning the bytes to send.
+    """
+
+    content_type = None
+    extension = None
+
+    def __init__(self, headers):
+        self.headers = list(headers)
+
+    def header(self):
+        return b""
+
+    def rows(self, rows):
+        raise NotImplementedError
+
+    def footer(self):
+        return b""
+
+    def stream(self, rows, chunk_size):
+        """Generator of the bytes of the export, rows are written by chunk_size."""
+        yield self.header()
+        chunk = []
+        for row in rows:
+            chunk.append([to_export_value(value) for value in row])
+            if len(chunk) >= chunk_size:
+                yield self.rows(chunk)
+                chunk = []
+        if chunk:
+            yield self.rows(chunk)
+        yield self.footer()
+
+
+# Cells spreadsheet applications run as formulas (CSV formula injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """Helper method prefixing a text cell that would be run as a formula with a quote."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class CSVExportWriter(ExportWriter):
+    """
+    Text cells starting like a formula are prefixed with a quote, the XLSX
+    inline strings are never run.
+    """
+
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def header(self):
+        return self.write([self.headers])
+
+    def rows(self, rows):
+        return self.write(
+            [
+                [value.isoformat() if isinstance(value, datetime.date) else escape_formula(value) for value in row]
+                for row in rows
+            ]
+        )
+
+
+def ndjson_default(obj):
+    if isinstance(obj, decimal.Decimal):
+        # As the API renders them, without the float rounding
+        return str(obj)
+    raise TypeError
+
+
+class NDJSONExportWriter(ExportWriter):
+    """One JSON object per line."""
+
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def rows(self, rows):
+        return b"".join(
+            orjson.dumps(
+                dict(zip(self.headers, row)),
+                default=ndjson_default,
+                option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+            )
+            for row in rows
+        )
+
+
+class ZipStream(io.RawIOBase):
+    """Write-only, non seekable file collecting what zipfile writes until drain()."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        # Nothing is buffered, and an export that is not read to the end is closed
+        # by the garbage collector before its zipfile
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+# Characters XML 1.0 does not allow, even escaped
+XML_ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+SPREADSHEET_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIPS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def get_column_letter(index):
+    """Helper method returning the spreadsheet name of the column (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class XLSXExportWriter(ExportWriter):
+    """
+    Office Open XML workbook written with zipfile onto a non seekable stream,
+    so that the sheets are sent while they are written. Rows past the limit of
+    a sheet (1,048,576 rows with the header) continue on a new one. Datetimes
+    are written as text, Excel does not know about time zones.
+    """
+
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+    max_rows_per_sheet = 1048575
+
+    def __init__(self, headers):
+        super().__init__(headers)
+        self.columns = [get_column_letter(index) for index in range(len(self.headers))]
+        self.stream_buffer = ZipStream()
+        self.archive = zipfile.ZipFile(self.stream_buffer, "w", compression=zipfile.ZIP_DEFLATED)
+        self.sheet_count = 0
+        self.sheet = None
+        self.sheet_rows = 0
+
+    def get_cell(self, reference, value):
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, decimal.Decimal)):
+            return f'<c r="{reference}"><v>{value}</v></c>'
+        if isinstance(value, datetime.date):
+            value = value.replace(tzinfo=None).isoformat() if isinstance(value, datetime.datetime) else value.isoformat()
+        text = escape(XML_ILLEGAL_CHARACTERS.sub("", str(value)))
+        return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def get_row(self, row):
+        self.sheet_rows += 1
+        cells = "".join(
+            self.get_cell(f"{column}{self.sheet_rows}", value) for column, value in zip(self.columns, row)
+        )
+        return f'<row r="{self.sheet_rows}">{cells}</row>'
+
+    def open_sheet(self):
+        self.close_sheet()
+        self.sheet_count += 1
+        self.sheet = self.archive.open(f"xl/worksheets/sheet{self.sheet_count}.xml", "w", force_zip64=True)
+        self.sheet_rows = 0
+        self.sheet.write(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{SPREADSHEET_NAMESPACE}"><sheetData>{self.get_row(self.headers)}'.encode()
+        )
+
+    def close_sheet(self):
+        if self.sheet is not None:
+            self.sheet.write(b"</sheetData></worksheet>")
+            self.sheet.close()
+            self.sheet = None
+
+    def header(self):
+        self.open_sheet()
+        return self.stream_buffer.drain()
+
+    def rows(self, rows):
+        for row in rows:
+            if self.sheet_rows > self.max_rows_per_sheet:
+                self.open_sheet()
+            self.sheet.write(self.get_row(row).encode())
+        return self.stream_buffer.drain()
+
+    def footer(self):
+        self.close_sheet()
+        # The parts listing the sheets, now that their number is known
+        sheets = range(1, self.sheet_count + 1)
+        self.archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for number in sheets
+            )
+            + "</Types>",
+        )
+        self.archive.writestr(
+            "_rels/.rels",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NAMESPACE}">'
+            f'<Relationship Id="rId1" Type="{RELATIONSHIPS_NAMESPACE}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>",
+        )
+        self.archive.writestr(
+            "xl/workbook.xml",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{SPREADSHEET_NAMESPACE}" xmlns:r="{RELATIONSHIPS_NAMESPACE}"><sheets>'
+            + "".join(
+                f'<sheet name="Export {number}" sheetId="{number}" r:id="rId{number}"/>' for number in sheets
+            )
+            + "</sheets></workbook>",
+        )
+        self.archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NAMESPACE}">'
+            + "".join(
+                f'<Relationship Id="rId{number}" Type="{RELATIONSHIPS_NAMESPACE}/worksheet" '
+                f'Target="worksheets/sheet{number}.xml"/>'
+                for number in sheets
+            )
+            + "</Relationships>",
+        )
+        self.archive.close()
+        return self.stream_buffer.drain()
+
+
+EXPORT_WRITERS = {
+    "csv": CSVExportWriter,
+    "ndjson": NDJSONExportWriter,
+    "xlsx": XLSXExportWriter,
+}
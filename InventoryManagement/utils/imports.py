@@ -0,0 +1,84 @@
+import codecs
+import csv
+
+import orjson
+
+
+class ImportReader:
+    """
+    Reads the rows of an uploaded file as they come, without loading the file:
+    rows() yields (row, error) pairs, row being a dict of the non empty values
+    and error the reason a line could not be read (row is then None).
+    """
+
+    extensions = ()
+
+    def __init__(self, file):
+        self.file = file
+
+    def rows(self):
+        raise NotImplementedError
+
+    def chunks(self, chunk_size):
+        """Generator of lists of (number, row, error), numbered from 1 for the first row."""
+        chunk = []
+        for number, (row, error) in enumerate(self.rows(), start=1):
+            chunk.append((number, row, error))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class CSVImportReader(ImportReader):
+    extensions = (".csv",)
+
+    def rows(self):
+        # File iterates over lines, csv joins the ones of quoted multiline cells
+        lines = codecs.iterdecode(self.file, "utf-8-sig")
+        try:
+            for row in csv.DictReader(lines):
+                # Empty cells are left to the defaults of the fields
+                yield {
+                    column.strip(): value
+                    for column, value in row.items()
+                    if column and value not in ("", None)
+                }, None
+        except UnicodeDecodeError:
+            yield None, "The file must be UTF-8 encoded"
+        except csv.Error as e:
+            yield None, f"The line cannot be read: {e}"
+
+
+class NDJSONImportReader(ImportReader):
+    extensions = (".ndjson", ".jsonl")
+
+    def rows(self):
+        for line in self.file:
+            if not line.strip():
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                yield None, f"The line is not valid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield None, "The line must be a JSON object"
+                continue
+            yield {column: value for column, value in row.items() if value not in ("", None)}, None
+
+
+IMPORT_READERS = {
+    "csv": CSVImportReader,
+    "ndjson": NDJSONImportReader,
+}
+
+
+def get_import_format(file_name):
+    """Helper method returning the IMPORT_READERS format of a file name, None when unknown."""
+    file_name = (file_name or "").lower()
+    for import_format, reader in IMPORT_READERS.items():
+        if file_name.endswith(reader.extensions):
+            return import_format
+    return None
@@ -0,0 +1,28 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Index
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    GIN trigram index on UPPER(field), the expression that both icontains and
+    TrigramSearchFilter compare against, so substring and similarity searches
+    stop scanning the whole table.
+    Requires the pg_trgm extension (created before migrating, see signals.py).
+    """
+
+    def __init__(self, *, field, name):
+        self.field_name = field
+        super().__init__(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+    def deconstruct(self):
+        path, _, _ = super().deconstruct()
+        return path, (), {"field": self.field_name, "name": self.name}
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            # Trigram operators only exist on PostgreSQL (e.g. a SQLite replica),
+            # other backends get a plain expression index under the same name
+            plain_index = Index(Upper(self.field_name), name=self.name)
+            return plain_index.create_sql(model, schema_editor, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,153 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Upper bounds of the histogram buckets, the last bucket catches everything above
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+TIME_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self):
+        observations = sum(self.counts)
+        labels = [f"le_{bound}" for bound in self.buckets] + ["inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "mean": round(self.total / observations, 2) if observations else 0,
+            "max": round(self.max, 2),
+        }
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.query_count = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time_ms = Histogram(TIME_MS_BUCKETS)
+        self.total_time_ms = Histogram(TIME_MS_BUCKETS)
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "query_count": self.query_count.as_dict(),
+            "db_time_ms": self.db_time_ms.as_dict(),
+            "total_time_ms": self.total_time_ms.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """Per-process aggregation of the request metrics, keyed by endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, query_count, db_time_ms, total_time_ms):
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self._endpoints[endpoint] = EndpointMetrics()
+            metrics.requests += 1
+            metrics.query_count.observe(query_count)
+            metrics.db_time_ms.observe(db_time_ms)
+            metrics.total_time_ms.observe(total_time_ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in sorted(self._endpoints.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+
+registry = MetricsRegistry()
+
+
+class QueryCounter:
+    """Execute wrapper counting the queries of a request and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def get_endpoint_name(request):
+    """
+    Helper method naming the endpoint of a request after its view and action,
+    e.g. "ProductModelViewset.list" or "DashboardDataGenericViewset.get".
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+
+    view = match.func
+    view_class = getattr(view, "cls", None) or getattr(view, "view_class", None)
+    if view_class is None:
+        return match.view_name or view.__name__
+
+    method = request.method.lower()
+    # Viewsets map the http methods to their actions
+    actions = getattr(view, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method, method)}"
+
+
+class QueryMetricsMiddleware:
+    """
+    Records the number of queries, the database time and the total time of every
+    request, per endpoint. They are sent back as X-DB-Query-Count, X-DB-Time-Ms
+    and X-Total-Time-Ms headers and aggregated for the /monitoring/metrics/ view.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            # Wrapping does not open any connection, it only hooks the aliases
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        total_time_ms = (time.perf_counter() - start) * 1000
+        db_time_ms = counter.duration * 1000
+
+        registry.record(get_endpoint_name(request), counter.count, db_time_ms, total_time_ms)
+
+        if settings.QUERY_METRICS_HEADERS:
+            response["X-DB-Query-Count"] = str(counter.count)
+            response["X-DB-Time-Ms"] = f"{db_time_ms:.2f}"
+            response["X-Total-Time-Ms"] = f"{total_time_ms:.2f}"
+
+        return response
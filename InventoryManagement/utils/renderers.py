@@ -0,0 +1,119 @@
+import datetime
+import decimal
+import uuid
+
+import msgpack
+import orjson
+
+from django.conf import settings
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Aware datetimes in UTC end with "Z" and dict keys may be UUIDs or integers, as
+# with the stdlib renderer
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def default(obj):
+    """
+    Fallback for the types orjson does not know (Decimal, lazy strings, timedelta,
+    querysets...). They get the same representation as with DRF's JSONEncoder,
+    e.g. Decimals left by aggregates become floats.
+    """
+    return JSONEncoder().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. UUIDs and datetimes are encoded natively,
+    everything else goes through the DRF encoder. "indent" in the Accept header
+    or the renderer context gives a 2 spaces indentation, the only one orjson has.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = ORJSON_OPTIONS
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=options)
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+# MessagePack extension types, clients must register the same codes
+MSGPACK_EXT_DECIMAL = 1  # str(decimal) as UTF-8 bytes
+MSGPACK_EXT_UUID = 2  # the 16 bytes of the UUID
+
+
+def msgpack_default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return msgpack.ExtType(MSGPACK_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(MSGPACK_EXT_UUID, obj.bytes)
+    if isinstance(obj, datetime.datetime):
+        # Aware datetimes use the timestamp extension, naive ones stay strings
+        return obj.isoformat()
+    return JSONEncoder().default(obj)
+
+
+def msgpack_ext_hook(code, data):
+    if code == MSGPACK_EXT_DECIMAL:
+        return decimal.Decimal(data.decode())
+    if code == MSGPACK_EXT_UUID:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders the responses as MessagePack for the clients asking for
+    application/msgpack. Decimals and UUIDs are extension types, aware
+    datetimes the msgpack timestamp type.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=msgpack_default, use_bin_type=True, datetime=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(
+                stream.read(),
+                ext_hook=msgpack_ext_hook,
+                timestamp=3,
+                raw=False,
+                strict_map_key=False,
+            )
+        except ValueError as exc:
+            # Truncated data, trailing bytes and malformed input are all ValueErrors
+            raise ParseError("MessagePack parse error - %s" % str(exc))
@@ -0,0 +1,36 @@
+from django.core.files.storage import storages
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+
+class StorageAlias(LazyObject):
+    """The storage of settings.STORAGES[alias], looked up on first use, like default_storage."""
+
+    def __init__(self, alias):
+        super().__init__()
+        self.__dict__["alias"] = alias
+
+    def _setup(self):
+        self._wrapped = storages[self.__dict__["alias"]]
+
+
+# Product and employee images, once processed (Cloudinary or the local disk)
+media_storage = StorageAlias("media")
+# Uploads waiting for process_images, on the local disk
+image_staging_storage = StorageAlias("image_staging")
+
+
+def get_media_storage():
+    return media_storage
+
+
+def get_image_staging_storage():
+    return image_staging_storage
+
+
+@receiver(setting_changed)
+def reset_storage_aliases(*, setting, **kwargs):
+    if setting == "STORAGES":
+        media_storage._wrapped = empty
+        image_staging_storage._wrapped = empty
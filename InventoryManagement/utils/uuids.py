@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_counter = 0
+
+_COUNTER_MAX = 0xFFF
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562, version 7) used as primary key default.
+    The first 48 bits are the unix time in milliseconds so new rows land at the
+    right edge of the primary key index instead of a random leaf page.
+    Within the same millisecond the 12 bits after the version act as a counter,
+    so the ids generated by one process are strictly increasing.
+    """
+    global _last_timestamp, _counter
+
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp > _last_timestamp:
+            # Random start, leaving room for the counter to grow
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            # Same millisecond (or the clock went back): keep increasing
+            timestamp = _last_timestamp
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                timestamp += 1
+                _counter = 0
+        _last_timestamp = timestamp
+        counter = _counter
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp << 80)
+        | (0x7 << 76)
+        | (counter << 64)
+        | (0b10 << 62)
+        | random_bits
+    )
+    return uuid.UUID(int=value)
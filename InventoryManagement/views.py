@@ -0,0 +1,121 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsSuperUser
+from InventoryManagement.utils.cache_backends import cache_stats
+from InventoryManagement.utils.query_metrics import registry
+
+
+# Monitoring endpoints
+# They only report on the worker process that answers the request
+
+
+class DatabaseStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request):
+        databases = {}
+        for connection in connections.all():
+            databases[connection.alias] = self._get_connection_stats(connection)
+        return Response(databases, status=status.HTTP_200_OK)
+
+    def _get_connection_stats(self, connection):
+        """Helper method describing how a database alias reuses its connections."""
+        settings_dict = connection.settings_dict
+        pool_options = settings_dict.get("OPTIONS", {}).get("pool")
+
+        stats = {
+            "vendor": connection.vendor,
+            "conn_max_age": settings_dict.get("CONN_MAX_AGE"),
+            "conn_health_checks": settings_dict.get("CONN_HEALTH_CHECKS"),
+            "is_connected": connection.connection is not None,
+            # close_at is a monotonic timestamp, report the time left instead
+            "seconds_until_close": (
+                round(connection.close_at - time.monotonic(), 2)
+                if connection.close_at is not None
+                else None
+            ),
+            "pool": None,
+        }
+
+        if pool_options and connection.pool is not None:
+            # psycopg_pool counters (pool_size, pool_available, requests_waiting...)
+            stats["pool"] = connection.pool.get_stats()
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+                    "WHERE datname = current_database() GROUP BY 1"
+                )
+                stats["server_connections"] = dict(cursor.fetchall())
+
+        return stats
+
+
+class QueryMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request):
+        # Histograms of query count, database time and total time per endpoint
+        return Response(registry.snapshot(), status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+
+class CacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request):
+        aliases = {}
+        for alias in settings.CACHES:
+            aliases[alias] = self._get_cache_stats(alias)
+        return Response(aliases, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        cache_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _get_cache_stats(self, alias):
+        """Helper method probing a cache alias with a write and a read back."""
+        cache = caches[alias]
+        options = settings.CACHES[alias]
+        stats = {
+            "backend": options["BACKEND"],
+            "key_prefix": cache.key_prefix,
+            **cache_stats.get(getattr(cache, "alias", alias)),
+        }
+
+        probe_key, probe_value = f"cache-probe:{uuid.uuid4().hex}", uuid.uuid4().hex
+        start = time.perf_counter()
+        try:
+            # Straight to the backend, probes are not counted as hits
+            cache.set(probe_key, probe_value, timeout=10)
+            healthy = cache.has_key(probe_key)
+            cache.delete(probe_key)
+            server = cache.get_server_info() if hasattr(cache, "get_server_info") else None
+            error = None
+        except Exception as e:
+            healthy, server, error = False, None, str(e)
+
+        stats.update(
+            {
+                "healthy": healthy,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                "server": server,
+                "error": error,
+            }
+        )
+        return stats
@@ -0,0 +1,208 @@
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import cached_property
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.exceptions import AuthenticationFailed
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from accounts.models import User
+
+# Claims put in the token by MyTokenObtainPairSerializer that the principal is built from
+PRINCIPAL_CLAIMS = ("is_superuser", "role", "warehouse_id", "employee_id")
+
+
+def user_state_key(user_id):
+    return f"auth-user-state:{user_id}"
+
+
+def revoked_token_key(jti):
+    return f"auth-token-revoked:{jti}"
+
+
+def get_user_state(user):
+    """Helper method returning what the cache keeps of a user, None when it does not exist."""
+    if user is None:
+        return None
+    return {
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "role": user.role,
+        "warehouse_id": str(user.warehouse_id) if user.warehouse_id else None,
+        "employee_id": str(user.employee_id) if user.employee_id else None,
+    }
+
+
+# Stamp of every user state, bumped with them: the users nested in other
+# responses (order initiators, warehouse employees) have no modified_at
+USERS_VERSION_KEY = "auth-users-version"
+
+
+def get_users_version():
+    version = cache.get(USERS_VERSION_KEY)
+    if version is None:
+        # Unique stamps, so an evicted version never comes back
+        cache.add(USERS_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(USERS_VERSION_KEY)
+    return version
+
+
+def set_users_version():
+    cache.set(USERS_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def bump_users_version():
+    set_users_version()
+    # Bumped again on commit, in case a request stamped the rows from before it
+    transaction.on_commit(set_users_version)
+
+
+def invalidate_user_state(user_id):
+    cache.delete(user_state_key(user_id))
+    bump_users_version()
+
+
+def invalidate_users_state(user_ids):
+    cache.delete_many([user_state_key(user_id) for user_id in user_ids])
+    bump_users_version()
+
+
+def revoke_token(token):
+    """
+    Blacklists a token (access tokens included) and flags its jti in the cache
+    until it expires, so that the stateless authentication refuses it right away.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+
+    outstanding_token, _ = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={"token": str(token), "expires_at": expires_at},
+    )
+    blacklisted_token, _ = BlacklistedToken.objects.get_or_create(token=outstanding_token)
+
+    remaining = (expires_at - datetime.now(tz=timezone.utc)).total_seconds()
+    if remaining > 0:
+        cache.set(revoked_token_key(jti), True, timeout=int(remaining) + 1)
+    return blacklisted_token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Principal built from the claims of the access token, with the attributes the
+    permissions and querysets read (is_superuser, role, warehouse_id, employee_id).
+    Anything else (email, names...) loads the user row the first time it is read.
+    """
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+    @cached_property
+    def id(self):
+        return uuid.UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def warehouse_id(self):
+        warehouse_id = self.token.get("warehouse_id")
+        return uuid.UUID(warehouse_id) if warehouse_id else None
+
+    @cached_property
+    def employee_id(self):
+        employee_id = self.token.get("employee_id")
+        return uuid.UUID(employee_id) if employee_id else None
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
+
+    def is_manager(self):
+        return self.role == User.ROLES.EMPLOYEE_MANAGER
+
+    def is_employee(self):
+        return self.role == User.ROLES.EMPLOYEE
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenUser, User)):
+            return str(self.pk) == str(other.pk)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that does not load the user row on safe requests.
+
+    The principal of GET, HEAD and OPTIONS requests is a ClaimsUser built from
+    the token claims. Deactivated users, changed claims and revoked tokens are
+    caught through a cache kept for JWT_USER_STATE_CACHE_TIMEOUT seconds (and
+    cleared when the user is saved), so an authenticated request makes no query
+    while its cache entries are warm. Writes get the user row, as the audit
+    events and serializers need a real User.
+    """
+
+    def authenticate(self, request):
+        # The principal depends on the method of the request
+        self.request = request
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        state_key, revoked_key = user_state_key(user_id), revoked_token_key(jti)
+
+        cached = cache.get_many([state_key, revoked_key])
+        missing = {}
+
+        if revoked_key in cached:
+            revoked = cached[revoked_key]
+        else:
+            revoked = missing[revoked_key] = BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+        user = None
+        if state_key in cached:
+            state = cached[state_key]
+        else:
+            user = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).first()
+            state = missing[state_key] = get_user_state(user)
+
+        if missing:
+            cache.set_many(missing, timeout=settings.JWT_USER_STATE_CACHE_TIMEOUT)
+
+        if revoked:
+            raise AuthenticationFailed("Token is blacklisted", code="token_not_valid")
+        if state is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not state["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        stateless = self.request.method in SAFE_METHODS and all(
+            validated_token.get(claim) == state[claim] for claim in PRINCIPAL_CLAIMS
+        )
+        if stateless:
+            return ClaimsUser(validated_token)
+        # Writes, and tokens issued before a change of role or warehouse
+        return user or super().get_user(validated_token)
@@ -20,6 +20,8 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["is_superuser"] = user.is_superuser
         token["role"] = user.role  # Include the role directly
         token["user_id"] = str(user.id)
+        token["warehouse_id"] = str(user.warehouse_id) if user.warehouse_id else None
+        token["employee_id"] = str(user.employee_id) if user.employee_id else None
 
         return token
 
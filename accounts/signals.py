@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.authentication import invalidate_user_state
+from accounts.models import User
+
+
+# Deactivations, role and warehouse changes must reach the stateless authentication
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_user_state_cache(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which is neither cached nor shown
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_user_state(instance.pk)
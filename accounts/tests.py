@@ -1,3 +1,143 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.models import Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import ClaimsUser, StatelessJWTAuthentication
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+login_endpoint = "http://localhost:8000/auth/jwt/create/"
+logout_endpoint = "http://localhost:8000/auth/users/me/logout/"
+me_endpoint = "http://localhost:8000/auth/users/me/"
+categories_endpoint = "http://localhost:8000/categories/"
+products_endpoint = "http://localhost:8000/products/"
+
+
+def user_queries(context):
+    """Helper method returning the captured queries reading users or blacklisted tokens."""
+    return [
+        query["sql"] for query in context.captured_queries
+        if "accounts_user" in query["sql"] or "token_blacklist" in query["sql"]
+    ]
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the stateless JWT authentication
+# ----------------------------------------------------------------------------------
+
+
+@mock.patch.object(APIView, "authentication_classes", [StatelessJWTAuthentication])
+class StatelessJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+
+        self.manager_user = User.objects.create_user(
+            email="mymanager@gmail.com",
+            username="mymanager",
+            password="987654321@",
+            role=User.ROLES.EMPLOYEE_MANAGER,
+            warehouse_id=self.warehouse.id,
+        )
+
+    def login(self, user):
+        response = self.client.post(
+            login_endpoint, {"email": user.email, "password": "987654321@"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['access']}")
+        return response.data
+
+    def test_token_claims(self):
+        tokens = self.login(self.manager_user)
+        access_token = AccessToken(tokens["access"])
+
+        self.assertEqual(access_token["role"], User.ROLES.EMPLOYEE_MANAGER)
+        self.assertEqual(access_token["warehouse_id"], str(self.warehouse.id))
+        self.assertIsNone(access_token["employee_id"])
+
+    def test_safe_requests_do_not_read_the_user(self):
+        self.login(self.manager_user)
+        self.client.get(products_endpoint)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(products_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(context), [])
+
+    def test_principal(self):
+        self.login(self.manager_user)
+        response = self.client.get(products_endpoint)
+        principal = response.wsgi_request.user
+
+        self.assertIsInstance(principal, ClaimsUser)
+        self.assertEqual(principal, self.manager_user)
+        self.assertEqual(principal.warehouse_id, self.warehouse.id)
+        self.assertTrue(principal.is_manager())
+
+        # Other attributes load the user row
+        response = self.client.get(me_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "mymanager@gmail.com")
+
+    def test_writes_read_the_user(self):
+        self.login(self.admin_user)
+
+        response = self.client.post(categories_endpoint, {"name": "Category 1"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    def test_deactivated_user(self):
+        self.login(self.manager_user)
+        self.assertEqual(self.client.get(products_endpoint).status_code, status.HTTP_200_OK)
+
+        self.manager_user.is_active = False
+        self.manager_user.save()
+
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_changed_claims_read_the_user(self):
+        self.login(self.manager_user)
+        self.client.get(products_endpoint)
+
+        self.manager_user.role = User.ROLES.EMPLOYEE
+        self.manager_user.save()
+
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.wsgi_request.user, User)
+        self.assertEqual(response.wsgi_request.user.role, User.ROLES.EMPLOYEE)
+
+    def test_logout_revokes_the_access_token(self):
+        tokens = self.login(self.manager_user)
+        self.client.get(products_endpoint)
+
+        response = self.client.post(logout_endpoint, {"refresh_token": tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Still refused once the cache is gone
+        cache.clear()
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
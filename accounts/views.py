@@ -19,6 +19,7 @@ from django.db import transaction
 
 from InventoryManagement.utils.context_manager import set_current_context
 from InventoryManagement.utils.crudevents import create_crudevent
+from accounts.authentication import revoke_token
 from accounts.serializers import (
     LogoutSerializer,
     PasswordChangeSerializer,
@@ -164,6 +165,9 @@ class LogoutView(APIView):
                     token = RefreshToken(refresh_token)
                     blacklisted_token, _ = token.blacklist()
                     create_crudevent(obj=blacklisted_token)
+                    # The access token of this request is refused from now on too
+                    if request.auth is not None:
+                        revoke_token(request.auth)
 
             return Response(
                 {"message": "User successfully logged out"},
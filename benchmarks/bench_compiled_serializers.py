@@ -0,0 +1,174 @@
+"""
+Renders 100 row pages of /products/, /orders/ (3 items and 2 payments per
+order) and /employees/ with the DRF serializers of the viewsets and with their
+CompiledSerializer, rows fetched included, and checks that both give the same
+JSON. Timings are the CPU time of this process, the database work is not in it.
+The rows are seeded in a transaction that is rolled back afterwards.
+
+Usage: python benchmarks/bench_compiled_serializers.py [rows] [rounds]
+"""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from warehouse_app.compiled import CompiledSerializer
+from warehouse_app.models import Category, Employee, Order, OrderItem, OrderPartialPayment, Product, Warehouse
+from warehouse_app.serializers import EmployeeModelSerializer, OrderModelSerializer, ProductModelSerializer
+
+User = get_user_model()
+
+
+def seed(number_of_rows):
+    """Helper method adding the rows of the pages, without signals."""
+    suffix = uuid.uuid4().hex[:8]
+    warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+    category = Category.objects.bulk_create([Category(name="Bench", slug=f"bench-{suffix}")])[0]
+    users = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-{suffix}-{i}@example.com",
+                username=f"bench-{suffix}-{i}",
+                first_name="Bench",
+                last_name="User",
+            )
+            for i in range(number_of_rows)
+        ]
+    )
+    Employee.objects.bulk_create(
+        [
+            Employee(
+                warehouse=warehouse,
+                user=user,
+                first_name="Bench",
+                last_name=f"Employee {i}",
+                phone_number="+237658884014",
+                id_number=f"{i:06d}",
+            )
+            for i, user in enumerate(users)
+        ]
+    )
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {i}",
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=1000,
+                unit_price=1000 + i,
+                category=category,
+                warehouse=warehouse,
+            )
+            for i in range(number_of_rows)
+        ]
+    )
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                warehouse=warehouse,
+                customer=f"Customer {i}",
+                customer_phone_number="+237658884014",
+                initiator=users[0],
+                total_price=4503,
+                tracking_id=f"B{suffix}-{i:06d}",
+            )
+            for i in range(number_of_rows)
+        ]
+    )
+    OrderItem.objects.bulk_create(
+        [
+            OrderItem(order=order, product=product, buying_price=product.unit_price, quantity=1)
+            for order in orders
+            for product in products[:3]
+        ]
+    )
+    OrderPartialPayment.objects.bulk_create(
+        [OrderPartialPayment(order=order, amount=1000) for order in orders for _ in range(2)]
+    )
+    return warehouse
+
+
+def get_pages(warehouse, number_of_rows):
+    """Helper method returning (name, serializer class, queryset as the viewset builds it)."""
+    return [
+        (
+            "products",
+            ProductModelSerializer,
+            Product.objects.select_related("warehouse", "category").filter(warehouse=warehouse),
+        ),
+        (
+            "orders",
+            OrderModelSerializer,
+            Order.objects.select_related("warehouse", "initiator")
+            .prefetch_related("order_items__product", "partial_payments")
+            .filter(warehouse=warehouse),
+        ),
+        (
+            "employees",
+            EmployeeModelSerializer,
+            Employee.objects.select_related("user", "warehouse").filter(warehouse=warehouse),
+        ),
+    ]
+
+
+def render_drf(serializer_class, queryset):
+    return serializer_class(queryset.all(), many=True).data
+
+
+def render_compiled(serializer_class, queryset):
+    compiled = CompiledSerializer(serializer_class)
+    return compiled.to_representation(compiled.get_queryset(queryset))
+
+
+def measure(function, rounds):
+    """Helper method returning the CPU time (ms) of every call."""
+    timings = []
+    for _ in range(rounds):
+        start = time.process_time()
+        function()
+        timings.append((time.process_time() - start) * 1000)
+    return timings
+
+
+def report(label, timings, baseline=None):
+    line = f"{label:<20} mean {statistics.mean(timings):7.3f} ms | median {statistics.median(timings):7.3f} ms"
+    if baseline is not None:
+        line += f" | x{statistics.median(baseline) / statistics.median(timings):5.2f}"
+    print(line)
+
+
+if __name__ == "__main__":
+    number_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print(f"{number_of_rows} rows per page, {rounds} rounds, CPU time\n")
+
+    # Fragments would hide the serialization of the products
+    with override_settings(PRODUCT_FRAGMENT_CACHE_TIMEOUT=0), transaction.atomic():
+        warehouse = seed(number_of_rows)
+
+        for name, serializer_class, queryset in get_pages(warehouse, number_of_rows):
+            queryset = queryset.order_by("-created_at", "-id")[:number_of_rows]
+            assert JSONRenderer().render(render_drf(serializer_class, queryset)) == JSONRenderer().render(
+                render_compiled(serializer_class, queryset)
+            ), f"The {name} pages differ"
+
+            drf = measure(lambda: render_drf(serializer_class, queryset), rounds)
+            compiled = measure(lambda: render_compiled(serializer_class, queryset), rounds)
+            report(f"{name} drf", drf)
+            report(f"{name} compiled", compiled, drf)
+
+        transaction.set_rollback(True)
@@ -0,0 +1,57 @@
+"""
+Compares the latency of a small read (the /categories/ query) when a new
+database connection is opened for every request against a reused one.
+
+Usage: python benchmarks/bench_db_connections.py [iterations]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection
+
+from warehouse_app.models import Category
+
+
+def run_small_get():
+    list(Category.objects.all().order_by("-created_at")[:10])
+
+
+def measure(iterations, reconnect):
+    timings = []
+    for _ in range(iterations):
+        if reconnect:
+            # What happens at the end of every request when CONN_MAX_AGE is 0
+            connection.close()
+        start = time.perf_counter()
+        run_small_get()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<28} mean {statistics.mean(timings):7.3f} ms | "
+        f"p50 {statistics.median(timings):7.3f} ms | p95 {p95:7.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    # Warm up so the first connection does not skew either run
+    run_small_get()
+
+    report("new connection per request", measure(iterations, reconnect=True))
+    report("persistent connection", measure(iterations, reconnect=False))
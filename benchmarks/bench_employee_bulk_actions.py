@@ -0,0 +1,85 @@
+"""
+Promotes then demotes employees one Employee.set_manager() / set_employee()
+at a time and with one BulkEmployeeActionSerializer each, and reports the wall
+time and the number of queries of each. The rows are created in a transaction
+that is rolled back afterwards.
+
+Usage: python benchmarks/bench_employee_bulk_actions.py [employees]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from InventoryManagement.utils.context_manager import set_current_context
+from warehouse_app.models import Employee, Warehouse
+from warehouse_app.serializers import BulkEmployeeActionSerializer, ImportEmployeesSerializer
+
+User = get_user_model()
+
+
+def one_by_one(employee_ids, context, operation):
+    with set_current_context(context["user"]):
+        for employee in Employee.objects.select_related("user").filter(id__in=employee_ids):
+            if operation == "set-manager":
+                employee.set_manager()
+            else:
+                employee.set_employee()
+
+
+def bulk(employee_ids, context, operation):
+    # The queryset of EmployeeModelViewset
+    employees = Employee.objects.select_related("user", "warehouse")
+    context = {**context, "employees": employees, "operation": operation}
+    serializer = BulkEmployeeActionSerializer(data={"ids": employee_ids}, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+if __name__ == "__main__":
+    number_of_employees = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    with transaction.atomic():
+        suffix = uuid.uuid4().hex[:8]
+        admin = User.objects.create_superuser(
+            email=f"bench-{suffix}@example.com", username=f"bench-{suffix}", password="bench"
+        )
+        warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+        context = {"user": admin, "warehouse_id": None}
+
+        rows = [
+            {
+                "email": f"bench-{suffix}-{i}@example.com",
+                "first_name": "Bench",
+                "last_name": f"{suffix} {i}",
+                "phone_number": "+237658884014",
+                "id_number": f"{i:06d}",
+                "warehouse_id": str(warehouse.id),
+            }
+            for i in range(number_of_employees)
+        ]
+        serializer = ImportEmployeesSerializer(data={"employees": rows}, context=context)
+        serializer.is_valid(raise_exception=True)
+        employee_ids = [str(employee.id) for employee in serializer.save()]
+
+        for name, function in (("one by one", one_by_one), ("bulk", bulk)):
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                for operation in ("set-manager", "set-employee"):
+                    function(employee_ids, context, operation)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12} {number_of_employees} employees x2 {elapsed:8.2f} s {len(queries):6} queries")
+
+        transaction.set_rollback(True)
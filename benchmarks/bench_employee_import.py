@@ -0,0 +1,80 @@
+"""
+Onboards employees one CreateEmployeeSerializer at a time (an account created
+and its password hashed by the create_user_for_employee signal, for each one)
+and with one ImportEmployeesSerializer, and reports the wall time of each.
+The rows are created in a transaction that is rolled back afterwards.
+
+Usage: python benchmarks/bench_employee_import.py [employees]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from warehouse_app.models import Warehouse
+from warehouse_app.serializers import CreateEmployeeSerializer, ImportEmployeesSerializer
+
+User = get_user_model()
+
+
+def get_rows(number_of_rows, warehouse, prefix):
+    suffix = uuid.uuid4().hex[:8]
+    return [
+        {
+            "email": f"{prefix}-{suffix}-{i}@example.com",
+            "first_name": prefix.capitalize(),
+            "last_name": f"{suffix} {i}",
+            "phone_number": "+237658884014",
+            "id_number": f"{i:06d}",
+            "is_manager": False,
+            "warehouse_id": str(warehouse.id),
+        }
+        for i in range(number_of_rows)
+    ]
+
+
+def one_by_one(rows, context):
+    for row in rows:
+        serializer = CreateEmployeeSerializer(data=row, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+
+def bulk(rows, context):
+    serializer = ImportEmployeesSerializer(data={"employees": rows}, context=context)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+if __name__ == "__main__":
+    number_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    with transaction.atomic():
+        suffix = uuid.uuid4().hex[:8]
+        admin = User.objects.create_superuser(
+            email=f"bench-{suffix}@example.com", username=f"bench-{suffix}", password="bench"
+        )
+        warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+        context = {"user": admin, "warehouse_id": None}
+
+        timings = {}
+        for name, function in (("one by one", one_by_one), ("import", bulk)):
+            rows = get_rows(number_of_rows, warehouse, name.split()[0])
+            start = time.perf_counter()
+            function(rows, context)
+            timings[name] = time.perf_counter() - start
+            print(f"{name:<12} {number_of_rows} employees {timings[name]:8.2f} s")
+        print(f"x{timings['one by one'] / timings['import']:.1f}")
+
+        transaction.set_rollback(True)
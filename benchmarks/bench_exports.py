@@ -0,0 +1,90 @@
+"""
+Streams /products/export/ in every format for growing numbers of products and
+reports the time and the peak Python memory (tracemalloc) of reading the whole
+response: with the rows read through a server-side cursor and written as they
+come, the peak should not grow with the number of rows.
+The rows are seeded in a transaction that is rolled back afterwards.
+
+Usage: python benchmarks/bench_exports.py [largest number of rows]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from warehouse_app.models import Category, Product, Warehouse
+
+User = get_user_model()
+
+
+def seed(number_of_rows, warehouse, category):
+    """Helper method adding products, without signals."""
+    Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {i}",
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=1000,
+                unit_price=1000 + i,
+                category=category,
+                warehouse=warehouse,
+            )
+            for i in range(number_of_rows)
+        ],
+        batch_size=5000,
+    )
+
+
+def export(client, warehouse, export_format):
+    """Helper method returning (seconds, bytes, peak memory in MB) of one export."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(
+        "/products/export/", {"warehouse_id": warehouse.id, "export_format": export_format}
+    )
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak / 1024 / 1024
+
+
+if __name__ == "__main__":
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sizes = [size for size in (1000, 10000, 100000, 1000000) if size < largest] + [largest]
+
+    with transaction.atomic():
+        suffix = uuid.uuid4().hex[:8]
+        user = User.objects.create_superuser(
+            email=f"bench-{suffix}@example.com", username=f"bench-{suffix}", password="bench"
+        )
+        warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+        category = Category.objects.bulk_create([Category(name="Bench", slug=f"bench-{suffix}")])[0]
+        client = APIClient(SERVER_NAME="localhost")
+        client.force_authenticate(user)
+
+        seeded = 0
+        for size in sizes:
+            seed(size - seeded, warehouse, category)
+            seeded = size
+            for export_format in ("csv", "ndjson", "xlsx"):
+                elapsed, length, peak = export(client, warehouse, export_format)
+                print(
+                    f"{size:>8} rows {export_format:<7} {elapsed:7.2f} s | "
+                    f"{length / 1024 / 1024:8.1f} MB sent | peak {peak:6.1f} MB"
+                )
+
+        transaction.set_rollback(True)
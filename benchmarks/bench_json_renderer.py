@@ -0,0 +1,157 @@
+"""
+Renders a 100 order /orders/ page (3 items and 2 payments per order, as served
+by OrderModelViewset) with DRF's json based JSONRenderer, with the orjson
+based ORJSONRenderer and with MessagePackRenderer, and parses the result back
+with the matching parsers.
+The orders are seeded in a transaction that is rolled back afterwards.
+
+Usage: python benchmarks/bench_json_renderer.py [orders] [rounds]
+"""
+
+import io
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from InventoryManagement.utils.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+from warehouse_app.models import Category, Order, OrderItem, OrderPartialPayment, Product, Warehouse
+from warehouse_app.serializers import OrderModelSerializer
+
+User = get_user_model()
+
+
+def seed_orders(number_of_orders):
+    """Helper method adding the orders of the page, without signals."""
+    suffix = uuid.uuid4().hex[:8]
+    warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+    category = Category.objects.bulk_create([Category(name="Bench", slug=f"bench-{suffix}")])[0]
+    user = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-{suffix}@example.com",
+                username=f"bench-{suffix}",
+                first_name="Bench",
+                last_name="User",
+            )
+        ]
+    )[0]
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {i}",
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=1000,
+                unit_price=1000 + i,
+                category=category,
+                warehouse=warehouse,
+            )
+            for i in range(3)
+        ]
+    )
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                warehouse=warehouse,
+                customer=f"Customer {i}",
+                customer_phone_number="+237658884014",
+                initiator=user,
+                total_price=4503,
+                tracking_id=f"B{suffix}-{i:06d}",
+            )
+            for i in range(number_of_orders)
+        ]
+    )
+    OrderItem.objects.bulk_create(
+        [
+            OrderItem(order=order, product=product, buying_price=product.unit_price, quantity=1)
+            for order in orders
+            for product in products
+        ]
+    )
+    OrderPartialPayment.objects.bulk_create(
+        [OrderPartialPayment(order=order, amount=1000) for order in orders for _ in range(2)]
+    )
+    return warehouse
+
+
+def get_page_data(warehouse, number_of_orders):
+    queryset = (
+        Order.objects.select_related("warehouse", "initiator")
+        .prefetch_related("order_items__product", "partial_payments")
+        .filter(warehouse=warehouse)
+        .order_by("-created_at")[:number_of_orders]
+    )
+    return {
+        "count": number_of_orders,
+        "count_is_approximate": False,
+        "next": None,
+        "previous": None,
+        "results": OrderModelSerializer(queryset, many=True).data,
+    }
+
+
+def measure(function, rounds):
+    """Helper method returning the duration (ms) of every call."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings, baseline=None):
+    line = f"{label:<16} mean {statistics.mean(timings):7.3f} ms | median {statistics.median(timings):7.3f} ms"
+    if baseline is not None:
+        line += f" | x{statistics.median(baseline) / statistics.median(timings):5.2f}"
+    print(line)
+
+
+if __name__ == "__main__":
+    number_of_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with transaction.atomic():
+        data = get_page_data(seed_orders(number_of_orders), number_of_orders)
+        transaction.set_rollback(True)
+
+    body = JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == body, "The renderers disagree"
+    msgpack_body = MessagePackRenderer().render(data)
+    print(
+        f"{number_of_orders} orders, {rounds} rounds, "
+        f"{len(body) / 1024:.1f} KB as JSON, {len(msgpack_body) / 1024:.1f} KB as MessagePack\n"
+    )
+
+    stdlib_render = measure(lambda: JSONRenderer().render(data), rounds)
+    orjson_render = measure(lambda: ORJSONRenderer().render(data), rounds)
+    stdlib_parse = measure(lambda: JSONParser().parse(io.BytesIO(body)), rounds)
+    orjson_parse = measure(lambda: ORJSONParser().parse(io.BytesIO(body)), rounds)
+    msgpack_render = measure(lambda: MessagePackRenderer().render(data), rounds)
+    msgpack_parse = measure(lambda: MessagePackParser().parse(io.BytesIO(msgpack_body)), rounds)
+
+    report("render json", stdlib_render)
+    report("render orjson", orjson_render, stdlib_render)
+    report("render msgpack", msgpack_render, stdlib_render)
+    report("parse json", stdlib_parse)
+    report("parse orjson", orjson_parse, stdlib_parse)
+    report("parse msgpack", msgpack_parse, stdlib_parse)
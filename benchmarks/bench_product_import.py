@@ -0,0 +1,89 @@
+"""
+Loads a catalog one CreateProductModelSerializer at a time (a transaction and
+an audit event for each product) and with one ImportProductsSerializer (an
+NDJSON file, upserted by chunks), then imports the catalog again with every
+price changed, and reports the wall time and number of queries of each.
+The rows are created in a transaction that is rolled back afterwards.
+
+Usage: python benchmarks/bench_product_import.py [products] [one by one products]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+import orjson
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.models import Warehouse
+from warehouse_app.serializers import CreateProductModelSerializer, ImportProductsSerializer
+
+User = get_user_model()
+
+
+def get_rows(number_of_rows, warehouse, prefix, unit_price="2.50"):
+    return [
+        {
+            "sku": f"{prefix}-{i:06d}",
+            "name": f"Product {prefix} {i}",
+            "measurement_unit": "box",
+            "quantity": i % 500,
+            "unit_price": unit_price,
+            "warehouse_id": str(warehouse.id),
+        }
+        for i in range(number_of_rows)
+    ]
+
+
+def one_by_one(rows, context):
+    for row in rows:
+        serializer = CreateProductModelSerializer(data=row, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+
+def bulk(rows, context):
+    content = b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    data = {"file": SimpleUploadedFile("catalog.ndjson", content)}
+    serializer = ImportProductsSerializer(data=data, context=context)
+    serializer.is_valid(raise_exception=True)
+    return serializer.save()
+
+
+def measure(name, function, rows, context):
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        function(rows, context)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {len(rows):6} products {elapsed:8.2f} s {len(queries):7} queries")
+
+
+if __name__ == "__main__":
+    number_of_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    one_by_one_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with transaction.atomic():
+        suffix = uuid.uuid4().hex[:8]
+        admin = User.objects.create_superuser(
+            email=f"bench-{suffix}@example.com", username=f"bench-{suffix}", password="bench"
+        )
+        warehouse = Warehouse.objects.bulk_create([Warehouse(name="Bench site", location="London")])[0]
+        context = {"user": admin, "warehouse_id": None}
+
+        measure("one by one", one_by_one, get_rows(one_by_one_rows, warehouse, "single"), context)
+        measure("import", bulk, get_rows(number_of_rows, warehouse, suffix), context)
+        measure("re-import", bulk, get_rows(number_of_rows, warehouse, suffix, unit_price="2.75"), context)
+
+        transaction.set_rollback(True)
@@ -0,0 +1,120 @@
+"""
+Inserts order item rows keyed by random (uuid4) and by time-ordered (uuid7)
+primary keys, and compares the insert latency as the table grows and the size
+of the primary key index at the end.
+The rows go to throwaway tables shaped like warehouse_app_orderitem, which are
+dropped afterwards. PostgreSQL only.
+
+Usage: python benchmarks/bench_uuid_keys.py [rows] [batch_size]
+"""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "InventoryManagement.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from psycopg2.extras import execute_values
+
+from InventoryManagement.utils.uuids import uuid7
+
+
+TABLE_SQL = """
+    CREATE UNLOGGED TABLE {table} (
+        id uuid PRIMARY KEY,
+        order_id uuid NOT NULL,
+        product_id uuid NOT NULL,
+        quantity integer NOT NULL,
+        buying_price numeric(15, 2) NOT NULL,
+        created_at timestamp with time zone NOT NULL
+    )
+"""
+
+
+def has_pgstattuple(cursor):
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+        return True
+    except Exception:
+        connection.rollback()
+        return False
+
+
+def insert_rows(table, make_id, rows, batch_size):
+    """Helper method returning the insert latency (ms) of every batch."""
+    order_id, product_id = uuid.uuid4(), uuid.uuid4()
+    timings = []
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(TABLE_SQL.format(table=table))
+        raw_cursor = cursor.cursor
+        for _ in range(0, rows, batch_size):
+            now = datetime.now(timezone.utc)
+            values = [
+                (str(make_id()), str(order_id), str(product_id), 1, 1500, now)
+                for _ in range(batch_size)
+            ]
+            start = time.perf_counter()
+            execute_values(
+                raw_cursor,
+                f"INSERT INTO {table} VALUES %s",
+                values,
+                page_size=batch_size,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def index_stats(table, with_pgstattuple):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_relation_size(%s)", [f"{table}_pkey"])
+        stats = {"index_mb": cursor.fetchone()[0] / 1024 / 1024}
+        if with_pgstattuple:
+            cursor.execute(
+                "SELECT avg_leaf_density, leaf_fragmentation FROM pgstatindex(%s)",
+                [f"{table}_pkey"],
+            )
+            stats["leaf_density"], stats["leaf_fragmentation"] = cursor.fetchone()
+        cursor.execute(f"DROP TABLE {table}")
+    return stats
+
+
+def report(label, timings, stats):
+    tail = timings[-max(len(timings) // 10, 1):]
+    line = (
+        f"{label:<6} total {sum(timings) / 1000:7.2f} s | "
+        f"batch mean {statistics.mean(timings):7.2f} ms | "
+        f"last 10% mean {statistics.mean(tail):7.2f} ms | "
+        f"pkey {stats['index_mb']:7.1f} MB"
+    )
+    if "leaf_density" in stats:
+        line += (
+            f" | leaf density {stats['leaf_density']:5.1f}%"
+            f" | fragmentation {stats['leaf_fragmentation']:5.1f}%"
+        )
+    print(line)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    if connection.vendor != "postgresql":
+        sys.exit("This benchmark needs PostgreSQL")
+
+    with connection.cursor() as cursor:
+        with_pgstattuple = has_pgstattuple(cursor)
+
+    for label, make_id in [("uuid4", uuid.uuid4), ("uuid7", uuid7)]:
+        table = f"bench_orderitem_{label}"
+        timings = insert_rows(table, make_id, rows, batch_size)
+        report(label, timings, index_stats(table, with_pgstattuple))
@@ -1,10 +1,108 @@
+import multiprocessing
 import os
+
+
+# Worker models supported by the launcher, selected with GUNICORN_WORKER_CLASS
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "gevent": "gevent",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+WORKER_CLASS = os.environ.get("GUNICORN_WORKER_CLASS", "gthread").lower()
+
+if WORKER_CLASS not in WORKER_CLASSES:
+    raise ValueError(
+        f"Unknown GUNICORN_WORKER_CLASS '{WORKER_CLASS}'. "
+        f"Expected one of: {', '.join(WORKER_CLASSES)}"
+    )
+
+if WORKER_CLASS == "gevent":
+    # Patching has to happen before django (and psycopg2) is imported,
+    # otherwise the preloaded app keeps blocking sockets and every database
+    # call freezes the whole worker instead of a single greenlet
+    from gevent import monkey
+
+    monkey.patch_all()
+
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+
 import django
 from gunicorn.app.base import BaseApplication
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'InventoryManagement.settings')
 django.setup()
 
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def default_workers(worker_class):
+    cpu_count = multiprocessing.cpu_count()
+    # Async workers multiplex connections themselves so one per core is enough,
+    # blocking workers follow the usual (2 x cores) + 1 recommendation
+    if worker_class in ("gevent", "uvicorn"):
+        return cpu_count
+    return (cpu_count * 2) + 1
+
+
+def post_fork(server, worker):
+    # Never share a database connection opened in the master with the workers
+    from django.db import connections
+
+    connections.close_all()
+
+
+def get_options():
+    options = {
+        "bind": "%s:%s" % (
+            os.environ.get("GUNICORN_HOST", "0.0.0.0"),
+            os.environ.get("PORT", "5000"),
+        ),
+        "worker_class": WORKER_CLASSES[WORKER_CLASS],
+        "workers": env_int("GUNICORN_WORKERS", env_int("WEB_CONCURRENCY", default_workers(WORKER_CLASS))),
+        # Load the app once in the master so workers share its memory copy-on-write
+        "preload_app": env_bool("GUNICORN_PRELOAD", True),
+        # Recycle workers regularly, the jitter avoids restarting them all at once
+        "max_requests": env_int("GUNICORN_MAX_REQUESTS", 1000),
+        "max_requests_jitter": env_int("GUNICORN_MAX_REQUESTS_JITTER", 100),
+        "timeout": env_int("GUNICORN_TIMEOUT", 30),
+        "graceful_timeout": env_int("GUNICORN_GRACEFUL_TIMEOUT", 30),
+        "keepalive": env_int("GUNICORN_KEEPALIVE", 5),
+        "accesslog": os.environ.get("GUNICORN_ACCESS_LOG", "-"),
+        "post_fork": post_fork,
+    }
+
+    if WORKER_CLASS == "gthread":
+        options["threads"] = env_int("GUNICORN_THREADS", 4)
+    elif WORKER_CLASS == "gevent":
+        options["worker_connections"] = env_int("GUNICORN_WORKER_CONNECTIONS", 1000)
+
+    return options
+
+
+def get_application():
+    # Uvicorn workers speak ASGI, all the others WSGI
+    if WORKER_CLASS == "uvicorn":
+        from InventoryManagement.asgi import application
+    else:
+        from InventoryManagement.wsgi import application
+    return application
+
+
 class StandaloneApplication(BaseApplication):
     def __init__(self, app, options=None):
         self.options = options or {}
@@ -23,8 +121,4 @@ class StandaloneApplication(BaseApplication):
         return self.application
 
 if __name__ == '__main__':
-    from InventoryManagement.wsgi import application
-    StandaloneApplication(application, {
-        'bind': '%s:%s' % ('0.0.0.0', '5000'),
-        'workers': 1,
-    }).run()
\ No newline at end of file
+    StandaloneApplication(get_application(), get_options()).run()
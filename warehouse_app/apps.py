@@ -8,4 +8,8 @@ class WarehouseAppConfig(AppConfig):
 
     def ready(self):
         import warehouse_app.signals
+        from django.core import checks
+        from InventoryManagement.utils.db_router import check_replica_pin_cache
+
+        checks.register(check_replica_pin_cache, checks.Tags.caches)
         
\ No newline at end of file
@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class VersionedCache:
+    """
+    Two level cache (process memory, then the shared cache) of values derived
+    from a table, kept in the shared cache for settings.<timeout_setting>
+    seconds. Every key is stamped with the current version of the table,
+    bumping the version invalidates all of them at once in every process.
+
+    Reading a value costs one shared cache lookup (the version) when the process
+    already holds it, two when another process computed it.
+    """
+
+    max_local_entries = 256
+
+    def __init__(self, namespace, timeout_setting):
+        self.namespace = namespace
+        self.timeout_setting = timeout_setting
+        self._lock = threading.Lock()
+        self._local_version = None
+        self._local_entries = {}
+
+    @property
+    def version_key(self):
+        return f"{self.namespace}:version"
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Unique stamps, so an evicted version never comes back with old entries
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def bump_version(self):
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+    def get_key(self, version, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"{self.namespace}:{version}:{digest}"
+
+    def get_or_set(self, key, default, version=None):
+        """
+        Returns the value cached under key for the current version, calling
+        default() and caching its result when there is none.
+        """
+        version = version or self.get_version()
+        timeout = getattr(settings, self.timeout_setting)
+
+        with self._lock:
+            if self._local_version != version:
+                self._local_version, self._local_entries = version, {}
+            if key in self._local_entries:
+                return self._local_entries[key]
+
+        shared_key = self.get_key(version, key)
+        value = cache.get(shared_key)
+        if value is None:
+            value = default()
+            cache.set(shared_key, value, timeout=timeout)
+
+        with self._lock:
+            if self._local_version == version:
+                if len(self._local_entries) >= self.max_local_entries:
+                    self._local_entries = {}
+                self._local_entries[key] = value
+        return value
+
+
+# Category list pages, bumped by the Category signals
+category_cache = VersionedCache("category-catalog", "CATEGORY_CACHE_TIMEOUT")
+
+
+class FragmentCache:
+    """
+    Shared cache of the serialized representation of single rows, kept for
+    settings.<timeout_setting> seconds (0 turns it off). Keys are stamped with
+    the modified_at of the row and of the related rows nested in it
+    (related_fields), so any change to them gives a new key.
+    """
+
+    def __init__(self, namespace, timeout_setting, related_fields=()):
+        self.namespace = namespace
+        self.timeout_setting = timeout_setting
+        self.related_fields = related_fields
+
+    def get_key(self, instance):
+        stamps = [instance.modified_at]
+        for field in self.related_fields:
+            related = getattr(instance, field)
+            stamps.append(related.modified_at if related is not None else None)
+        return self.build_key(instance.pk, stamps)
+
+    def get_columns(self):
+        """Helper method returning the values_list() columns get_row_key() reads."""
+        return ["pk", "modified_at", *(f"{field}__modified_at" for field in self.related_fields)]
+
+    def get_row_key(self, row):
+        """Same key as get_key(), from a named values_list() row with get_columns()."""
+        return self.build_key(row.pk, [getattr(row, column) for column in self.get_columns()[1:]])
+
+    def build_key(self, pk, stamps):
+        signature = ":".join(stamp.isoformat() if stamp else "" for stamp in stamps)
+        return f"{self.namespace}:{pk}:{signature}"
+
+    def get_many(self, instances, serialize, get_key=None):
+        """
+        Returns the representations of instances, in order, calling serialize()
+        only for the ones missing from the cache. get_key defaults to get_key().
+        """
+        timeout = getattr(settings, self.timeout_setting)
+        if not timeout:
+            return [serialize(instance) for instance in instances]
+
+        get_key = get_key or self.get_key
+        instances = list(instances)
+        keys = [get_key(instance) for instance in instances]
+        fragments = cache.get_many(keys)
+
+        missing = {}
+        for key, instance in zip(keys, instances):
+            if key not in fragments:
+                fragments[key] = missing[key] = serialize(instance)
+        if missing:
+            cache.set_many(missing, timeout=timeout)
+
+        return [fragments[key] for key in keys]
+
+    def invalidate(self, instance):
+        cache.delete(self.get_key(instance))
+
+    def invalidate_many(self, instances):
+        cache.delete_many([self.get_key(instance) for instance in instances])
+
+
+# Product list representations, with their warehouse and category
+product_fragment_cache = FragmentCache(
+    "product-fragment", "PRODUCT_FRAGMENT_CACHE_TIMEOUT", related_fields=["warehouse", "category"]
+)
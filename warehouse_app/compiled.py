@@ -0,0 +1,309 @@
+import decimal
+import functools
+import threading
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import connection, models
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Model fields whose database values are already what the serializer field renders
+PASSTHROUGH_FIELDS = {
+    serializers.CharField: (models.CharField, models.TextField, models.SlugField, models.EmailField),
+    serializers.BooleanField: (models.BooleanField,),
+    serializers.IntegerField: (
+        models.IntegerField,
+        models.SmallIntegerField,
+        models.BigIntegerField,
+        models.PositiveIntegerField,
+        models.PositiveSmallIntegerField,
+        models.PositiveBigIntegerField,
+    ),
+}
+
+# Per column, parsed values (e.g. phone numbers) whose representations are kept in memory
+PARSED_VALUES_CACHE_SIZE = 4096
+
+
+def build(entries, row, state):
+    """Helper method rendering one row with the compiled entries of a serializer."""
+    data = {}
+    for name, index, convert in entries:
+        if index is None:
+            data[name] = convert(row, state)
+        else:
+            value = row[index]
+            data[name] = value if value is None or convert is None else convert(value)
+    return data
+
+
+class CompiledPlan:
+    """
+    Read-only rendering of a ModelSerializer compiled from its fields: the
+    columns to read with values_list() and, for every field, the column and the
+    converter giving its representation. Built once per serializer class.
+
+    Supported fields: model columns, nested serializers of to-one relations
+    (read in the same query) and of reverse foreign keys (one query each, as
+    with prefetch_related), and SerializerMethodFields declared in the
+    Meta.compiled_fields of their serializer, either as the list of the columns
+    the method reads (it gets an object with these attributes) or as a query
+    expression annotated on the rows.
+    """
+
+    def __init__(self, serializer, leading_columns=()):
+        self.model = serializer.Meta.model
+        self.columns = list(leading_columns)
+        self.annotations = {}
+        # (parent pk index, foreign key name, child plan) of the to-many fields
+        self.related = []
+        self.fragment_cache = getattr(serializer.Meta, "fragment_cache", None)
+        if self.fragment_cache is not None:
+            for column in self.fragment_cache.get_columns():
+                self.add_column(column)
+        self.entries = self.compile(serializer, self.model, "")
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return self.columns.index(column)
+
+    def compile(self, serializer, model, prefix):
+        entries = []
+        compiled_fields = getattr(serializer.Meta, "compiled_fields", {})
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            label = f"{serializer.__class__.__name__}.{name}"
+
+            if isinstance(field, serializers.ListSerializer):
+                entries.append((name, None, self.compile_many(field, model, prefix, label)))
+            elif isinstance(field, serializers.BaseSerializer):
+                entries.append((name, None, self.compile_one(field, model, prefix, label)))
+            elif isinstance(field, serializers.SerializerMethodField):
+                if name not in compiled_fields:
+                    raise ImproperlyConfigured(f"{label} is missing from Meta.compiled_fields")
+                entries.append(self.compile_method(field, compiled_fields[name], prefix, label))
+            else:
+                entries.append(self.compile_column(field, model, prefix, label))
+        return entries
+
+    def get_model_field(self, model, source, label):
+        try:
+            return model._meta.get_field(source)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f"{label} is not a field of {model.__name__}, it cannot be compiled")
+
+    def compile_column(self, field, model, prefix, label):
+        model_field = self.get_model_field(model, field.source, label)
+        if not model_field.concrete or model_field.is_relation:
+            raise ImproperlyConfigured(f"{label} is not a column, it cannot be compiled")
+        column = prefix + field.source
+
+        if isinstance(field, serializers.CharField) and hasattr(model_field, "from_db_value"):
+            # Parsing the value is the slow part and the same values come back page
+            # after page: it is read as text and its representation memoized
+            alias = f"{column}_text"
+            self.annotations[alias] = Cast(column, output_field=models.TextField())
+
+            @functools.lru_cache(maxsize=PARSED_VALUES_CACHE_SIZE)
+            def convert_parsed(value):
+                return field.to_representation(model_field.from_db_value(value, None, connection))
+
+            return (field.field_name, self.add_column(alias), convert_parsed)
+
+        index = self.add_column(column)
+
+        if isinstance(model_field, models.FileField):
+            # The URL may depend on the request of the context
+            def convert_file(row, state):
+                name = row[index]
+                if not name:
+                    return None
+                if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+                    return name
+                url = model_field.storage.url(name)
+                request = state["context"].get("request")
+                return request.build_absolute_uri(url) if request is not None else url
+
+            return (field.field_name, None, convert_file)
+
+        if isinstance(field, serializers.DateTimeField) and self.is_iso_datetime(field):
+            # Same output as DateTimeField, with the timezone looked up once per page
+            def convert_datetime(row, state):
+                value = row[index]
+                if value is None:
+                    return None
+                if value.tzinfo is None or state["timezone"] is None:
+                    return field.to_representation(value)
+                value = value.astimezone(state["timezone"]).isoformat()
+                return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+            return (field.field_name, None, convert_datetime)
+
+        if isinstance(field, serializers.DecimalField) and self.is_plain_decimal(field):
+            # DecimalField.quantize() with its exponent and context built once
+            exponent = decimal.Decimal(".1") ** field.decimal_places
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+
+            def convert_decimal(value):
+                return "{:f}".format(value.quantize(exponent, rounding=field.rounding, context=context))
+
+            return (field.field_name, index, convert_decimal)
+
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+            return (field.field_name, index, str)
+        if type(model_field) in PASSTHROUGH_FIELDS.get(type(field), ()):
+            return (field.field_name, index, None)
+        return (field.field_name, index, field.to_representation)
+
+    def is_plain_decimal(self, field):
+        return (
+            field.decimal_places is not None
+            and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and not field.normalize_output
+            and not field.localize
+        )
+
+    def is_iso_datetime(self, field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        # A timezone of its own is left to the field
+        return (
+            output_format is not None
+            and output_format.lower() == ISO_8601
+            and not hasattr(field, "timezone")
+        )
+
+    def compile_one(self, field, model, prefix, label):
+        model_field = self.get_model_field(model, field.source, label)
+        if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+            raise ImproperlyConfigured(f"{label} is not a to-one relation, it cannot be compiled")
+        related_prefix = f"{prefix}{field.source}__"
+        # Under its own name, the id field of the nested serializer reads the same column
+        pk_index = self.add_column(related_prefix + model_field.related_model._meta.pk.name)
+        entries = self.compile(field, model_field.related_model, related_prefix)
+
+        def convert_one(row, state):
+            if row[pk_index] is None:
+                return None
+            return build(entries, row, state)
+
+        return convert_one
+
+    def compile_many(self, field, model, prefix, label):
+        model_field = self.get_model_field(model, field.source, label)
+        if not model_field.one_to_many:
+            raise ImproperlyConfigured(f"{label} is not a reverse foreign key, it cannot be compiled")
+        pk_index = self.add_column(prefix + model._meta.pk.name)
+        foreign_key = model_field.field.name
+        # The first column of the child rows is the primary key of their parent
+        child = CompiledPlan(field.child, leading_columns=[foreign_key])
+        self.related.append((pk_index, foreign_key, child))
+
+        def convert_many(row, state):
+            return state[child].get(row[pk_index], [])
+
+        return convert_many
+
+    def compile_method(self, field, compiled, prefix, label):
+        method = getattr(field.parent, field.method_name)
+
+        if isinstance(compiled, (list, tuple)):
+            attributes = [(attribute, self.add_column(prefix + attribute)) for attribute in compiled]
+
+            def convert_method(row, state):
+                return method(SimpleNamespace(**{attribute: row[index] for attribute, index in attributes}))
+
+            return (field.field_name, None, convert_method)
+
+        if prefix:
+            raise ImproperlyConfigured(f"{label} is an expression, it cannot be compiled in a nested serializer")
+        alias = f"{field.field_name}_compiled"
+        self.annotations[alias] = compiled
+        return (field.field_name, self.add_column(alias), None)
+
+    def get_queryset(self, queryset, *extra_columns):
+        """Helper method returning the values_list() rows of the queryset to render."""
+        queryset = queryset.select_related(None).prefetch_related(None)
+        columns = dict.fromkeys([*self.columns, *extra_columns])
+        rows = queryset.annotate(**self.annotations).values_list(*columns, named=True)
+        # The joins of the related columns are not needed to count the rows (paginators)
+        rows.count = queryset.count
+        return rows
+
+    def fetch_related(self, rows, state):
+        """Helper method rendering the to-many fields of the rows into state[child plan], by parent pk."""
+        for pk_index, foreign_key, child in self.related:
+            parents = {row[pk_index] for row in rows if row[pk_index] is not None}
+            if not parents:
+                state[child] = {}
+                continue
+            child_rows = list(
+                child.get_queryset(
+                    child.model._default_manager.filter(**{f"{foreign_key}__in": parents})
+                )
+            )
+            child.fetch_related(child_rows, state)
+
+            grouped = {}
+            for child_row in child_rows:
+                grouped.setdefault(child_row[0], []).append(build(child.entries, child_row, state))
+            state[child] = grouped
+
+
+class CompiledSerializer:
+    """
+    Read-only serializer rendering values_list() rows of serializer_class with
+    the same output as the serializer, without model instances and without
+    going through the serializer fields one by one. See CompiledPlan for the
+    fields it supports.
+
+    Usage:
+    compiled = CompiledSerializer(OrderModelSerializer)
+    data = compiled.to_representation(compiled.get_queryset(queryset))
+    """
+
+    _plans = {}
+    _lock = threading.Lock()
+
+    def __init__(self, serializer_class, context=None):
+        self.plan = self.get_plan(serializer_class)
+        self.context = context or {}
+
+    @classmethod
+    def get_plan(cls, serializer_class):
+        plan = cls._plans.get(serializer_class)
+        if plan is None:
+            with cls._lock:
+                plan = cls._plans.setdefault(serializer_class, CompiledPlan(serializer_class()))
+        return plan
+
+    def get_queryset(self, queryset, *extra_columns):
+        """
+        Rows of the queryset with the columns of the serializer, and the
+        extra_columns (e.g. the ones a paginator reads) as attributes.
+        """
+        return self.plan.get_queryset(queryset, *extra_columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        state = {
+            "context": self.context,
+            "timezone": timezone.get_current_timezone() if settings.USE_TZ else None,
+        }
+        self.plan.fetch_related(rows, state)
+
+        def serialize(row):
+            return build(self.plan.entries, row, state)
+
+        fragment_cache = self.plan.fragment_cache
+        if fragment_cache is None:
+            return [serialize(row) for row in rows]
+        return fragment_cache.get_many(rows, serialize, get_key=fragment_cache.get_row_key)
@@ -1,4 +1,5 @@
 from django_filters.rest_framework import FilterSet, DateFilter, ModelChoiceFilter
+from rest_framework.filters import SearchFilter
 
 from warehouse_app.models import Order, Product, Warehouse, Employee
 
@@ -7,6 +8,12 @@ from easyaudit.models import CRUDEvent
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+from django.db.models.lookups import Contains
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
 
 from datetime import datetime
 
@@ -49,5 +56,43 @@ class CRUDEventFilter(FilterSet):
     class Meta:
         model = CRUDEvent
         fields = ['min_datetime', 'max_datetime', 'user', 'user__warehouse_id', 'event_type']
-        
-    
\ No newline at end of file
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    Search backend for PostgreSQL. Each search term has to be contained in one
+    of the search fields, or be close enough to one of their words (typos), and
+    the results come ranked by trigram similarity, best matches first.
+    Both comparisons are made on UPPER(field) so they are served by the
+    TrigramIndex of the field. search_fields must be plain field names.
+    Other databases (e.g. SQLite) fall back to the regular SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        rank = None
+        for term in search_terms:
+            term = term.upper()
+            conditions = Q()
+            similarities = []
+            for field in search_fields:
+                conditions |= Q(Contains(Upper(field), term))
+                conditions |= Q(TrigramWordSimilar(Upper(field), term))
+                similarities.append(TrigramWordSimilarity(term, Upper(field)))
+            queryset = queryset.filter(conditions)
+
+            term_rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+            rank = term_rank if rank is None else rank + term_rank
+
+        # The ordering of the view breaks the ties
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(search_rank=rank).order_by("-search_rank", *ordering)
+
@@ -0,0 +1,176 @@
+import io
+import logging
+import os
+from datetime import timedelta
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from warehouse_app.models import Employee, ImageStatus, Product
+
+logger = logging.getLogger(__name__)
+
+# Models whose images go through the staging storage
+IMAGE_MODELS = [Product, Employee]
+
+
+def stage_image(validated_data):
+    """
+    Helper method sending the image uploaded in validated_data to the local
+    staging storage rather than to the media storage: the request does not
+    wait for the remote upload, process_images does it later. An image set to
+    None still clears the current one.
+    """
+    image = validated_data.get("image")
+    if isinstance(image, UploadedFile):
+        validated_data["image_staging"] = validated_data.pop("image")
+        validated_data["image_status"] = ImageStatus.PENDING
+    return validated_data
+
+
+def resize(image, size, image_format, **options):
+    """Helper method returning the bytes of the image, fitted in a size x size box."""
+    image = image.copy()
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if image_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(image):
+    """Helper method returning {field: (extension, bytes)} of the processed images."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    # Transparent images stay PNG, photos are JPEG
+    if image.mode == "RGBA":
+        main = ("png", resize(image, settings.IMAGE_MAX_SIZE, "PNG", optimize=True))
+    else:
+        main = ("jpg", resize(image, settings.IMAGE_MAX_SIZE, "JPEG", quality=85, optimize=True, progressive=True))
+    webp_options = {"quality": settings.IMAGE_WEBP_QUALITY, "method": 4}
+    return {
+        "image": main,
+        "image_webp": ("webp", resize(image, settings.IMAGE_MAX_SIZE, "WEBP", **webp_options)),
+        "image_thumbnail": ("webp", resize(image, settings.IMAGE_THUMBNAIL_SIZE, "WEBP", **webp_options)),
+    }
+
+
+def delete_files(files):
+    """Helper method deleting the (storage, name) files, logging the ones that cannot be."""
+    for storage, name in files:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning("Image %s could not be deleted: %s", name, e)
+
+
+def finish(instance, staged_name, **values):
+    """
+    Helper method writing the values to the row of the claimed instance. False
+    when it was changed meanwhile (a new upload, or deleted), it is left as is.
+    modified_at is updated, so that the ETags and cached products follow.
+    """
+    updated = type(instance).objects.filter(
+        pk=instance.pk, image_status=ImageStatus.PROCESSING, image_staging=staged_name
+    ).update(modified_at=timezone.now(), **values)
+    return updated == 1
+
+
+def process_image(instance):
+    """
+    Resizes the staged image of the claimed instance, pushes the variants to
+    the media storage and removes the staged file. The uploads run outside of
+    any transaction, the row is only written once they are done. Unreadable
+    images, and images the media storage does not take, are marked FAILED.
+    """
+    staged = instance.image_staging
+    staged_name = staged.name
+    try:
+        with staged.open("rb") as file, Image.open(file) as image:
+            variants = render_variants(image)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning("Image %s of %s %s cannot be processed: %s", staged_name, type(instance).__name__, instance.pk, e)
+        finish(instance, staged_name, image_status=ImageStatus.FAILED)
+        return False
+
+    # FieldFile.save() renames the file object itself
+    previous_files = [
+        (getattr(instance, field).storage, getattr(instance, field).name)
+        for field in variants
+        if getattr(instance, field)
+    ]
+    name = os.path.splitext(os.path.basename(staged_name))[0]
+    new_files = []
+    try:
+        for field, (extension, content) in variants.items():
+            suffix = "-thumbnail" if field == "image_thumbnail" else ""
+            file = getattr(instance, field)
+            file.save(f"{name}{suffix}.{extension}", ContentFile(content), save=False)
+            new_files.append((file.storage, file.name))
+    except Exception:
+        # The staged file is kept, the image can be sent back to PENDING
+        logger.exception("Image %s of %s %s could not be uploaded", staged_name, type(instance).__name__, instance.pk)
+        delete_files(new_files)
+        finish(instance, staged_name, image_status=ImageStatus.FAILED)
+        return False
+
+    if not finish(
+        instance,
+        staged_name,
+        image_staging=None,
+        image_status=ImageStatus.READY,
+        **{field: getattr(instance, field).name for field in variants},
+    ):
+        # Replaced or deleted while it was uploaded, the variants are of nothing
+        delete_files([*new_files, (staged.storage, staged_name)])
+        return False
+
+    # Only once the new ones are saved
+    new_names = {name for _, name in new_files}
+    delete_files(
+        [(staged.storage, staged_name)]
+        + [(storage, previous_name) for storage, previous_name in previous_files if previous_name not in new_names]
+    )
+    return True
+
+
+def claim_next_image(model):
+    """
+    Marks the oldest pending image of the model PROCESSING and returns its
+    instance, None when there are none. The row is only locked for the claim,
+    other workers skip it. Images claimed by a worker that died are claimed
+    again after IMAGE_PROCESSING_TIMEOUT seconds.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.IMAGE_PROCESSING_TIMEOUT)
+    with transaction.atomic():
+        instance = (
+            model.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(image_status=ImageStatus.PENDING)
+                | Q(image_status=ImageStatus.PROCESSING, modified_at__lt=stale)
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if instance is None:
+            return None
+        instance.image_status = ImageStatus.PROCESSING
+        instance.save(update_fields=["image_status", "modified_at"])
+    return instance
+
+
+def process_next_image(model):
+    """Processes the oldest pending image of the model, False when there are none."""
+    instance = claim_next_image(model)
+    if instance is None:
+        return False
+    process_image(instance)
+    return True
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from warehouse_app.images import IMAGE_MODELS, process_next_image
+
+
+class Command(BaseCommand):
+    help = (
+        "Resizes the staged product and employee images, makes their WebP variants "
+        "and pushes them to the media storage. Runs until stopped, or until nothing "
+        "is left with --once. Several workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Process the pending images, then exit"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait before looking again when nothing is pending",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = 0
+            for model in IMAGE_MODELS:
+                while process_next_image(model):
+                    processed += 1
+            if processed:
+                self.stdout.write(f"{processed} image(s) processed")
+            if options["once"]:
+                return
+            if not processed:
+                time.sleep(options["interval"])
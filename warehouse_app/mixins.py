@@ -0,0 +1,320 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from accounts.authentication import get_users_version
+
+from warehouse_app.compiled import CompiledSerializer
+
+from InventoryManagement.utils.exports import EXPORT_WRITERS
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin answering list and retrieve requests with an ETag built from
+    the modified_at and the number of the rows behind the response, and with
+    304 Not Modified when it matches the If-None-Match of the client, before
+    the page is fetched or serialized.
+
+    etag_related_fields: to-one relations shown in the response, their
+    modified_at is read in the same query.
+    get_etag_dependencies(): querysets of to-many rows shown in the response,
+    each one costs an extra aggregate query.
+    etag_nests_users: users are shown in the response, the version of the
+    user states (bumped on every user change) is part of the fingerprint.
+    """
+
+    etag_related_fields = []
+    etag_nests_users = False
+
+    def list(self, request, *args, **kwargs):
+        if not self.list_etag_enabled(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_conditional_response(queryset, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookups (e.g. not a uuid) are left to the 404 of get_object()
+            return super().retrieve(request, *args, **kwargs)
+        return self.get_conditional_response(queryset, super().retrieve, request, *args, **kwargs)
+
+    def list_etag_enabled(self, request):
+        """
+        The list fingerprint counts every filtered row, which is what cursor pages
+        and estimated counts (PAGINATION_ESTIMATE_COUNT_THRESHOLD) are there to avoid.
+        """
+        is_cursor_request = getattr(self.paginator, "is_cursor_request", None)
+        if is_cursor_request is not None and is_cursor_request(request):
+            return False
+        return not settings.PAGINATION_ESTIMATE_COUNT_THRESHOLD
+
+    def get_etag_queryset(self, queryset):
+        """Helper method returning the rows of the response without their annotations."""
+        if queryset.query.annotations:
+            # Search ranks and the like are not needed to fingerprint the rows
+            return queryset.model._default_manager.filter(pk__in=queryset.values("pk"))
+        return queryset
+
+    def get_etag_dependencies(self, queryset):
+        return []
+
+    def get_etag_fingerprint(self, queryset):
+        """Helper method summing up the rows of the response, None when there are none."""
+        queryset = self.get_etag_queryset(queryset).order_by()
+
+        aggregates = {"modified_at": Max("modified_at"), "count": Count("pk")}
+        for field in self.etag_related_fields:
+            aggregates[f"{field}_modified_at"] = Max(f"{field}__modified_at")
+        fingerprint = [queryset.aggregate(**aggregates)]
+        if not fingerprint[0]["count"]:
+            return None
+
+        for dependency in self.get_etag_dependencies(queryset):
+            fingerprint.append(
+                dependency.order_by().aggregate(
+                    modified_at=Max("modified_at"), count=Count("pk", distinct=True)
+                )
+            )
+        if self.etag_nests_users:
+            fingerprint.append(get_users_version())
+        return fingerprint
+
+    def get_etag(self, request, queryset):
+        fingerprint = self.get_etag_fingerprint(queryset)
+        if fingerprint is None:
+            return None
+
+        # The same rows look different to another user, page or format
+        signature = repr(
+            (fingerprint, request.get_full_path(), request.user.pk, request.accepted_media_type)
+        )
+        return 'W/"%s"' % hashlib.sha256(signature.encode()).hexdigest()[:32]
+
+    def get_conditional_response(self, queryset, handler, request, *args, **kwargs):
+        etag = self.get_etag(request, queryset)
+
+        if etag is not None and self.etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+
+        if etag is not None and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = etag
+        patch_vary_headers(response, ["Authorization", "Accept"])
+        return response
+
+    def etag_matches(self, request, etag):
+        """Helper method comparing the If-None-Match etags (weak comparison)."""
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in client_etags:
+            return True
+        return etag.removeprefix("W/") in [
+            client_etag.removeprefix("W/") for client_etag in client_etags
+        ]
+
+
+class CachedListMixin:
+    """
+    Viewset mixin serving the list pages from a VersionedCache (list_cache), for
+    lists that look the same to every user. Responses carry a Cache-Control
+    max-age of list_cache_max_age_setting seconds so that browsers and proxies
+    keep them too.
+    """
+
+    list_cache = None
+    list_cache_max_age_setting = None
+
+    def list(self, request, *args, **kwargs):
+        def get_data():
+            return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+        data = self.list_cache.get_or_set(request.get_full_path(), get_data)
+        return Response(data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.action == "list" and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            max_age = getattr(settings, self.list_cache_max_age_setting)
+            patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+
+class SparseFieldsetMixin:
+    """
+    Viewset mixin reading the ?fields= and ?expand= query parameters of GET
+    requests (comma separated field names) and passing them to the serializers
+    that take them (SparseFieldsetSerializerMixin).
+
+    field_relations: the relations each field needs, as
+    {"field": {"select_related": [...], "prefetch_related": [...]}}. When a
+    sparse fieldset is asked for, the queryset only loads the relations of the
+    rendered fields: to-many relations that are not expanded only prefetch
+    their primary keys, to-one ones nothing. It must list every relation the
+    queryset loads for the serializers of the viewset.
+    """
+
+    field_relations = {}
+
+    def get_sparse_fieldset(self):
+        """Helper method returning the (fields, expand) lists asked for, None when absent."""
+        if self.request.method != "GET":
+            return None, None
+
+        def parse(param):
+            value = self.request.query_params.get(param)
+            if value is None:
+                return None
+            return [name.strip() for name in value.split(",") if name.strip()]
+
+        return parse("fields"), parse("expand")
+
+    def is_field_requested(self, name):
+        fields, _ = self.get_sparse_fieldset()
+        return fields is None or name in fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_sparse_fieldset()
+        if fields is not None or expand is not None:
+            kwargs.setdefault("fields", fields)
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        return self.get_sparse_queryset(super().filter_queryset(queryset))
+
+    def get_sparse_queryset(self, queryset):
+        fields, expand = self.get_sparse_fieldset()
+        if fields is None and expand is None:
+            return queryset
+
+        serializer_fields = self.get_serializer_class()().fields
+        select_related, prefetch_related = [], []
+        for name, relations in self.field_relations.items():
+            # Relations of fields the serializer of the action does not have are not loaded
+            if name not in serializer_fields or not self.is_field_requested(name):
+                continue
+            field = serializer_fields[name]
+            collapsed = (
+                expand is not None
+                and name not in expand
+                and isinstance(field, serializers.BaseSerializer)
+            )
+            if not collapsed:
+                select_related += relations.get("select_related", [])
+                prefetch_related += relations.get("prefetch_related", [])
+            elif isinstance(field, serializers.ListSerializer):
+                prefetch_related.append(field.source)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            # select_related() without arguments would follow every foreign key
+            queryset = queryset.select_related(*dict.fromkeys(select_related))
+        return queryset.prefetch_related(*dict.fromkeys(prefetch_related))
+
+
+class CompiledListMixin:
+    """
+    Viewset mixin rendering the list action with a CompiledSerializer of the
+    serializer class: the page is read with values_list() and rendered without
+    model instances. Sparse fieldsets (SparseFieldsetMixin) and
+    settings.COMPILED_LIST_SERIALIZERS = False use the regular serializer.
+
+    compiled_row_columns: columns the paginator reads on the rows of the page
+    (the keyset cursor pagination reads pk and created_at).
+    """
+
+    compiled_row_columns = ["pk", "created_at"]
+
+    def get_compiled_serializer(self):
+        """Helper method returning the CompiledSerializer of the list, None when not used."""
+        if not settings.COMPILED_LIST_SERIALIZERS:
+            return None
+        get_sparse_fieldset = getattr(self, "get_sparse_fieldset", None)
+        if get_sparse_fieldset is not None and get_sparse_fieldset() != (None, None):
+            return None
+        return CompiledSerializer(self.get_serializer_class(), context=self.get_serializer_context())
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = compiled.get_queryset(
+            self.filter_queryset(self.get_queryset()), *self.compiled_row_columns
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.to_representation(page))
+        return Response(compiled.to_representation(queryset))
+
+
+class ExportMixin:
+    """
+    Viewset mixin adding GET <list>/export/?export_format=csv|ndjson|xlsx, the
+    filtered rows of the list (same filters, search and ordering) streamed as
+    a file. Rows are read with a server-side cursor, settings.EXPORT_CHUNK_SIZE
+    at a time, and written as they come: memory does not grow with the export.
+
+    export_columns: (header, lookup or query expression) of the columns.
+    """
+
+    export_columns = []
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file format is the export_format parameter, not the Accept header
+        return super().perform_content_negotiation(request, force=force or self.action == "export")
+
+    def get_export_rows(self, queryset):
+        """Helper method returning the values_list() rows of the export."""
+        annotations, lookups = {}, []
+        for header, column in self.export_columns:
+            if isinstance(column, str):
+                lookups.append(column)
+            else:
+                annotations[f"{header}_export"] = column
+                lookups.append(f"{header}_export")
+        queryset = queryset.select_related(None).prefetch_related(None).annotate(**annotations)
+        # The rows are read once the view has returned, the database is picked now
+        # while the request is still routed (read replica)
+        return queryset.using(queryset.db).values_list(*lookups)
+
+    @action(detail=False, methods=["GET"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get("export_format", "csv")
+        writer_class = EXPORT_WRITERS.get(export_format)
+        if writer_class is None:
+            raise serializers.ValidationError(
+                {"export_format": f"Choose one of: {', '.join(EXPORT_WRITERS)}."}
+            )
+
+        rows = self.get_export_rows(self.filter_queryset(self.get_queryset()))
+        writer = writer_class([header for header, _ in self.export_columns])
+        response = StreamingHttpResponse(
+            writer.stream(rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE), settings.EXPORT_CHUNK_SIZE),
+            content_type=writer.content_type,
+        )
+        filename = f"{self.basename}-{timezone.localtime():%Y%m%d-%H%M%S}.{writer.extension}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
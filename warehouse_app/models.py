@@ -7,7 +7,9 @@ from django.core.exceptions import ValidationError
 
 from phonenumber_field.modelfields import PhoneNumberField
 
-from cloudinary_storage.storage import MediaCloudinaryStorage
+from InventoryManagement.utils.indexes import TrigramIndex
+from InventoryManagement.utils.storages import get_image_staging_storage, get_media_storage
+from InventoryManagement.utils.uuids import uuid7
 import uuid
 import random
 import string
@@ -19,6 +21,17 @@ from decimal import Decimal
 User = get_user_model()
 
 
+class ImageStatus(models.TextChoices):
+    """Where the image uploaded for a product or an employee is (see warehouse_app.images)."""
+
+    # Staged on the local disk, waiting for process_images
+    PENDING = "pending", "Pending"
+    # Claimed by a process_images worker, uploading to the media storage
+    PROCESSING = "processing", "Processing"
+    READY = "ready", "Ready"
+    FAILED = "failed", "Failed"
+
+
 class Warehouse(models.Model):
     id = models.UUIDField(
         default=uuid.uuid4, editable=False, primary_key=True, unique=True
@@ -34,18 +47,30 @@ class Warehouse(models.Model):
 
 
 class Employee(models.Model):
+    # Initial password of the accounts created for new employees
+    DEFAULT_PASSWORD = "987654321@"
+
     id = models.UUIDField(
         default=uuid.uuid4, editable=False, primary_key=True, unique=True
     )
+    # Indexed through the composite indexes in Meta
     warehouse = models.ForeignKey(
-        Warehouse, related_name="employees", on_delete=models.CASCADE
+        Warehouse, related_name="employees", on_delete=models.CASCADE, db_index=False
     )
     user = models.OneToOneField(User, related_name="employee", on_delete=models.CASCADE, null=True)
     first_name = models.CharField(max_length=100, blank=True, null=True)
     last_name = models.CharField(max_length=100, blank=True, null=True)
     phone_number = PhoneNumberField()
     id_number = models.CharField(max_length=20, blank=True, null=True)
-    image = models.ImageField(null=True, blank=True, upload_to="employee_images/", storage=MediaCloudinaryStorage)
+    image = models.ImageField(null=True, blank=True, upload_to="employee_images/", storage=get_media_storage)
+    # Resized variants of the image, made by process_images
+    image_webp = models.ImageField(null=True, blank=True, upload_to="employee_images/", storage=get_media_storage)
+    image_thumbnail = models.ImageField(null=True, blank=True, upload_to="employee_images/", storage=get_media_storage)
+    # The last upload, until process_images pushes it to the media storage
+    image_staging = models.ImageField(
+        null=True, blank=True, upload_to="employee_images/", storage=get_image_staging_storage
+    )
+    image_status = models.CharField(max_length=20, choices=ImageStatus.choices, blank=True, default="")
     is_manager = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
@@ -88,6 +113,19 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Employee list of a warehouse, newest first
+            models.Index(fields=["warehouse", "-created_at"], name="employee_wh_created_idx"),
+            # Employee search
+            TrigramIndex(field="first_name", name="employee_first_name_trgm_idx"),
+            TrigramIndex(field="last_name", name="employee_last_name_trgm_idx"),
+            # Uploads waiting for (or claimed by) process_images
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(image_status__in=[ImageStatus.PENDING, ImageStatus.PROCESSING]),
+                name="employee_image_pending_idx",
+            ),
+        ]
 
 
 
@@ -118,6 +156,9 @@ class Category(models.Model):
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Categories"
+        indexes = [
+            models.Index(fields=["-created_at"], name="category_created_idx"),
+        ]
     
     
 
@@ -156,10 +197,11 @@ class Product(models.Model):
         BOX = "box", "Box"
 
     id = models.UUIDField(
-        default=uuid.uuid4, editable=False, primary_key=True, unique=True
+        default=uuid7, editable=False, primary_key=True, unique=True
     )
+    # Indexed through the composite indexes in Meta
     warehouse = models.ForeignKey(
-        Warehouse, related_name="products", on_delete=models.CASCADE
+        Warehouse, related_name="products", on_delete=models.CASCADE, db_index=False
     )
     # Category should not be null nor blank so remove later
     category = models.ForeignKey(
@@ -170,9 +212,19 @@ class Product(models.Model):
         on_delete=models.SET_NULL,
     )
     name = models.CharField(max_length=255)
+    # Stock keeping unit, unique within the warehouse, products are imported by it
+    sku = models.CharField(max_length=64, null=True, blank=True)
     slug = models.SlugField(max_length=255, blank=True, null=True)
     description = models.TextField(blank=True)
-    image = models.ImageField(null=True, blank=True, upload_to="product_images/", storage=MediaCloudinaryStorage)
+    image = models.ImageField(null=True, blank=True, upload_to="product_images/", storage=get_media_storage)
+    # Resized variants of the image, made by process_images
+    image_webp = models.ImageField(null=True, blank=True, upload_to="product_images/", storage=get_media_storage)
+    image_thumbnail = models.ImageField(null=True, blank=True, upload_to="product_images/", storage=get_media_storage)
+    # The last upload, until process_images pushes it to the media storage
+    image_staging = models.ImageField(
+        null=True, blank=True, upload_to="product_images/", storage=get_image_staging_storage
+    )
+    image_status = models.CharField(max_length=20, choices=ImageStatus.choices, blank=True, default="")
     measurement_unit = models.CharField(max_length=50, choices=MeasurementUnit.choices)
     quantity = models.PositiveIntegerField(
         default=1,
@@ -198,6 +250,27 @@ class Product(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Product list of a warehouse, newest first (id keys the cursor pages)
+            models.Index(fields=["warehouse", "-created_at", "-id"], name="product_wh_created_idx"),
+            # Product list of the superuser (all warehouses), newest first
+            models.Index(fields=["-created_at", "-id"], name="product_created_idx"),
+            # ProductFilter price and stock ranges, and the dashboard stock levels
+            models.Index(fields=["warehouse", "unit_price"], name="product_wh_price_idx"),
+            models.Index(fields=["warehouse", "quantity"], name="product_wh_quantity_idx"),
+            # Product search
+            TrigramIndex(field="name", name="product_name_trgm_idx"),
+            # Uploads waiting for (or claimed by) process_images
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(image_status__in=[ImageStatus.PENDING, ImageStatus.PROCESSING]),
+                name="product_image_pending_idx",
+            ),
+        ]
+        constraints = [
+            # Conflict target of the product imports
+            models.UniqueConstraint(fields=["warehouse", "sku"], name="product_wh_sku_unique"),
+        ]
 
 
 class Order(models.Model):
@@ -207,10 +280,11 @@ class Order(models.Model):
         COMPLETED = "completed", "Completed"
 
     id = models.UUIDField(
-        default=uuid.uuid4, editable=False, primary_key=True, unique=True
+        default=uuid7, editable=False, primary_key=True, unique=True
     )
+    # Indexed through the composite indexes in Meta
     warehouse = models.ForeignKey(
-        Warehouse, related_name="orders", on_delete=models.CASCADE
+        Warehouse, related_name="orders", on_delete=models.CASCADE, db_index=False
     )
     # Customer should not be null nor blank so remove later
     customer = models.CharField(max_length=255)
@@ -236,6 +310,19 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Order list of a warehouse, newest first (id keys the cursor pages)
+            models.Index(fields=["warehouse", "-created_at", "-id"], name="order_wh_created_idx"),
+            # Order list of the superuser (all warehouses), newest first
+            models.Index(fields=["-created_at", "-id"], name="order_created_idx"),
+            # OrderFilter status and date range, and the dashboard annual sales
+            models.Index(
+                fields=["warehouse", "order_status", "created_at"],
+                name="order_wh_status_created_idx",
+            ),
+            # Order search by customer
+            TrigramIndex(field="customer", name="order_customer_trgm_idx"),
+        ]
         
     def generate_tracking_id(self):
         while True:
@@ -263,10 +350,11 @@ class Order(models.Model):
 
 class OrderPartialPayment(models.Model):
     id = models.UUIDField(
-        default=uuid.uuid4, editable=False, primary_key=True, unique=True
+        default=uuid7, editable=False, primary_key=True, unique=True
     )
+    # Indexed through the composite index in Meta
     order = models.ForeignKey(
-        Order, on_delete=models.CASCADE, related_name="partial_payments"
+        Order, on_delete=models.CASCADE, related_name="partial_payments", db_index=False
     )
     amount = models.DecimalField(
         max_digits=15,
@@ -280,14 +368,19 @@ class OrderPartialPayment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Payments prefetched for a page of orders
+            models.Index(fields=["order", "-created_at"], name="payment_order_created_idx"),
+        ]
 
 
 class OrderItem(models.Model):
     id = models.UUIDField(
-        default=uuid.uuid4, editable=False, primary_key=True, unique=True
+        default=uuid7, editable=False, primary_key=True, unique=True
     )
+    # Indexed through the composite index in Meta
     order = models.ForeignKey(
-        Order, on_delete=models.CASCADE, related_name="order_items"
+        Order, on_delete=models.CASCADE, related_name="order_items", db_index=False
     )
     product = models.ForeignKey(
         Product,
@@ -312,3 +405,7 @@ class OrderItem(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Items prefetched for a page of orders
+            models.Index(fields=["order", "-created_at"], name="orderitem_order_created_idx"),
+        ]
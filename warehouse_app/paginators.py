@@ -1,7 +1,85 @@
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, _positive_int
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
 from collections import OrderedDict
+from datetime import datetime
+import base64
+import hashlib
+import json
+import uuid
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids running an exact COUNT(*) on every page.
+    Above PAGINATION_ESTIMATE_COUNT_THRESHOLD rows it returns the PostgreSQL
+    planner estimate of the filtered query, below it the exact count, cached for
+    PAGINATION_COUNT_CACHE_TIMEOUT seconds per query signature.
+    """
+
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or queryset.query.is_empty():
+            return super().count
+
+        threshold = settings.PAGINATION_ESTIMATE_COUNT_THRESHOLD
+        timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+
+        if threshold and connections[queryset.db].vendor == "postgresql":
+            estimate = self.get_estimated_count(queryset)
+            if estimate >= threshold:
+                self.count_is_approximate = True
+                return estimate
+
+        if not timeout:
+            return queryset.count()
+
+        cache_key = self.get_count_cache_key(queryset)
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, timeout)
+        return count
+
+    def get_estimated_count(self, queryset):
+        """Helper method reading the row estimate of the query from its plan."""
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_count_cache_key(self, queryset):
+        """Helper method building a cache key from the filtered SQL of the queryset."""
+        sql, params = queryset.order_by().query.sql_with_params()
+        signature = repr((queryset.db, sql, params))
+        return f"paginator-count:{hashlib.sha256(signature.encode()).hexdigest()}"
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # The estimate can fall short of the real count, serve the pages past it
+            if not self.count_is_approximate or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if not self.count_is_approximate and top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(self.object_list[bottom:top], number, self)
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -13,6 +91,24 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10  # Default page size
     page_size_query_param = 'page_size'  # Query parameter to specify the page size
     max_page_size = 100  # Maximum number of items per page
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_approximate', self.page.paginator.count_is_approximate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_approximate'] = {
+            'type': 'boolean',
+            'example': False,
+        }
+        return response_schema
 
 
     # def __init__(self, page_size=None):
@@ -67,3 +163,157 @@ class CustomPageNumberPagination(PageNumberPagination):
     #     return next_number if next_number >= 1 else None
 
 
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id), newest first.
+    Each page is fetched with a WHERE on the last row of the previous page
+    instead of an OFFSET, and no COUNT(*) is run, so every page costs the same
+    whatever its depth. The (created_at, id) composite indexes serve the query.
+    """
+
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            # Going backwards: walk up from the cursor and flip the page afterwards
+            queryset = queryset.order_by('created_at', 'id')
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+
+        if position is not None:
+            created_at, pk = position
+            if reverse:
+                queryset = queryset.filter(created_at__gte=created_at).filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+
+        # One extra row tells whether there is anything past this page
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        """Helper method returning the ((created_at, id), reverse) of the cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = (datetime.fromisoformat(data['c']), uuid.UUID(str(data['i'])))
+            return position, bool(data.get('r', False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        """Helper method building the link to the page after (or before) instance."""
+        data = {'c': instance.created_at.isoformat(), 'i': str(instance.pk)}
+        if reverse:
+            data['r'] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Nothing left past the cursor, start again from the newest rows
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, '')
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CursorOrPageNumberPagination(BasePagination):
+    """
+    Page-number pagination by default, keyset cursor pagination when the client
+    opts in with ?cursor= (left empty for the first page).
+    Cursor pages are always ordered newest first.
+    """
+
+    cursor_pagination_class = KeysetCursorPagination
+    page_number_pagination_class = CustomPageNumberPagination
+
+    def is_cursor_request(self, request):
+        return self.cursor_pagination_class.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_request(request):
+            self.paginator = self.cursor_pagination_class()
+        else:
+            self.paginator = self.page_number_pagination_class()
+        self.display_page_controls = self.paginator.display_page_controls
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_pagination_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number_pagination_class().get_schema_operation_parameters(view) + [
+            {
+                'name': self.cursor_pagination_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Switches to cursor pagination, empty for the first page.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+    def to_html(self):
+        return self.paginator.to_html()
+
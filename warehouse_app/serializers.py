@@ -1,6 +1,13 @@
+import copy
+import csv
+import io
+import logging
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from django.db.models import F, Count, Q, Sum
+from django.db import models, transaction
+from django.db.models import F, Count, OuterRef, Q, Subquery, Sum, Value, prefetch_related_objects
+from django.db.models.functions import Coalesce
 from django.contrib.auth.hashers import make_password
 from django.contrib.contenttypes.models import ContentType
 from django.utils.timezone import now
@@ -10,6 +17,10 @@ from django.utils.text import slugify
 
 from rest_framework import serializers
 
+from accounts.authentication import invalidate_users_state
+
+from warehouse_app.cache import product_fragment_cache
+from warehouse_app.images import stage_image
 from warehouse_app.models import (
     OrderPartialPayment,
     Warehouse,
@@ -31,10 +42,51 @@ from InventoryManagement.utils.crudevents import (
     update_crudevent,
 )
 from InventoryManagement.utils.context_manager import set_current_context
+from InventoryManagement.utils.imports import IMPORT_READERS, get_import_format
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin taking two extra arguments:
+    fields: names of the only fields to render.
+    expand: names of the nested serializers to render, the other ones are
+    rendered as primary keys. None renders all of them (the default output).
+    Unknown names are a validation error.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fieldset = (fields, expand)
+
+        for param, names in (("fields", fields), ("expand", expand)):
+            unknown = sorted(set(names or []) - set(self.fields))
+            if unknown:
+                raise serializers.ValidationError({param: f"Unknown fields: {', '.join(unknown)}"})
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        if expand is not None:
+            for name, field in list(self.fields.items()):
+                if name in expand or not isinstance(field, serializers.BaseSerializer):
+                    continue
+                pk_kwargs = {"read_only": True}
+                if field.source != name:
+                    pk_kwargs["source"] = field.source
+                if isinstance(field, serializers.ListSerializer):
+                    pk_kwargs["many"] = True
+                self.fields[name] = serializers.PrimaryKeyRelatedField(**pk_kwargs)
+
+    @property
+    def is_sparse(self):
+        return self.sparse_fieldset != (None, None)
+
+
 # All simplified serializers
 # Will be referenced in other serializers to have more details about the related objects
 class SimpleUserModelSerializer(serializers.ModelSerializer):
@@ -53,6 +105,8 @@ class SimpleUserModelSerializer(serializers.ModelSerializer):
             "is_active",
             "is_manager",
         ]
+        # Columns read by get_is_manager() for the compiled lists (warehouse_app.compiled)
+        compiled_fields = {"is_manager": ["role"]}
 
     def get_is_manager(self, user):
         if user.role == User.ROLES.EMPLOYEE_MANAGER:
@@ -240,9 +294,12 @@ class CreateOrderPartialPaymentSerializer(serializers.ModelSerializer):
                             order=order, amount=amount
                         )
                         remainder -= amount
+                        # The payment changes the remainder of the order, so its
+                        # modified_at moves too (the order was loaded with only())
+                        order_changes = {"modified_at": now()}
                         if remainder == 0:
-                            order.order_status = Order.Status.COMPLETED
-                            order.save()
+                            order_changes["order_status"] = Order.Status.COMPLETED
+                        Order.objects.filter(id=order.id).update(**order_changes)
                         return payment_instance
             else:
                 raise serializers.ValidationError(
@@ -313,7 +370,7 @@ class UserWithLogsSerializer(serializers.ModelSerializer):
 
 
 # Employee related serializers
-class EmployeeModelSerializer(serializers.ModelSerializer):
+class EmployeeModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     warehouse = SimpleWarehouseModelSerializer(many=False, read_only=True)
     user = SimpleUserModelSerializer(many=False, read_only=True)
 
@@ -328,6 +385,9 @@ class EmployeeModelSerializer(serializers.ModelSerializer):
             "phone_number",
             "id_number",
             "image",
+            "image_webp",
+            "image_thumbnail",
+            "image_status",
             "is_manager",
             "created_at",
         ]
@@ -402,7 +462,7 @@ class CreateEmployeeSerializer(serializers.Serializer):
                         first_name=first_name,
                         last_name=last_name,
                         phone_number=phone_number,
-                        image=image,
+                        **stage_image({"image": image}),
                         is_manager=is_manager,
                         id_number=id_number,
                         warehouse_id=warehouse_id,
@@ -415,6 +475,213 @@ class CreateEmployeeSerializer(serializers.Serializer):
             raise serializers.ValidationError(str(e))
 
 
+class ImportEmployeeRowSerializer(CreateEmployeeSerializer):
+    """One employee of an import: CreateEmployeeSerializer without the image."""
+
+    image = None
+    # The username of the account is the full name
+    first_name = serializers.CharField(max_length=40)
+    last_name = serializers.CharField(max_length=40)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if "is_manager" in fields:
+            fields["is_manager"] = serializers.BooleanField(default=False)
+        return fields
+
+
+class ImportEmployeesSerializer(serializers.Serializer):
+    """
+    Creates many employees and their accounts at once, from a CSV file (one
+    column per ImportEmployeeRowSerializer field) or a JSON list of employees.
+    Every row is validated before anything is saved, the errors are reported by
+    row number (1 for the first one) and no employee is created when there are
+    any. The initial password is hashed once for all the accounts.
+    """
+
+    file = serializers.FileField(required=False)
+    employees = serializers.ListField(child=serializers.DictField(), required=False)
+
+    def get_rows(self, attrs):
+        if attrs.get("file") is not None:
+            try:
+                content = attrs["file"].read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                raise serializers.ValidationError({"file": "The file must be UTF-8 encoded CSV"})
+            # Empty cells are left to the defaults of the fields
+            return [
+                {column: value for column, value in row.items() if column and value not in ("", None)}
+                for row in csv.DictReader(io.StringIO(content))
+            ]
+        if attrs.get("employees") is not None:
+            return attrs["employees"]
+        raise serializers.ValidationError({"message": "Send a CSV file or a list of employees"})
+
+    def validate(self, attrs):
+        rows = self.get_rows(attrs)
+        if not rows:
+            raise serializers.ValidationError({"message": "There are no employees to import"})
+        if len(rows) > settings.EMPLOYEE_IMPORT_MAX_ROWS:
+            raise serializers.ValidationError(
+                {"message": f"At most {settings.EMPLOYEE_IMPORT_MAX_ROWS} employees can be imported at once"}
+            )
+
+        errors, validated_rows = {}, {}
+        for number, row in enumerate(rows, start=1):
+            serializer = ImportEmployeeRowSerializer(data=row, context=self.context)
+            if serializer.is_valid():
+                validated_rows[number] = serializer.validated_data
+            else:
+                errors[number] = serializer.errors
+
+        # Unique accounts, within the rows and against the existing ones
+        emails, usernames = {}, {}
+        for number, data in validated_rows.items():
+            emails.setdefault(data["email"].lower(), []).append(number)
+            usernames.setdefault(f"{data['first_name']} {data['last_name']}", []).append(number)
+        taken_emails = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+        for values, taken, field, message in (
+            (emails, taken_emails, "email", "A user with this email already exists"),
+            (usernames, taken_usernames, "username", "A user with this full name already exists"),
+        ):
+            for value, numbers in values.items():
+                if value in taken or len(numbers) > 1:
+                    for number in numbers:
+                        errors.setdefault(number, {})[field] = [message]
+
+        user = self.context["user"]
+        if user.is_superuser:
+            warehouse_ids = {data["warehouse_id"] for data in validated_rows.values()}
+            existing_ids = set(Warehouse.objects.filter(id__in=warehouse_ids).values_list("id", flat=True))
+            for number, data in validated_rows.items():
+                if data["warehouse_id"] not in existing_ids:
+                    errors.setdefault(number, {})["warehouse_id"] = ["This warehouse does not exist"]
+
+        if errors:
+            raise serializers.ValidationError({"rows": dict(sorted(errors.items()))})
+        return {"rows": list(validated_rows.values())}
+
+    def save(self, **kwargs):
+        user = self.context["user"]
+        # Same salt for every account, they all start with the same password anyway
+        password = make_password(Employee.DEFAULT_PASSWORD)
+
+        employees, users = [], []
+        for data in self.validated_data["rows"]:
+            if user.is_superuser:
+                warehouse_id = data["warehouse_id"]
+                is_manager = data["is_manager"]
+            else:
+                warehouse_id = self.context["warehouse_id"]
+                is_manager = False
+            employee = Employee(
+                first_name=data["first_name"],
+                last_name=data["last_name"],
+                phone_number=data["phone_number"],
+                is_manager=is_manager,
+                id_number=data["id_number"],
+                warehouse_id=warehouse_id,
+            )
+            employee.user = User(
+                email=data["email"].lower(),
+                username=f"{data['first_name']} {data['last_name']}",
+                password=password,
+                first_name=data["first_name"],
+                last_name=data["last_name"],
+                role=User.ROLES.EMPLOYEE_MANAGER if is_manager else User.ROLES.EMPLOYEE,
+                warehouse_id=warehouse_id,
+                employee_id=employee.id,
+            )
+            employees.append(employee)
+            users.append(employee.user)
+
+        # No post_save signals: the accounts are created here, not by create_user_for_employee
+        with set_current_context(user):
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Employee.objects.bulk_create(employees)
+                # Serialized in the audit events, in two queries rather than two per user
+                prefetch_related_objects(users, "groups", "user_permissions")
+                bulk_create_crudevents(objects=[*employees, *users])
+        return employees
+
+
+class BulkEmployeeActionSerializer(serializers.Serializer):
+    """
+    Applies one of OPERATIONS (context["operation"]) to many employees at once,
+    among the employees the user can see (context["employees"]). The accounts
+    and the employees are each changed by one UPDATE and the audit events are
+    created together. Employees already in the requested state are left out.
+    """
+
+    # Operation: (account fields, employee fields)
+    OPERATIONS = {
+        "block": ({"is_active": False}, {}),
+        "unblock": ({"is_active": True}, {}),
+        "set-manager": ({"role": User.ROLES.EMPLOYEE_MANAGER}, {"is_manager": True}),
+        "set-employee": ({"role": User.ROLES.EMPLOYEE}, {"is_manager": False}),
+    }
+
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def validate_ids(self, ids):
+        if len(ids) > settings.EMPLOYEE_BULK_ACTION_MAX_IDS:
+            raise serializers.ValidationError(
+                f"At most {settings.EMPLOYEE_BULK_ACTION_MAX_IDS} employees can be changed at once"
+            )
+        ids = list(dict.fromkeys(ids))
+        employees = {employee.id: employee for employee in self.context["employees"].filter(id__in=ids)}
+        missing = [str(employee_id) for employee_id in ids if employee_id not in employees]
+        if missing:
+            raise serializers.ValidationError(f"These employees do not exist: {', '.join(missing)}")
+        return [employees[employee_id] for employee_id in ids]
+
+    def save(self, **kwargs):
+        user = self.context["user"]
+        user_changes, employee_changes = self.OPERATIONS[self.context["operation"]]
+        employees = [
+            employee
+            for employee in self.validated_data["ids"]
+            if any(getattr(employee.user, field) != value for field, value in user_changes.items())
+            or any(getattr(employee, field) != value for field, value in employee_changes.items())
+        ]
+        if not employees:
+            return []
+
+        user_events, employee_events = [], []
+        for employee in employees:
+            old_employee = copy.copy(employee)
+            user_events.append({"old_obj": copy.copy(employee.user), "obj": employee.user})
+            for field, value in user_changes.items():
+                setattr(employee.user, field, value)
+            if employee_changes:
+                employee_events.append({"old_obj": old_employee, "obj": employee})
+                for field, value in employee_changes.items():
+                    setattr(employee, field, value)
+
+        user_ids = [employee.user_id for employee in employees]
+        with set_current_context(user):
+            with transaction.atomic():
+                User.objects.filter(id__in=user_ids).update(**user_changes)
+                if employee_changes:
+                    # update() leaves auto_now alone
+                    modified_at = now()
+                    Employee.objects.filter(id__in=[employee.id for employee in employees]).update(
+                        **employee_changes, modified_at=modified_at
+                    )
+                    for employee in employees:
+                        employee.modified_at = modified_at
+                # Serialized in the audit events, in two queries rather than two per user
+                users = [employee.user for employee in employees]
+                prefetch_related_objects(users, "groups", "user_permissions")
+                bulk_update_crudevents(objects=[*user_events, *employee_events])
+                # No post_save signals: the authentication must see the change, once
+                # committed, or a concurrent request would cache the old state again
+                transaction.on_commit(lambda: invalidate_users_state(user_ids))
+        return employees
+
+
 class UpdateEmployeeSerializer(serializers.Serializer):
     first_name = serializers.CharField(max_length=50, required=False)
     last_name = serializers.CharField(max_length=50, required=False)
@@ -425,8 +692,8 @@ class UpdateEmployeeSerializer(serializers.Serializer):
     def update(self, instance, validated_data):
         user = self.context["user"]
         sender = Employee.objects.select_related("user").filter(id=instance.id).first()
-        # Update the instance
-        for attr, value in validated_data.items():
+        # Update the instance, a new image is staged for process_images
+        for attr, value in stage_image(validated_data).items():
             setattr(instance, attr, value)
 
         instance.save()
@@ -448,6 +715,7 @@ class CreateProductModelSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "name",
+            "sku",
             "category",
             "description",
             "image",
@@ -475,6 +743,15 @@ class CreateProductModelSerializer(serializers.ModelSerializer):
             del fields["warehouse_id"]
         return fields
 
+    def validate(self, attrs):
+        warehouse_id = attrs.get("warehouse_id") or self.context.get("warehouse_id")
+        # A blank SKU is stored as NULL, the only value product_wh_sku_unique lets repeat
+        if "sku" in attrs:
+            attrs["sku"] = attrs["sku"] or None
+        if attrs.get("sku") and Product.objects.filter(warehouse_id=warehouse_id, sku=attrs["sku"]).exists():
+            raise serializers.ValidationError({"sku": "A product of this warehouse already has this SKU"})
+        return attrs
+
     def create(self, validated_data):
         user = self.context["user"]
         if user.is_superuser:
@@ -491,7 +768,7 @@ class CreateProductModelSerializer(serializers.ModelSerializer):
         try:
             with set_current_context(user):
                 with transaction.atomic():
-                    new_product = Product.objects.create(**self.validated_data)
+                    new_product = Product.objects.create(**stage_image(self.validated_data))
 
                     return new_product
         except Exception as e:
@@ -507,6 +784,7 @@ class UpdateProductModelSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "name",
+            "sku",
             "category",
             "description",
             "image",
@@ -517,6 +795,15 @@ class UpdateProductModelSerializer(serializers.ModelSerializer):
             "modified_at",
         ]
 
+    def validate_sku(self, value):
+        # A blank SKU is stored as NULL, the only value product_wh_sku_unique lets repeat
+        if not value:
+            return None
+        products = Product.objects.filter(warehouse_id=self.instance.warehouse_id, sku=value)
+        if products.exclude(id=self.instance.id).exists():
+            raise serializers.ValidationError("A product of this warehouse already has this SKU")
+        return value
+
     def update(self, instance, validated_data):
         # Get the user who made the update
         # print(f"validated_data: {validated_data}")
@@ -528,9 +815,11 @@ class UpdateProductModelSerializer(serializers.ModelSerializer):
             .filter(id=instance.id)
             .first()
         )
+        # Its cached representation is outdated
+        product_fragment_cache.invalidate(sender)
 
-        # Update the instance
-        for attr, value in validated_data.items():
+        # Update the instance, a new image is staged for process_images
+        for attr, value in stage_image(validated_data).items():
             setattr(instance, attr, value)
 
         instance.save()
@@ -542,6 +831,191 @@ class UpdateProductModelSerializer(serializers.ModelSerializer):
         return instance
 
 
+class ImportProductRowSerializer(serializers.ModelSerializer):
+    """
+    One row of a product import. Only sku is required: the other columns
+    default to the current values of the product, name and measurement_unit
+    are required when the SKU is new (ImportProductsSerializer checks them).
+    category is the name of an existing category.
+    """
+
+    sku = serializers.CharField(max_length=64)
+    name = serializers.CharField(max_length=255, required=False)
+    category = serializers.CharField(max_length=30, required=False)
+    measurement_unit = serializers.ChoiceField(choices=Product.MeasurementUnit, required=False)
+    warehouse_id = serializers.UUIDField(required=False)
+
+    class Meta:
+        model = Product
+        fields = [
+            "sku",
+            "name",
+            "category",
+            "description",
+            "measurement_unit",
+            "quantity",
+            "unit_price",
+            "is_available",
+            "expiratory_date",
+            "warehouse_id",
+        ]
+
+    def validate(self, attrs):
+        user = self.context["user"]
+        if user.is_superuser:
+            if not attrs.get("warehouse_id"):
+                raise serializers.ValidationError({"warehouse_id": "This field is required."})
+        else:
+            # Managers import to their own warehouse
+            attrs["warehouse_id"] = self.context["warehouse_id"]
+        return attrs
+
+
+class ImportProductsSerializer(serializers.Serializer):
+    """
+    Creates or updates the products of a CSV or NDJSON file (one column or key
+    per ImportProductRowSerializer field) by SKU within their warehouse. The
+    file is read and saved settings.PRODUCT_IMPORT_CHUNK_SIZE rows at a time,
+    each chunk with one upsert and one INSERT per kind of audit event, in its
+    own transaction. Rows that are wrong are reported by row number (1 for the
+    first one) and left out, the others are imported.
+    """
+
+    file = serializers.FileField()
+    import_format = serializers.ChoiceField(choices=list(IMPORT_READERS), required=False)
+
+    # Columns the import may change, modified_at follows them
+    import_fields = [
+        "name",
+        "category",
+        "description",
+        "measurement_unit",
+        "quantity",
+        "unit_price",
+        "is_available",
+        "expiratory_date",
+    ]
+
+    def validate(self, attrs):
+        attrs.setdefault("import_format", get_import_format(attrs["file"].name))
+        if attrs["import_format"] is None:
+            raise serializers.ValidationError(
+                {"import_format": f"Cannot tell the format of the file, use one of {', '.join(IMPORT_READERS)}"}
+            )
+        return attrs
+
+    def save(self, **kwargs):
+        """Imports the file, returns the counts of the rows and the errors."""
+        reader = IMPORT_READERS[self.validated_data["import_format"]](self.validated_data["file"])
+        row_serializer = ImportProductRowSerializer(context=self.context)
+        self.summary = {"rows": 0, "created": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": {}}
+        # (warehouse_id, sku) of the rows already imported, an upsert cannot change a row twice
+        self.seen_keys = set()
+
+        for chunk in reader.chunks(settings.PRODUCT_IMPORT_CHUNK_SIZE):
+            rows = {}
+            for number, row, error in chunk:
+                if error is not None:
+                    self.add_error(number, {"non_field_errors": [error]})
+                    continue
+                try:
+                    rows[number] = row_serializer.run_validation(row)
+                except serializers.ValidationError as e:
+                    self.add_error(number, serializers.as_serializer_error(e))
+            self.import_chunk(rows)
+            self.summary["rows"] += len(chunk)
+            logger.info(
+                "Product import: %s rows read, %s created, %s updated",
+                self.summary["rows"], self.summary["created"], self.summary["updated"],
+            )
+        return self.summary
+
+    def add_error(self, number, error):
+        self.summary["failed"] += 1
+        if len(self.summary["errors"]) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+            self.summary["errors"][number] = error
+
+    def get_product(self, number, data, warehouses, categories, existing):
+        """Helper method returning (old product or None, new product), None when the row is wrong."""
+        warehouse = warehouses.get(data.pop("warehouse_id"))
+        if warehouse is None:
+            self.add_error(number, {"warehouse_id": ["This warehouse does not exist"]})
+            return None
+        if "category" in data:
+            data["category"] = categories.get(slugify(data["category"]))
+            if data["category"] is None:
+                self.add_error(number, {"category": ["This category does not exist"]})
+                return None
+        key = (warehouse.id, data["sku"])
+        if key in self.seen_keys:
+            self.add_error(number, {"sku": ["This SKU is already in an earlier row"]})
+            return None
+
+        old_product = existing.get(key)
+        if old_product is None:
+            missing = [field for field in ("name", "measurement_unit") if field not in data]
+            if missing:
+                self.add_error(number, {field: ["This field is required for a new product."] for field in missing})
+                return None
+            product = Product(warehouse=warehouse, **data)
+        else:
+            product = copy.copy(old_product)
+            for field, value in data.items():
+                setattr(product, field, value)
+        self.seen_keys.add(key)
+        return old_product, product
+
+    def import_chunk(self, rows):
+        if not rows:
+            return
+        user = self.context["user"]
+        warehouse_ids = {data["warehouse_id"] for data in rows.values()}
+        warehouses = Warehouse.objects.in_bulk(warehouse_ids)
+        slugs = {slugify(data["category"]) for data in rows.values() if "category" in data}
+        categories = {category.slug: category for category in Category.objects.filter(slug__in=slugs)} if slugs else {}
+        existing = {
+            (product.warehouse_id, product.sku): product
+            for product in Product.objects.select_related("warehouse", "category")
+            .filter(warehouse_id__in=warehouse_ids, sku__in={data["sku"] for data in rows.values()})
+            .order_by()
+        }
+
+        created, updated = [], []
+        for number, data in rows.items():
+            result = self.get_product(number, data, warehouses, categories, existing)
+            if result is None:
+                continue
+            old_product, product = result
+            if old_product is None:
+                created.append(product)
+            elif any(getattr(old_product, field) != getattr(product, field) for field in self.import_fields):
+                updated.append({"old_obj": old_product, "obj": product})
+            else:
+                self.summary["unchanged"] += 1
+        if not created and not updated:
+            return
+
+        with set_current_context(user):
+            with transaction.atomic():
+                Product.objects.bulk_create(
+                    [*created, *(pair["obj"] for pair in updated)],
+                    update_conflicts=True,
+                    unique_fields=["warehouse", "sku"],
+                    update_fields=[*self.import_fields, "modified_at"],
+                )
+                for pair in updated:
+                    # Set by the insert, the row keeps its own
+                    pair["obj"].created_at = pair["old_obj"].created_at
+                if created:
+                    bulk_create_crudevents(objects=created)
+                if updated:
+                    bulk_update_crudevents(objects=updated)
+        # Their cached representations are outdated
+        product_fragment_cache.invalidate_many(pair["old_obj"] for pair in updated)
+        self.summary["created"] += len(created)
+        self.summary["updated"] += len(updated)
+
+
 class WarehousesListForDashboardSerializer(serializers.Serializer):
     id = serializers.UUIDField()
     name = serializers.CharField()
@@ -575,16 +1049,37 @@ class DashboardDataSerializer(serializers.Serializer):
     
 
 
-class ProductModelSerializer(serializers.ModelSerializer):
+class FragmentCacheListSerializer(serializers.ListSerializer):
+    """
+    List serializer assembling the items from the FragmentCache of the child
+    serializer (Meta.fragment_cache) with a single get_many, only the missing
+    items are serialized.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        if getattr(self.child, "is_sparse", False):
+            # Pruned fieldsets are cheap to serialize and their relations may not be loaded
+            return [self.child.to_representation(item) for item in iterable]
+        return self.child.Meta.fragment_cache.get_many(iterable, self.child.to_representation)
+
+
+class ProductModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     warehouse = SimpleWarehouseModelSerializer(many=False)
     category = SimpleCategoryModelSerializer(many=False)
 
     class Meta:
         model = Product
+        list_serializer_class = FragmentCacheListSerializer
+        fragment_cache = product_fragment_cache
         fields = [
             "id",
             "name",
+            "sku",
             "image",
+            "image_webp",
+            "image_thumbnail",
+            "image_status",
             "category",
             "description",
             "warehouse",
@@ -760,16 +1255,16 @@ class CreateOrderSerializer(serializers.ModelSerializer):
                         # Reduce the quantity of the ordered products
                         new_quantity = F("quantity") - quantity
                         products_to_update.append(
-                            Product(id=product_id, quantity=new_quantity)
+                            Product(id=product_id, quantity=new_quantity, modified_at=now())
                         )
 
-                # Bulk update products
-                Product.objects.bulk_update(products_to_update, ["quantity"])
+                # Bulk update products, bulk_update does not apply auto_now on its own
+                Product.objects.bulk_update(products_to_update, ["quantity", "modified_at"])
 
         return order
 
 
-class OrderModelSerializer(serializers.ModelSerializer):
+class OrderModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     order_items = SimpleOrderItemSerializer(many=True)
     warehouse = SimpleWarehouseModelSerializer(many=False, read_only=True)
     initiator = SimpleUserModelSerializer(many=False, read_only=True)
@@ -793,6 +1288,20 @@ class OrderModelSerializer(serializers.ModelSerializer):
             "created_at",
             "modified_at",
         ]
+        # get_remainder() computed by the database for the compiled lists (warehouse_app.compiled)
+        compiled_fields = {
+            "remainder": F("total_price") - Coalesce(
+                Subquery(
+                    OrderPartialPayment.objects.filter(order=OuterRef("pk"))
+                    .order_by()
+                    .values("order")
+                    .annotate(total=Sum("amount"))
+                    .values("total")
+                ),
+                Value(0),
+                output_field=models.DecimalField(max_digits=15, decimal_places=2),
+            ),
+        }
 
     def get_remainder(self, obj):
         all_partial_payments = obj.partial_payments.all()
@@ -802,7 +1311,7 @@ class OrderModelSerializer(serializers.ModelSerializer):
 
 
 # Warehouse related serializers
-class FullWarehouseModelSerializer(serializers.ModelSerializer):
+class FullWarehouseModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     employees = SimpleEmployeeModelSerializer(many=True)
     products = SimpleProductModelSerializer(many=True)
     orders = SimpleOrderModelSerializer2(many=True)
@@ -812,7 +1321,7 @@ class FullWarehouseModelSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "location", "employees", "products", "orders"]
 
 
-class WarehouseCountModelSerializer(serializers.ModelSerializer):
+class WarehouseCountModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     employee_count = serializers.SerializerMethodField()
     product_count = serializers.SerializerMethodField()
     order_count = serializers.SerializerMethodField()
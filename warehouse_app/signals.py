@@ -1,9 +1,11 @@
 from django.dispatch import receiver
-from django.db.models.signals import pre_save, post_save
+from django.db import connections, transaction
+from django.db.models.signals import pre_save, post_save, post_delete, pre_migrate
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 
 from InventoryManagement.utils.crudevents import bulk_create_crudevents, create_crudevent
+from warehouse_app.cache import category_cache
 from warehouse_app.models import Warehouse, Employee, Category, Product, Order, OrderItem, OrderPartialPayment
 # from warehouse.utils.thread_local import get_current_user
 from InventoryManagement.utils.context_manager import get_current_context
@@ -20,13 +22,10 @@ def create_user_for_employee(sender, instance, created, **kwargs):
             pass
         else:
             try:
-                
-                default_password = "987654321@"
-
                 new_user = User.objects.create_user(
                     email=context.get("email"),
                     username=context.get("username"),
-                    password=default_password,
+                    password=Employee.DEFAULT_PASSWORD,
                     first_name=context.get("first_name"),
                     last_name=context.get("last_name"),
                     role=context.get("role"),
@@ -55,8 +54,15 @@ def before_saving_warehouse(sender, instance, created, **kwargs):
         pass
     
 
+def bump_category_cache():
+    # Bumped again on commit, in case a request cached the rows from before it
+    category_cache.bump_version()
+    transaction.on_commit(category_cache.bump_version)
+
+
 @receiver(post_save, sender=Category)
 def before_saving_category(sender, instance, created, **kwargs):
+    bump_category_cache()
     if created:
         try:
             create_crudevent(obj=instance)
@@ -67,6 +73,11 @@ def before_saving_category(sender, instance, created, **kwargs):
         pass
     
 
+@receiver(post_delete, sender=Category)
+def after_deleting_category(sender, instance, **kwargs):
+    bump_category_cache()
+
+
 @receiver(post_save, sender=Product)
 def before_saving_product(sender, instance, created, **kwargs):
     if created:
@@ -116,3 +127,13 @@ def before_saving_order_partial_payment(sender, instance, created, **kwargs):
     
 
 
+@receiver(pre_migrate)
+def create_trigram_extension(sender, using, **kwargs):
+    # The search indexes (TrigramIndex) need pg_trgm, and the migrations are
+    # generated at deploy time so they cannot carry a TrigramExtension operation
+    if sender.name != "warehouse_app":
+        return
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
@@ -0,0 +1,263 @@
+import difflib
+import json
+import os
+import re
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.cache import category_cache
+from warehouse_app.models import (
+    Category,
+    Employee,
+    Order,
+    OrderItem,
+    OrderPartialPayment,
+    Product,
+    Warehouse,
+)
+
+from easyaudit.models import CRUDEvent
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+# Expected queries of every endpoint. Regenerate it after an intended change with
+# QUERY_BUDGETS_RECORD=True python manage.py test warehouse_app.tests.test_endpoints.test_query_budgets
+BASELINE_PATH = Path(__file__).with_name("query_budgets.json")
+RECORD_BASELINE = os.environ.get("QUERY_BUDGETS_RECORD", "False") == "True"
+
+# Rows seeded before the first measure, the second one runs with 10 times more
+SEED_SIZE = 3
+
+PASSWORD_HASH = make_password("987654321@")
+
+
+def normalize_query(sql):
+    """Helper method stripping the values out of a query so runs can be compared."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\((?:\?(?:::\w+)?, )*\?(?:::\w+)?\)", "(...)", sql)
+    return sql
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+# ----------------------------------------------------------------------------------
+#           Testing that the number of queries of each endpoint does not grow
+#           with the number of rows, nor above the recorded baseline
+# ----------------------------------------------------------------------------------
+
+
+class QueryBudgetTestCase(APITestCase):
+    baseline = load_baseline()
+    recorded = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if RECORD_BASELINE and cls.recorded:
+            baseline = {**load_baseline(), **cls.recorded}
+            BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+    def setUp(self):
+        self.seeded = 0
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            Warehouse.objects.create(name="Site 2", location="Paris")
+            self.category = Category.objects.create(name="Category 0", slug="category-0")
+            self.order = Order.objects.create(
+                warehouse=self.warehouse,
+                customer="John Doe",
+                initiator=self.admin_user,
+                total_price=1500,
+                tracking_id="TM-000000",
+            )
+
+        self.manager_user = User.objects.create(
+            email="mymanager@gmail.com",
+            username="mymanager",
+            password=PASSWORD_HASH,
+            role=User.ROLES.EMPLOYEE_MANAGER,
+            warehouse_id=self.warehouse.id,
+        )
+
+    def seed(self, number_of_rows):
+        """Helper method adding number_of_rows rows of every kind, without signals."""
+        start, end = self.seeded, self.seeded + number_of_rows
+        self.seeded = end
+
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"employee{i}@gmail.com",
+                    username=f"employee{i}",
+                    password=PASSWORD_HASH,
+                    warehouse_id=self.warehouse.id,
+                )
+                for i in range(start, end)
+            ]
+        )
+        Employee.objects.bulk_create(
+            [
+                Employee(
+                    warehouse=self.warehouse,
+                    user=user,
+                    first_name="Employee",
+                    last_name=str(i),
+                    phone_number="+237659789941",
+                )
+                for i, user in zip(range(start, end), users)
+            ]
+        )
+        Category.objects.bulk_create(
+            [Category(name=f"Category {i + 1}", slug=f"category-{i + 1}") for i in range(start, end)]
+        )
+        # bulk_create skips the signals bumping the cached category pages
+        category_cache.bump_version()
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {i}",
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=i,
+                    unit_price=1000 + i,
+                    category=self.category,
+                    warehouse=self.warehouse,
+                )
+                for i in range(start, end)
+            ]
+        )
+        orders = Order.objects.bulk_create(
+            [
+                Order(
+                    warehouse=self.warehouse,
+                    customer=f"Customer {i}",
+                    initiator=user,
+                    total_price=1500,
+                    tracking_id=f"TM-{i + 1:06d}",
+                )
+                for i, user in zip(range(start, end), users)
+            ]
+        )
+        # Every new order gets an item and a payment, the detailed order gets them all
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(order=order, product=product, buying_price=1000, quantity=1)
+                for order, product in zip(orders, products)
+            ]
+            + [
+                OrderItem(order=self.order, product=product, buying_price=1000, quantity=1)
+                for product in products
+            ]
+        )
+        OrderPartialPayment.objects.bulk_create(
+            [OrderPartialPayment(order=order, amount=100) for order in orders]
+            + [OrderPartialPayment(order=self.order, amount=100) for _ in orders]
+        )
+        content_type = ContentType.objects.get_for_model(Product)
+        CRUDEvent.objects.bulk_create(
+            [
+                CRUDEvent(
+                    event_type=CRUDEvent.CREATE,
+                    object_id=str(product.id),
+                    content_type=content_type,
+                    object_repr=product.name,
+                    user=user,
+                    user_pk_as_string=str(user.pk),
+                )
+                for product, user in zip(products, [self.manager_user, *users])
+            ]
+        )
+
+    def get_queries(self, user, url):
+        client = APIClient(SERVER_NAME="localhost")
+        client.credentials(HTTP_AUTHORIZATION=f"Token {RefreshToken.for_user(user).access_token}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {"page_size": 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.content)
+        return [normalize_query(query["sql"]) for query in context.captured_queries]
+
+    def assertQueryBudget(self, name, user, url):
+        self.seed(SEED_SIZE)
+        small_queries = self.get_queries(user, url)
+        self.seed(SEED_SIZE * 9)
+        large_queries = self.get_queries(user, url)
+
+        self.assertEqual(
+            len(large_queries),
+            len(small_queries),
+            msg=f"{name}: the number of queries grows with the number of rows\n"
+            + "\n".join(difflib.unified_diff(small_queries, large_queries, "small", "large", lineterm="")),
+        )
+
+        if RECORD_BASELINE:
+            self.recorded[name] = large_queries
+            return
+
+        self.assertIn(name, self.baseline, msg=f"{name}: no baseline, record it with QUERY_BUDGETS_RECORD=True")
+        expected_queries = self.baseline[name]
+        self.assertLessEqual(
+            len(large_queries),
+            len(expected_queries),
+            msg=f"{name}: {len(large_queries)} queries instead of {len(expected_queries)}\n"
+            + "\n".join(difflib.unified_diff(expected_queries, large_queries, "baseline", "current", lineterm="")),
+        )
+
+    def test_warehouse_list(self):
+        self.assertQueryBudget("warehouses-list", self.admin_user, "/warehouses/")
+
+    def test_warehouse_detail(self):
+        self.assertQueryBudget("warehouses-detail", self.admin_user, f"/warehouses/{self.warehouse.id}/")
+
+    def test_employee_list(self):
+        self.assertQueryBudget("employees-list", self.admin_user, "/employees/")
+
+    def test_employee_list_of_manager(self):
+        self.assertQueryBudget("employees-list-manager", self.manager_user, "/employees/")
+
+    def test_userlogs_list(self):
+        self.assertQueryBudget("userlogs-list", self.admin_user, "/userlogs/")
+
+    def test_userlogs_list_of_manager(self):
+        self.assertQueryBudget("userlogs-list-manager", self.manager_user, "/userlogs/")
+
+    def test_product_list(self):
+        self.assertQueryBudget("products-list", self.admin_user, "/products/")
+
+    def test_product_list_of_manager(self):
+        self.assertQueryBudget("products-list-manager", self.manager_user, "/products/")
+
+    def test_category_list(self):
+        self.assertQueryBudget("categories-list", self.admin_user, "/categories/")
+
+    def test_order_list(self):
+        self.assertQueryBudget("orders-list", self.admin_user, "/orders/")
+
+    def test_order_list_of_manager(self):
+        self.assertQueryBudget("orders-list-manager", self.manager_user, "/orders/")
+
+    def test_order_detail(self):
+        self.assertQueryBudget("orders-detail", self.admin_user, f"/orders/{self.order.id}/")
+
+    def test_dashboard(self):
+        self.assertQueryBudget("dashboard-data", self.admin_user, "/dashboard-data/")
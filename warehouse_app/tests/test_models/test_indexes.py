@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from warehouse_app.models import (
+    Category,
+    Employee,
+    Order,
+    OrderItem,
+    OrderPartialPayment,
+    Product,
+    Warehouse,
+)
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+
+# ----------------------------------------------------------------------------------
+#           Testing that the hot list queries are served by the composite indexes
+# ----------------------------------------------------------------------------------
+
+
+class ListQueriesUseIndexesTestCase(TestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("EXPLAIN plans are only checked on PostgreSQL")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+            self.order = Order.objects.create(
+                warehouse=self.warehouse,
+                customer="John Doe",
+                initiator=self.admin_user,
+                total_price=1500,
+            )
+
+        # The tables are tiny, so take sequential scans off the table to see
+        # which index the planner would pick once they grow
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    # On the one-row table the planner would as soon walk product_wh_sku_unique
+    # and sort, and with a single warehouse product_created_idx filters as well:
+    # the ordered warehouse pages are checked on rows spread across warehouses
+
+    def test_product_list_of_warehouse(self):
+        self.seed_products(number_of_warehouses=20)
+        queryset = Product.objects.filter(warehouse__id=self.warehouse.id).order_by(
+            "-created_at"
+        )[:10]
+        self.assertUsesIndex(queryset, "product_wh_created_idx")
+
+    def test_product_list_of_superuser(self):
+        queryset = Product.objects.order_by("-created_at")[:10]
+        self.assertUsesIndex(queryset, "product_created_idx")
+
+    def test_product_cursor_page_of_warehouse(self):
+        self.seed_products(number_of_warehouses=20)
+        queryset = (
+            Product.objects.filter(warehouse__id=self.warehouse.id)
+            .filter(created_at__lte=self.product.created_at)
+            .filter(
+                Q(created_at__lt=self.product.created_at)
+                | Q(created_at=self.product.created_at, id__lt=self.product.id)
+            )
+            .order_by("-created_at", "-id")[:11]
+        )
+        self.assertUsesIndex(queryset, "product_wh_created_idx")
+
+    def seed_products(self, number_of_products=500, number_of_warehouses=1):
+        warehouses = [self.warehouse]
+        with set_current_context(self.admin_user):
+            warehouses += [
+                Warehouse.objects.create(name=f"Site {i}", location="Paris")
+                for i in range(2, number_of_warehouses + 1)
+            ]
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {i}",
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=i,
+                    unit_price=i,
+                    warehouse=warehouses[i % number_of_warehouses],
+                )
+                for i in range(number_of_products)
+            ]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Product._meta.db_table}")
+
+    # The range indexes serve the unordered queries (page counts, dashboard
+    # aggregates); ordered pages keep walking product_wh_created_idx
+
+    def test_product_price_range(self):
+        self.seed_products()
+        queryset = Product.objects.filter(
+            warehouse__id=self.warehouse.id, unit_price__gt=490
+        ).order_by()
+        self.assertUsesIndex(queryset, "product_wh_price_idx")
+
+    def test_product_quantity_range(self):
+        self.seed_products()
+        queryset = Product.objects.filter(
+            warehouse__id=self.warehouse.id, quantity__lt=5
+        ).order_by()
+        self.assertUsesIndex(queryset, "product_wh_quantity_idx")
+
+    def test_order_list_of_warehouse(self):
+        queryset = Order.objects.filter(warehouse__id=self.warehouse.id).order_by(
+            "-created_at"
+        )[:10]
+        self.assertUsesIndex(queryset, "order_wh_created_idx")
+
+    def test_order_list_of_superuser(self):
+        queryset = Order.objects.order_by("-created_at")[:10]
+        self.assertUsesIndex(queryset, "order_created_idx")
+
+    def test_order_status_and_date_filter(self):
+        queryset = Order.objects.filter(
+            warehouse__id=self.warehouse.id,
+            order_status=Order.Status.PENDING,
+            created_at__gte=timezone.now() - timedelta(days=30),
+        )
+        self.assertUsesIndex(queryset, "order_wh_status_created_idx")
+
+    def test_employee_list_of_warehouse(self):
+        queryset = Employee.objects.filter(warehouse__id=self.warehouse.id).order_by(
+            "-created_at"
+        )[:10]
+        self.assertUsesIndex(queryset, "employee_wh_created_idx")
+
+    def test_order_items_prefetch(self):
+        queryset = OrderItem.objects.filter(order_id__in=[self.order.id])
+        self.assertUsesIndex(queryset, "orderitem_order_created_idx")
+
+    def test_partial_payments_prefetch(self):
+        queryset = OrderPartialPayment.objects.filter(order_id__in=[self.order.id])
+        self.assertUsesIndex(queryset, "payment_order_created_idx")
@@ -0,0 +1,73 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from warehouse_app.models import (
+    Category,
+    Order,
+    OrderItem,
+    OrderPartialPayment,
+    Product,
+    Warehouse,
+)
+
+from InventoryManagement.utils.context_manager import set_current_context
+from InventoryManagement.utils.uuids import uuid7
+
+User = get_user_model()
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the time-ordered (UUIDv7) primary keys
+# ----------------------------------------------------------------------------------
+
+
+class UUID7TestCase(TestCase):
+    def test_uuid7_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.int >> 62 & 0b11, 0b10)
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_uuid7_is_strictly_increasing(self):
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_high_insert_models_use_uuid7(self):
+        admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        with set_current_context(admin_user):
+            warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            category = Category.objects.create(name="Category 1")
+            product = Product.objects.create(
+                name="Product A",
+                category=category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=warehouse,
+            )
+            orders = [
+                Order.objects.create(
+                    warehouse=warehouse,
+                    customer=customer,
+                    initiator=admin_user,
+                    total_price=1500,
+                )
+                for customer in ["John Doe", "Mary Jones"]
+            ]
+            item = OrderItem.objects.create(
+                order=orders[0], product=product, buying_price=1500, quantity=1
+            )
+            payment = OrderPartialPayment.objects.create(order=orders[0], amount=500)
+
+        for instance in [product, *orders, item, payment]:
+            self.assertEqual(instance.pk.version, 7)
+        # Later rows sort after the earlier ones
+        self.assertLess(orders[0].pk, orders[1].pk)
@@ -0,0 +1,101 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.cache_backends import cache_stats
+
+User = get_user_model()
+
+cache_endpoint = "http://localhost:8000/monitoring/cache/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the cache hit ratio and health
+# ----------------------------------------------------------------------------------
+
+
+class CacheStatsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        cache_stats.reset()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+    def test_hits_and_misses(self):
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("missing-key")
+        cache.get_many(["key", "missing-key", "other-missing-key"])
+
+        response = self.client.get(cache_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = response.data["default"]
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["hit_ratio"], 0.4)
+        self.assertTrue(stats["healthy"])
+        self.assertEqual(stats["key_prefix"], "inventory")
+
+    def test_stats_can_be_reset(self):
+        cache.get("missing-key")
+
+        response = self.client.delete(cache_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(cache_endpoint)
+        self.assertEqual(response.data["default"]["misses"], 0)
+        self.assertIsNone(response.data["default"]["hit_ratio"])
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {
+                "default": {
+                    "BACKEND": "InventoryManagement.utils.cache_backends.InstrumentedFileBasedCache",
+                    "LOCATION": location,
+                    "KEY_PREFIX": "inventory",
+                    "OPTIONS": {"ALIAS": "default"},
+                }
+            }
+            with override_settings(CACHES=caches):
+                cache.set("key", "value")
+                self.assertEqual(cache.get("key"), "value")
+
+                response = self.client.get(cache_endpoint)
+                self.assertEqual(response.data["default"]["hits"], 1)
+                self.assertTrue(response.data["default"]["healthy"])
+
+    def test_unreachable_server(self):
+        caches = {
+            "default": {
+                "BACKEND": "InventoryManagement.utils.cache_backends.InstrumentedRedisCache",
+                "LOCATION": "redis://127.0.0.1:1/0",
+                "OPTIONS": {"ALIAS": "default"},
+            }
+        }
+        with override_settings(CACHES=caches):
+            stats = self.client.get(cache_endpoint).data["default"]
+
+        self.assertFalse(stats["healthy"])
+        self.assertIsNotNone(stats["error"])
+
+    def test_reserved_to_superusers(self):
+        user = User.objects.create_user(
+            email="myuser@gmail.com", username="myuser", password="987654321@"
+        )
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+
+        response = self.client.get(cache_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
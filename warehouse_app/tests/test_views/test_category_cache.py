@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.cache import VersionedCache
+from warehouse_app.models import Category
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+categories_endpoint = "http://localhost:8000/categories/"
+
+
+def category_queries(context):
+    return [
+        query["sql"] for query in context.captured_queries
+        if "warehouse_app_category" in query["sql"]
+    ]
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the cached category pages
+# ----------------------------------------------------------------------------------
+
+
+class CategoryCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.category = Category.objects.create(name="Category 1")
+
+    def test_pages_are_cached(self):
+        response = self.client.get(categories_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as context:
+            cached_response = self.client.get(categories_endpoint)
+
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.data, response.data)
+        self.assertEqual(category_queries(context), [])
+
+    def test_pages_are_cached_per_query(self):
+        self.client.get(categories_endpoint)
+
+        response = self.client.get(categories_endpoint, {"page_size": 1, "page": 2})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_control(self):
+        response = self.client.get(categories_endpoint)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+        response = self.client.get(categories_endpoint, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+        # Details are not cached
+        response = self.client.get(f"{categories_endpoint}{self.category.id}/")
+        self.assertNotIn("Cache-Control", response)
+
+    def test_not_modified_without_queries(self):
+        etag = self.client.get(categories_endpoint)["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(categories_endpoint, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(category_queries(context), [])
+
+    def test_created_category_bumps_the_version(self):
+        etag = self.client.get(categories_endpoint)["ETag"]
+
+        response = self.client.post(categories_endpoint, {"name": "Category 2"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(categories_endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_updated_category_bumps_the_version(self):
+        self.client.get(categories_endpoint)
+
+        self.category.name = "Category renamed"
+        self.category.save()
+
+        response = self.client.get(categories_endpoint)
+        self.assertEqual(response.data["results"][0]["name"], "Category renamed")
+
+    def test_deleted_category_bumps_the_version(self):
+        self.client.get(categories_endpoint)
+        self.category.delete()
+
+        response = self.client.get(categories_endpoint)
+        self.assertEqual(response.data["count"], 0)
+
+
+class VersionedCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_values_are_shared_between_processes(self):
+        process_cache = VersionedCache("test-cache", "CATEGORY_CACHE_TIMEOUT")
+        other_process_cache = VersionedCache("test-cache", "CATEGORY_CACHE_TIMEOUT")
+
+        self.assertEqual(process_cache.get_or_set("key", lambda: "value"), "value")
+        self.assertEqual(other_process_cache.get_or_set("key", lambda: "other"), "value")
+
+        # Local entries are dropped with the version of another process
+        other_process_cache.bump_version()
+        self.assertEqual(process_cache.get_or_set("key", lambda: "new value"), "new value")
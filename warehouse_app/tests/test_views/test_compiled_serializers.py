@@ -0,0 +1,130 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from warehouse_app.compiled import CompiledSerializer
+from warehouse_app.models import (
+    Category,
+    Employee,
+    Order,
+    OrderItem,
+    OrderPartialPayment,
+    Product,
+    Warehouse,
+)
+from warehouse_app.serializers import OrderModelSerializer, SimpleOrderModelSerializer
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+orders_endpoint = "http://localhost:8000/orders/"
+employees_endpoint = "http://localhost:8000/employees/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the lists rendered by the compiled serializers
+# ----------------------------------------------------------------------------------
+
+
+class CompiledListTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500.5,
+                warehouse=self.warehouse,
+            )
+            # Without a category
+            Product.objects.create(
+                name="Product B",
+                measurement_unit=Product.MeasurementUnit.METER,
+                quantity=0,
+                unit_price=200,
+                warehouse=self.warehouse,
+            )
+            order = Order.objects.create(
+                warehouse=self.warehouse,
+                customer="Customer 1",
+                customer_phone_number="+237658884014",
+                initiator=self.admin_user,
+                total_price=3001,
+            )
+            OrderItem.objects.create(
+                order=order, product=self.product, buying_price=1500.5, quantity=2
+            )
+            OrderPartialPayment.objects.create(order=order, amount=1000)
+            OrderPartialPayment.objects.create(order=order, amount=500.25)
+            # Without initiator, items nor payments
+            Order.objects.create(warehouse=self.warehouse, customer="Customer 2", total_price=0)
+
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email="john.smith@gmail.com", username="johnsmith", password="987654321@"
+            )
+            Employee.objects.create(
+                warehouse=self.warehouse,
+                user=user,
+                first_name="John",
+                last_name="Smith",
+                phone_number="+237659789941",
+            )
+
+    def assertSameAsRegularSerializer(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with override_settings(COMPILED_LIST_SERIALIZERS=False, PRODUCT_FRAGMENT_CACHE_TIMEOUT=0):
+            expected = self.client.get(url, params)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_product_list(self):
+        response = self.assertSameAsRegularSerializer(products_endpoint)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_order_list(self):
+        response = self.assertSameAsRegularSerializer(orders_endpoint)
+        order = response.data["results"][1]
+        self.assertEqual(order["remainder"], 1500.75)
+        self.assertEqual(len(order["order_items"]), 1)
+
+    def test_employee_list(self):
+        response = self.assertSameAsRegularSerializer(employees_endpoint)
+        self.assertEqual(response.data["results"][0]["phone_number"], "+237659789941")
+
+    def test_cursor_pages(self):
+        response = self.assertSameAsRegularSerializer(orders_endpoint, cursor="", page_size=1)
+        response = self.assertSameAsRegularSerializer(response.data["next"])
+        self.assertEqual(response.data["results"][0]["customer"], "Customer 1")
+
+    def test_unsupported_fields(self):
+        # warehouse is a StringRelatedField
+        with self.assertRaises(ImproperlyConfigured):
+            CompiledSerializer(SimpleOrderModelSerializer)
+
+    def test_compiled_serializer(self):
+        compiled = CompiledSerializer(OrderModelSerializer)
+        data = compiled.to_representation(compiled.get_queryset(Order.objects.filter(customer="Customer 2")))
+        self.assertEqual(data[0]["order_items"], [])
+        self.assertIsNone(data[0]["initiator"])
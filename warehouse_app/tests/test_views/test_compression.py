@@ -0,0 +1,126 @@
+import gzip
+
+import brotli
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from warehouse_app.models import Category, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.compression import parse_accept_encoding
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+categories_endpoint = "http://localhost:8000/categories/"
+products_export_endpoint = "http://localhost:8000/products/export/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the br / gzip compression of the responses
+# ----------------------------------------------------------------------------------
+
+
+class CompressionTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            for i in range(10):
+                Product.objects.create(
+                    name=f"Product {i}",
+                    category=self.category,
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=100,
+                    unit_price=1500,
+                    warehouse=self.warehouse,
+                )
+        self.plain = self.client.get(products_endpoint)
+
+    def test_brotli_is_preferred(self):
+        response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertLess(len(response.content), len(self.plain.content))
+        self.assertEqual(brotli.decompress(response.content), self.plain.content)
+
+    def test_gzip(self):
+        response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.plain.content)
+
+        # br refused, or less wanted
+        for accept_encoding in ("br;q=0, *", "br;q=0.5, gzip"):
+            response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_not_compressed(self):
+        for accept_encoding in ("", "identity", "deflate", "gzip;q=0"):
+            response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(response.content, self.plain.content)
+        self.assertIn("Accept-Encoding", self.plain["Vary"])
+
+    def test_small_bodies_are_not_compressed(self):
+        response = self.client.get(categories_endpoint, HTTP_ACCEPT_ENCODING="br")
+        self.assertLess(len(response.content), 1024)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_levels_per_content_type(self):
+        with override_settings(COMPRESSION_LEVELS={"application/json": None}):
+            response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="br")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        with override_settings(COMPRESSION_LEVELS={"application/*": {"br": 0}}):
+            fast = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="br")
+        with override_settings(COMPRESSION_LEVELS={"application/*": {"br": 11}}):
+            small = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="br")
+        self.assertLess(len(small.content), len(fast.content))
+        self.assertEqual(brotli.decompress(fast.content), brotli.decompress(small.content))
+
+    def test_conditional_get_still_matches(self):
+        response = self.client.get(products_endpoint, HTTP_ACCEPT_ENCODING="br")
+        response = self.client.get(
+            products_endpoint, HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_streaming_responses(self):
+        plain = b"".join(self.client.get(products_export_endpoint).streaming_content)
+
+        response = self.client.get(products_export_endpoint, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), plain)
+
+        response = self.client.get(products_export_endpoint, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(brotli.decompress(b"".join(response.streaming_content)), plain)
+
+    def test_already_compressed_content_types(self):
+        response = self.client.get(
+            products_export_endpoint, {"export_format": "xlsx"}, HTTP_ACCEPT_ENCODING="br"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip;q=0.8, BR, *;q=0, bad;q=x"),
+            {"gzip": 0.8, "br": 1.0, "*": 0.0, "bad": 0.0},
+        )
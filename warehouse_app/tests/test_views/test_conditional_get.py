@@ -0,0 +1,190 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+
+from warehouse_app.models import Category, Order, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+warehouse_endpoint = "http://localhost:8000/warehouses/"
+products_endpoint = "http://localhost:8000/products/"
+categories_endpoint = "http://localhost:8000/categories/"
+orders_endpoint = "http://localhost:8000/orders/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the ETag / If-None-Match support of the viewsets
+# ----------------------------------------------------------------------------------
+
+
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+
+    def assertNotModified(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_product_list_not_modified(self):
+        self.assertNotModified(products_endpoint)
+
+    def test_product_list_modified_by_an_update(self):
+        etag = self.assertNotModified(products_endpoint)
+
+        response = self.client.patch(products_endpoint + f"{self.product.id}/", {"quantity": 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertModified(products_endpoint, etag)
+
+    def test_product_list_modified_by_its_category(self):
+        etag = self.assertNotModified(products_endpoint)
+
+        self.category.name = "Category renamed"
+        self.category.save()
+
+        self.assertModified(products_endpoint, etag)
+
+    def test_product_list_etag_depends_on_the_query(self):
+        etag = self.assertNotModified(products_endpoint)
+        self.assertModified(f"{products_endpoint}?page_size=5", etag)
+
+    def test_product_detail(self):
+        url = f"{products_endpoint}{self.product.id}/"
+        etag = self.assertNotModified(url)
+
+        with set_current_context(self.admin_user):
+            self.product.unit_price = 2000
+            self.product.save()
+
+        self.assertModified(url, etag)
+
+    def test_unknown_product_detail(self):
+        response = self.client.get(f"{products_endpoint}not-a-uuid/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_pages_have_no_etag(self):
+        response = self.client.get(f"{products_endpoint}?cursor=")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+
+    def test_category_list(self):
+        etag = self.assertNotModified(categories_endpoint)
+
+        with set_current_context(self.admin_user):
+            Category.objects.create(name="Category 2")
+
+        self.assertModified(categories_endpoint, etag)
+
+    def test_warehouse_list_modified_by_a_new_product(self):
+        etag = self.assertNotModified(warehouse_endpoint)
+
+        with set_current_context(self.admin_user):
+            Product.objects.create(
+                name="Product B",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=10,
+                unit_price=500,
+                warehouse=self.warehouse,
+            )
+
+        self.assertModified(warehouse_endpoint, etag)
+
+    def test_warehouse_detail_only_depends_on_its_rows(self):
+        warehouse_url = f"{warehouse_endpoint}{self.warehouse.id}/"
+        etag = self.assertNotModified(warehouse_url)
+
+        with set_current_context(self.admin_user):
+            other_warehouse = Warehouse.objects.create(name="Site 2", location="Paris")
+            Product.objects.create(
+                name="Product B",
+                measurement_unit=Product.MeasurementUnit.BOX,
+                warehouse=other_warehouse,
+            )
+
+        response = self.client.get(warehouse_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unknown_warehouse_detail(self):
+        response = self.client.get(f"{warehouse_endpoint}{uuid.uuid4()}/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_orders_modified_by_payments_and_stock(self):
+        order = {
+            "customer": "John Doe",
+            "customer_phone_number": "+237658884014",
+            "order_items": [{"product": self.product.id, "quantity": 10}],
+            "initial_deposit": 0,
+            "warehouse_id": self.warehouse.id,
+        }
+        product_etag = self.assertNotModified(products_endpoint)
+
+        response = self.client.post(orders_endpoint, data=order, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # Ordering takes the products out of the stock
+        self.assertModified(products_endpoint, product_etag)
+
+        order = Order.objects.get()
+        order_url = f"{orders_endpoint}{order.id}/"
+        order_etag = self.assertNotModified(order_url)
+
+        response = self.client.post(
+            f"{warehouse_endpoint}{self.warehouse.id}/orders/{order.id}/payments/",
+            {"amount": 1000},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # The payment changes the remainder of the order
+        self.assertModified(order_url, order_etag)
+
+    def test_orders_modified_by_their_initiator(self):
+        with set_current_context(self.admin_user):
+            order = Order.objects.create(
+                warehouse=self.warehouse, customer="John Doe", initiator=self.admin_user, total_price=0
+            )
+        order_url = f"{orders_endpoint}{order.id}/"
+        etag = self.assertNotModified(order_url)
+
+        # Users have no modified_at, their changes bump the version of the user states
+        self.admin_user.first_name = "Jane"
+        self.admin_user.save()
+
+        self.assertModified(order_url, etag)
+        self.assertEqual(self.client.get(order_url).data["initiator"]["first_name"], "Jane")
@@ -0,0 +1,191 @@
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import override_settings
+
+from easyaudit.models import CRUDEvent
+
+from warehouse_app.models import Employee, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.authentication import StatelessJWTAuthentication
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+employees_endpoint = "http://localhost:8000/employees/"
+login_endpoint = "http://localhost:8000/auth/jwt/create/"
+products_endpoint = "http://localhost:8000/products/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the bulk block / unblock / set-manager / set-employee actions
+# ----------------------------------------------------------------------------------
+
+
+class EmployeeBulkActionsTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.other_warehouse = Warehouse.objects.create(name="Site 2", location="Paris")
+
+        self.employees = [self.create_employee(f"employee{i}") for i in range(3)]
+
+    def create_employee(self, name, warehouse=None, role=User.ROLES.EMPLOYEE):
+        warehouse = warehouse or self.warehouse
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email=f"{name}@gmail.com",
+                username=name,
+                password="987654321@",
+                role=role,
+                warehouse_id=warehouse.id,
+            )
+            employee = Employee.objects.create(
+                warehouse=warehouse,
+                user=user,
+                first_name="John",
+                last_name=name,
+                phone_number="+237659789941",
+                is_manager=role == User.ROLES.EMPLOYEE_MANAGER,
+            )
+            user.employee_id = employee.id
+            user.save()
+        return employee
+
+    def post(self, url_path, employees):
+        return self.client.post(
+            f"{employees_endpoint}{url_path}/",
+            {"ids": [str(employee.id) for employee in employees]},
+            format="json",
+        )
+
+    def test_bulk_block_and_unblock(self):
+        response = self.post("bulk-block", self.employees[:2])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            list(User.objects.filter(is_active=False).order_by("username").values_list("username", flat=True)),
+            ["employee0", "employee1"],
+        )
+
+        # Only the blocked ones are unblocked
+        response = self.post("bulk-unblock", self.employees)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            sorted(response.data["ids"]), sorted(employee.id for employee in self.employees[:2])
+        )
+        self.assertFalse(User.objects.filter(is_active=False).exists())
+
+    def test_bulk_set_manager_and_employee(self):
+        response = self.post("bulk-set-manager", self.employees)
+        self.assertEqual(response.data["updated"], 3)
+        for employee in Employee.objects.select_related("user").filter(id__in=response.data["ids"]):
+            self.assertTrue(employee.is_manager)
+            self.assertEqual(employee.user.role, User.ROLES.EMPLOYEE_MANAGER)
+            self.assertGreater(employee.modified_at, self.employees[0].modified_at)
+
+        response = self.post("bulk-set-employee", self.employees[1:])
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(Employee.objects.filter(is_manager=True).get().id, self.employees[0].id)
+        self.assertEqual(User.objects.filter(role=User.ROLES.EMPLOYEE_MANAGER).count(), 1)
+
+    def test_nothing_to_change(self):
+        response = self.post("bulk-set-employee", self.employees)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 0, "ids": []})
+        self.assertFalse(CRUDEvent.objects.filter(event_type=CRUDEvent.UPDATE).exists())
+
+    def test_audit_events(self):
+        self.post("bulk-set-manager", self.employees[:2])
+
+        events = CRUDEvent.objects.filter(event_type=CRUDEvent.UPDATE, user=self.admin_user)
+        employee_events = events.filter(content_type=ContentType.objects.get_for_model(Employee))
+        user_events = events.filter(content_type=ContentType.objects.get_for_model(User))
+        self.assertEqual(
+            sorted(employee_events.values_list("object_id", flat=True)),
+            sorted(str(employee.id) for employee in self.employees[:2]),
+        )
+        self.assertEqual(user_events.count(), 2)
+        self.assertIn("is_manager", employee_events.first().changed_fields)
+        self.assertIn("role", user_events.first().changed_fields)
+
+    def test_queries_do_not_grow_with_the_employees(self):
+        more_employees = [self.create_employee(f"other{i}") for i in range(10)]
+        with self.assertNumQueries(10):
+            self.post("bulk-set-manager", self.employees[:2])
+        with self.assertNumQueries(10):
+            self.post("bulk-set-manager", more_employees)
+
+    # The stateless authentication refuses them through the cleared user state
+    @mock.patch.object(APIView, "authentication_classes", [StatelessJWTAuthentication])
+    def test_blocked_tokens_are_refused(self):
+        cache.clear()
+        client = APIClient(SERVER_NAME="localhost")
+        # Logged in, so that the token carries the claims of the principal
+        response = client.post(login_endpoint, {"email": "employee0@gmail.com", "password": "987654321@"})
+        client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['access']}")
+        self.assertEqual(client.get(products_endpoint).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post("bulk-block", self.employees[:1])
+        # The cached state is only cleared once the block is committed
+        self.assertEqual(client.get(products_endpoint).status_code, status.HTTP_200_OK)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(client.get(products_endpoint).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_employees(self):
+        unknown_id = uuid.uuid4()
+        response = self.client.post(
+            f"{employees_endpoint}bulk-block/",
+            {"ids": [str(self.employees[0].id), str(unknown_id)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(unknown_id), str(response.data["ids"]))
+        # Nothing is changed when any employee is wrong
+        self.assertFalse(User.objects.filter(is_active=False).exists())
+
+    def test_empty_list(self):
+        response = self.post("bulk-block", [])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(EMPLOYEE_BULK_ACTION_MAX_IDS=2)
+    def test_too_many_employees(self):
+        response = self.post("bulk-block", self.employees)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_managers_only_change_their_warehouse(self):
+        manager = self.create_employee("manager", self.other_warehouse, User.ROLES.EMPLOYEE_MANAGER)
+        colleague = self.create_employee("colleague", self.other_warehouse)
+        refresh = RefreshToken.for_user(manager.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+
+        response = self.post("bulk-block", [colleague, self.employees[0]])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post("bulk-block", [colleague])
+        self.assertEqual(response.data["updated"], 1)
+
+    def test_employees_cannot_use_them(self):
+        refresh = RefreshToken.for_user(self.employees[0].user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+        response = self.post("bulk-block", self.employees[1:])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,173 @@
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from easyaudit.models import CRUDEvent
+
+from warehouse_app.models import Employee, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+import_endpoint = "http://localhost:8000/employees/import/"
+
+
+def get_csv_file(lines):
+    return SimpleUploadedFile("employees.csv", "\n".join(lines).encode(), content_type="text/csv")
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the bulk employee imports
+# ----------------------------------------------------------------------------------
+
+
+class EmployeeImportTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.other_warehouse = Warehouse.objects.create(name="Site 2", location="Paris")
+
+    def get_rows(self, count, warehouse=None):
+        return [
+            {
+                "email": f"Employee.{i}@gmail.com",
+                "first_name": "Employee",
+                "last_name": f"Number {i}",
+                "phone_number": "+237658884014",
+                "id_number": f"{i:06d}",
+                "warehouse_id": str((warehouse or self.warehouse).id),
+            }
+            for i in range(count)
+        ]
+
+    def create_user(self, role):
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email=f"{role}@gmail.com",
+                username=role,
+                password="987654321@",
+                role=role,
+                warehouse_id=self.other_warehouse.id,
+            )
+            Employee.objects.create(
+                warehouse=self.other_warehouse,
+                user=user,
+                first_name="John",
+                last_name=role,
+                phone_number="+237659789941",
+                is_manager=role == User.ROLES.EMPLOYEE_MANAGER,
+            )
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+        return user
+
+    def test_json_import(self):
+        rows = self.get_rows(3)
+        rows[0]["is_manager"] = True
+        response = self.client.post(import_endpoint, {"employees": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+
+        employees = Employee.objects.select_related("user").filter(id__in=response.data["ids"])
+        self.assertEqual(len(employees), 3)
+        for employee in employees:
+            self.assertEqual(employee.user.employee_id, employee.id)
+            self.assertEqual(employee.user.warehouse_id, self.warehouse.id)
+            self.assertEqual(employee.user.username, f"{employee.first_name} {employee.last_name}")
+            self.assertTrue(employee.user.check_password(Employee.DEFAULT_PASSWORD))
+
+        manager = employees.get(id_number="000000")
+        self.assertTrue(manager.is_manager)
+        self.assertEqual(manager.user.role, User.ROLES.EMPLOYEE_MANAGER)
+        self.assertEqual(manager.user.email, "employee.0@gmail.com")
+        self.assertEqual(employees.get(id_number="000001").user.role, User.ROLES.EMPLOYEE)
+
+    def test_audit_events(self):
+        response = self.client.post(import_endpoint, {"employees": self.get_rows(3)}, format="json")
+
+        events = CRUDEvent.objects.filter(event_type=CRUDEvent.CREATE, user=self.admin_user)
+        employee_type = ContentType.objects.get_for_model(Employee)
+        user_type = ContentType.objects.get_for_model(User)
+        self.assertEqual(
+            sorted(events.filter(content_type=employee_type).values_list("object_id", flat=True)),
+            sorted(str(pk) for pk in response.data["ids"]),
+        )
+        self.assertEqual(events.filter(content_type=user_type).count(), 3)
+
+    def test_queries_do_not_grow_with_the_rows(self):
+        with self.assertNumQueries(12):
+            self.client.post(import_endpoint, {"employees": self.get_rows(2)}, format="json")
+        rows = self.get_rows(20)[2:]
+        with self.assertNumQueries(12):
+            self.client.post(import_endpoint, {"employees": rows}, format="json")
+
+    def test_csv_import_by_a_manager(self):
+        self.create_user(User.ROLES.EMPLOYEE_MANAGER)
+        csv_file = get_csv_file(
+            [
+                "email,first_name,last_name,phone_number,id_number,is_manager,warehouse_id",
+                f"jane@gmail.com,Jane,Doe,+237658884014,A1,true,{self.warehouse.id}",
+                "paul@gmail.com,Paul,Doe,+237658884015,A2,,",
+            ]
+        )
+        response = self.client.post(import_endpoint, {"file": csv_file}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # Managers add employees to their own warehouse, and no managers
+        employees = Employee.objects.select_related("user").filter(id__in=response.data["ids"])
+        self.assertEqual({employee.warehouse_id for employee in employees}, {self.other_warehouse.id})
+        self.assertEqual({employee.user.role for employee in employees}, {User.ROLES.EMPLOYEE})
+
+    def test_errors_are_reported_per_row(self):
+        User.objects.create_user(email="employee.1@gmail.com", username="taken", password="987654321@")
+        rows = self.get_rows(5)
+        rows[2]["phone_number"] = "not a number"
+        rows[3]["email"] = "employee.4@gmail.com"
+        rows[4]["warehouse_id"] = str(self.admin_user.id)
+
+        response = self.client.post(import_endpoint, {"employees": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        errors = response.data["rows"]
+        self.assertEqual(sorted(errors), [2, 3, 4, 5])
+        self.assertIn("email", errors[2])
+        self.assertIn("phone_number", errors[3])
+        self.assertIn("email", errors[4])
+        self.assertEqual(set(errors[5]), {"email", "warehouse_id"})
+        # Nothing is created when any row is wrong
+        self.assertEqual(Employee.objects.count(), 0)
+
+    def test_same_full_name(self):
+        rows = self.get_rows(2)
+        rows[1]["last_name"] = rows[0]["last_name"]
+        response = self.client.post(import_endpoint, {"employees": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(sorted(response.data["rows"]), [1, 2])
+
+    @override_settings(EMPLOYEE_IMPORT_MAX_ROWS=2)
+    def test_too_many_rows(self):
+        response = self.client.post(import_endpoint, {"employees": self.get_rows(3)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nothing_to_import(self):
+        response = self.client.post(import_endpoint, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_employees_cannot_import(self):
+        self.create_user(User.ROLES.EMPLOYEE)
+        response = self.client.post(import_endpoint, {"employees": self.get_rows(1)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
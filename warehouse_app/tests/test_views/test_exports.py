@@ -0,0 +1,199 @@
+import csv
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import orjson
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from warehouse_app.models import Category, Employee, Order, OrderPartialPayment, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+from InventoryManagement.utils.exports import XLSXExportWriter
+
+User = get_user_model()
+
+products_export_endpoint = "http://localhost:8000/products/export/"
+orders_export_endpoint = "http://localhost:8000/orders/export/"
+
+SPREADSHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def read_sheets(content):
+    """Helper method returning the rows (lists of cell texts) of every sheet of a workbook."""
+    sheets = []
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        for number in range(1, len(list(workbook.iter(f"{SPREADSHEET}sheet"))) + 1):
+            sheet = ElementTree.fromstring(archive.read(f"xl/worksheets/sheet{number}.xml"))
+            sheets.append(
+                [
+                    ["".join(cell.itertext()) for cell in row]
+                    for row in sheet.iter(f"{SPREADSHEET}row")
+                ]
+            )
+    return sheets
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the streamed product and order exports
+# ----------------------------------------------------------------------------------
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.other_warehouse = Warehouse.objects.create(name="Site 2", location="Paris")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name='Product "A", <boxed>',
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500.5,
+                warehouse=self.warehouse,
+            )
+            Product.objects.create(
+                name="Product B",
+                measurement_unit=Product.MeasurementUnit.METER,
+                quantity=0,
+                unit_price=200,
+                warehouse=self.other_warehouse,
+            )
+            self.order = Order.objects.create(
+                warehouse=self.warehouse,
+                customer="Customer 1",
+                customer_phone_number="+237658884014",
+                initiator=self.admin_user,
+                total_price=3001,
+            )
+            OrderPartialPayment.objects.create(order=self.order, amount=1000)
+            Order.objects.create(warehouse=self.other_warehouse, customer="Customer 2", total_price=0)
+
+    def test_csv_export(self):
+        response = self.client.get(products_export_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertRegex(response["Content-Disposition"], r'^attachment; filename="products-\d{8}-\d{6}\.csv"$')
+
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:4], ["id", "name", "category", "warehouse"])
+        self.assertEqual(len(rows), 3)
+        # Newest first, as the list
+        self.assertEqual(rows[2][:4], [str(self.product.id), 'Product "A", <boxed>', "Category 1", "Site 1"])
+        self.assertEqual(rows[2][6], "1500.50")
+        # Local time (Africa/Douala)
+        self.assertTrue(rows[2][9].endswith("+01:00"))
+
+    def test_csv_formulas_are_escaped(self):
+        Product.objects.filter(id=self.product.id).update(name="=HYPERLINK(\"http://example.com\")", sku="@SUM(A1:A2)")
+        response = self.client.get(products_export_endpoint)
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[2][1], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(rows[2][-1], "'@SUM(A1:A2)")
+        # Numbers are left as they are
+        self.assertEqual(rows[2][6], "1500.50")
+
+        response = self.client.get(orders_export_endpoint)
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[2][3], "'+237658884014")
+
+    def test_ndjson_export(self):
+        response = self.client.get(orders_export_endpoint, {"export_format": "ndjson"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).splitlines()
+        orders = [orjson.loads(line) for line in lines]
+        self.assertEqual(len(orders), 2)
+        order = orders[1]
+        self.assertEqual(order["customer"], "Customer 1")
+        self.assertEqual(order["customer_phone_number"], "+237658884014")
+        self.assertEqual(order["initiator"], "myadmin@gmail.com")
+        self.assertEqual(order["total_price"], "3001.00")
+        self.assertEqual(order["remainder"], "2001.00")
+        self.assertIsNone(orders[0]["initiator"])
+
+    def test_xlsx_export(self):
+        response = self.client.get(products_export_endpoint, {"export_format": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+        [rows] = read_sheets(b"".join(response.streaming_content))
+        self.assertEqual(rows[0][1], "name")
+        self.assertEqual(rows[2][1], 'Product "A", <boxed>')
+        self.assertEqual(rows[2][5], "100")
+        self.assertEqual(rows[2][7], "1")
+
+    def test_xlsx_rows_continue_on_new_sheets(self):
+        writer = XLSXExportWriter(["number"])
+        writer.max_rows_per_sheet = 2
+        content = b"".join(writer.stream(([number] for number in range(5)), chunk_size=2))
+
+        self.assertEqual(
+            read_sheets(content),
+            [[["number"], ["0"], ["1"]], [["number"], ["2"], ["3"]], [["number"], ["4"]]],
+        )
+
+    def test_filters_are_honoured(self):
+        response = self.client.get(
+            products_export_endpoint, {"warehouse_id": self.warehouse.id, "search": "Product"}
+        )
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row[1] for row in rows[1:]], ['Product "A", <boxed>'])
+
+    def test_unknown_format(self):
+        response = self.client.get(products_export_endpoint, {"export_format": "pdf"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("export_format", response.data)
+
+    def test_accept_header_is_ignored(self):
+        response = self.client.get(orders_export_endpoint, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_employees_only_export_their_warehouse(self):
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email="john.smith@gmail.com",
+                username="johnsmith",
+                password="987654321@",
+                warehouse_id=self.other_warehouse.id,
+            )
+            Employee.objects.create(
+                warehouse=self.other_warehouse,
+                user=user,
+                first_name="John",
+                last_name="Smith",
+                phone_number="+237659789941",
+            )
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+
+        response = self.client.get(orders_export_endpoint, {"export_format": "ndjson"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        orders = [orjson.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([order["customer"] for order in orders], ["Customer 2"])
+
+    def test_anonymous_users_cannot_export(self):
+        self.client.credentials()
+        response = self.client.get(orders_export_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,226 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from warehouse_app.models import Employee, ImageStatus, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+employees_endpoint = "http://localhost:8000/employees/"
+
+
+def get_image_file(name="photo.jpg", size=(2000, 1000), mode="RGB", image_format="JPEG"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, "red").save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{image_format.lower()}")
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the image staging and the process_images command
+# ----------------------------------------------------------------------------------
+
+
+class ImageProcessingTestCase(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        staging_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, staging_root, ignore_errors=True)
+        storages = override_settings(
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                "media": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": media_root, "base_url": "/media/"},
+                },
+                "image_staging": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": staging_root},
+                },
+            }
+        )
+        storages.enable()
+        self.addCleanup(storages.disable)
+
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+
+    def create_product(self, image):
+        response = self.client.post(
+            products_endpoint,
+            {
+                "name": "Gloves",
+                "measurement_unit": Product.MeasurementUnit.BOX,
+                "quantity": 10,
+                "unit_price": "2.50",
+                "warehouse_id": str(self.warehouse.id),
+                "image": image,
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Product.objects.get(id=response.data["id"])
+
+    def test_upload_is_staged(self):
+        product = self.create_product(get_image_file())
+        self.assertEqual(product.image_status, ImageStatus.PENDING)
+        self.assertFalse(product.image)
+        self.assertTrue(product.image_staging.storage.exists(product.image_staging.name))
+
+    def test_staged_image_is_processed(self):
+        product = self.create_product(get_image_file())
+        staged_name = product.image_staging.name
+        staging_storage = product.image_staging.storage
+
+        call_command("process_images", "--once", stdout=io.StringIO())
+        processed = Product.objects.get(id=product.id)
+
+        self.assertEqual(processed.image_status, ImageStatus.READY)
+        self.assertFalse(processed.image_staging)
+        self.assertFalse(staging_storage.exists(staged_name))
+        self.assertGreater(processed.modified_at, product.modified_at)
+
+        self.assertTrue(processed.image.name.endswith(".jpg"))
+        with processed.image.open("rb") as file, Image.open(file) as image:
+            self.assertEqual(image.size, (1600, 800))
+        with processed.image_webp.open("rb") as file, Image.open(file) as image:
+            self.assertEqual(image.format, "WEBP")
+        with processed.image_thumbnail.open("rb") as file, Image.open(file) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (320, 160)))
+
+        response = self.client.get(f"{products_endpoint}{product.id}/")
+        self.assertEqual(response.data["image_status"], ImageStatus.READY)
+        self.assertIn("-thumbnail", response.data["image_thumbnail"])
+
+    def test_transparent_images_stay_png(self):
+        product = self.create_product(get_image_file("logo.png", (400, 400), "RGBA", "PNG"))
+        call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+        self.assertTrue(product.image.name.endswith(".png"))
+
+    def test_replaced_image_is_deleted(self):
+        product = self.create_product(get_image_file())
+        call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+        previous = [
+            (product.image.storage, product.image.name),
+            (product.image_thumbnail.storage, product.image_thumbnail.name),
+        ]
+
+        response = self.client.patch(
+            f"{products_endpoint}{product.id}/", {"image": get_image_file("other.jpg")}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+
+        self.assertEqual(product.image_status, ImageStatus.READY)
+        self.assertIn("other", product.image.name)
+        for storage, name in previous:
+            self.assertFalse(storage.exists(name))
+
+    def test_unreadable_image_fails(self):
+        product = self.create_product(get_image_file())
+        # Replaced by something that is not an image after the upload validation
+        product.image_staging.save("broken.jpg", ContentFile(b"not an image"), save=True)
+
+        with self.assertLogs("warehouse_app.images", "WARNING"):
+            call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+        self.assertEqual(product.image_status, ImageStatus.FAILED)
+        self.assertFalse(product.image)
+        # It is not picked up again by the next runs
+        self.assertFalse(Product.objects.filter(image_status=ImageStatus.PENDING).exists())
+
+    def test_upload_error_fails_the_image(self):
+        product = self.create_product(get_image_file())
+        staged_name = product.image_staging.name
+        statuses = []
+
+        def failing_save(storage, name, content):
+            # The row is claimed and committed before the upload
+            statuses.append(Product.objects.get(id=product.id).image_status)
+            raise OSError("Storage unavailable")
+
+        with mock.patch.object(FileSystemStorage, "_save", failing_save):
+            with self.assertLogs("warehouse_app.images", "ERROR"):
+                call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+
+        self.assertEqual(statuses, [ImageStatus.PROCESSING])
+        self.assertEqual(product.image_status, ImageStatus.FAILED)
+        self.assertFalse(product.image)
+        # Kept, so that the image can be sent back to PENDING
+        self.assertTrue(product.image_staging.storage.exists(staged_name))
+
+    def test_image_replaced_while_uploading(self):
+        product = self.create_product(get_image_file())
+        first_staged = product.image_staging
+
+        def replace_upload(storage, name, content):
+            if not replaced:
+                replaced.append(True)
+                response = self.client.patch(
+                    f"{products_endpoint}{product.id}/", {"image": get_image_file("other.jpg")}, format="multipart"
+                )
+                statuses.append(response.status_code)
+            return original_save(storage, name, content)
+
+        replaced, statuses = [], []
+        original_save = FileSystemStorage._save
+        with mock.patch.object(FileSystemStorage, "_save", replace_upload):
+            call_command("process_images", "--once", stdout=io.StringIO())
+        product.refresh_from_db()
+
+        # The upload did not wait on the row, and the newer image won
+        self.assertEqual(statuses, [status.HTTP_200_OK])
+        self.assertEqual(product.image_status, ImageStatus.READY)
+        self.assertIn("other", product.image.name)
+        self.assertFalse(first_staged.storage.exists(first_staged.name))
+
+    def test_employee_image_is_staged(self):
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email="john@gmail.com", username="john", password="987654321@", warehouse_id=self.warehouse.id
+            )
+            employee = Employee.objects.create(
+                warehouse=self.warehouse, user=user, first_name="John", last_name="Doe", phone_number="+237659789941"
+            )
+
+        response = self.client.patch(
+            f"{employees_endpoint}{employee.id}/", {"image": get_image_file()}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        employee.refresh_from_db()
+        self.assertEqual(employee.image_status, ImageStatus.PENDING)
+
+        call_command("process_images", "--once", stdout=io.StringIO())
+        employee.refresh_from_db()
+        self.assertEqual(employee.image_status, ImageStatus.READY)
+        self.assertTrue(employee.image_thumbnail)
@@ -0,0 +1,212 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from warehouse_app.models import Category, Order, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+orders_endpoint = "http://localhost:8000/orders/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the keyset cursor pagination of products and orders
+# ----------------------------------------------------------------------------------
+
+
+class KeysetCursorPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+
+        # bulk_create skips the audit signals
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {i}",
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=i,
+                    unit_price=1000 + i,
+                    category=self.category,
+                    warehouse=self.warehouse,
+                )
+                for i in range(25)
+            ]
+        )
+        # Pairs of products share their created_at so the pages have to break ties on id
+        now = timezone.now()
+        for i, product in enumerate(Product.objects.order_by("name")):
+            Product.objects.filter(pk=product.pk).update(created_at=now - timedelta(minutes=i // 2))
+
+        self.expected_ids = [
+            str(pk) for pk in Product.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        ]
+
+    def walk(self, url, direction):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page_ids = [product["id"] for product in response.data["results"]]
+            ids = ids + page_ids if direction == "next" else page_ids + ids
+            url = response.data[direction]
+        return ids, response
+
+    def test_cursor_pages_cover_every_product_once(self):
+        ids, last_response = self.walk(f"{products_endpoint}?cursor=&page_size=4", "next")
+        self.assertEqual(ids, self.expected_ids)
+        self.assertNotIn("count", last_response.data)
+
+    def test_previous_links_walk_back_to_the_first_page(self):
+        response = self.client.get(f"{products_endpoint}?cursor=&page_size=4")
+        for _ in range(3):
+            response = self.client.get(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+        ids, first_response = self.walk(response.data["previous"], "previous")
+        self.assertEqual(ids, self.expected_ids[:12])
+        self.assertIsNone(first_response.data["previous"])
+
+    def test_cursor_page_does_not_count_nor_offset(self):
+        response = self.client.get(f"{products_endpoint}?cursor=&page_size=4")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{products_endpoint}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_id(self):
+        data = {"c": timezone.now().isoformat(), "i": "x"}
+        cursor = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        response = self.client.get(f"{products_endpoint}?cursor={cursor}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_kept_by_default(self):
+        response = self.client.get(f"{products_endpoint}?page=2&page_size=10")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_orders_cursor_pages(self):
+        with set_current_context(self.admin_user):
+            for customer in ["John Doe", "Mary Jones", "Jane Smith"]:
+                Order.objects.create(
+                    warehouse=self.warehouse,
+                    customer=customer,
+                    initiator=self.admin_user,
+                    total_price=1500,
+                )
+        expected_ids = [
+            str(pk) for pk in Order.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        ]
+        ids, _ = self.walk(f"{orders_endpoint}?cursor=&page_size=2", "next")
+        self.assertEqual(ids, expected_ids)
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the estimated and cached counts of the page-number pagination
+# ----------------------------------------------------------------------------------
+
+
+class PaginationCountTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+
+        self.create_products(25)
+
+    def create_products(self, number_of_products):
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {i}",
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=i,
+                    unit_price=1000 + i,
+                    category=self.category,
+                    warehouse=self.warehouse,
+                )
+                for i in range(number_of_products)
+            ]
+        )
+
+    def test_exact_count_by_default(self):
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.data["count"], 25)
+        self.assertFalse(response.data["count_is_approximate"])
+
+    @override_settings(PAGINATION_ESTIMATE_COUNT_THRESHOLD=1)
+    def test_estimated_count_above_threshold(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Count estimates only come from PostgreSQL")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE warehouse_app_product")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{products_endpoint}?page=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["count_is_approximate"])
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 5)
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+
+    @override_settings(PAGINATION_ESTIMATE_COUNT_THRESHOLD=1000)
+    def test_exact_count_below_threshold(self):
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.data["count"], 25)
+        self.assertFalse(response.data["count_is_approximate"])
+
+    @override_settings(PAGINATION_COUNT_CACHE_TIMEOUT=60)
+    def test_exact_count_is_cached_per_filter(self):
+        response = self.client.get(f"{products_endpoint}?quantity__gt=4")
+        self.assertEqual(response.data["count"], 20)
+
+        self.create_products(10)
+
+        response = self.client.get(f"{products_endpoint}?quantity__gt=4")
+        self.assertEqual(response.data["count"], 20)
+        self.assertFalse(response.data["count_is_approximate"])
+
+        # Another filter is another count
+        response = self.client.get(f"{products_endpoint}?quantity__gt=5")
+        self.assertEqual(response.data["count"], 23)
+
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from warehouse_app.cache import product_fragment_cache
+from warehouse_app.models import Category, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the cached product representations of the product list
+# ----------------------------------------------------------------------------------
+
+
+class ProductFragmentCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+
+    def get_fragment_key(self):
+        product = Product.objects.select_related("warehouse", "category").get(id=self.product.id)
+        return product_fragment_cache.get_key(product)
+
+    def test_list_is_assembled_from_the_cache(self):
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        key = self.get_fragment_key()
+        self.assertEqual(cache.get(key), response.data["results"][0])
+
+        cache.set(key, {"id": "cached"})
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.data["results"], [{"id": "cached"}])
+
+    def test_update_invalidates_the_fragment(self):
+        self.client.get(products_endpoint)
+        key = self.get_fragment_key()
+
+        response = self.client.patch(f"{products_endpoint}{self.product.id}/", {"quantity": 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(key))
+
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.data["results"][0]["quantity"], 50)
+
+    def test_nested_rows_change_the_key(self):
+        self.client.get(products_endpoint)
+
+        self.category.name = "Category renamed"
+        self.category.save()
+
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.data["results"][0]["category"]["name"], "Category renamed")
+
+    @override_settings(PRODUCT_FRAGMENT_CACHE_TIMEOUT=0)
+    def test_cache_can_be_turned_off(self):
+        response = self.client.get(products_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(self.get_fragment_key()))
@@ -0,0 +1,240 @@
+from decimal import Decimal
+
+import orjson
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from easyaudit.models import CRUDEvent
+
+from warehouse_app.cache import product_fragment_cache
+from warehouse_app.models import Category, Employee, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+import_endpoint = "http://localhost:8000/products/import/"
+
+
+def get_csv_file(lines, name="catalog.csv"):
+    return SimpleUploadedFile(name, "\n".join(lines).encode(), content_type="text/csv")
+
+
+def get_ndjson_file(rows, name="catalog.ndjson"):
+    content = b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    return SimpleUploadedFile(name, content, content_type="application/x-ndjson")
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the product imports
+# ----------------------------------------------------------------------------------
+
+
+class ProductImportTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.other_warehouse = Warehouse.objects.create(name="Site 2", location="Paris")
+            self.category = Category.objects.create(name="Gloves")
+
+    def get_rows(self, count, warehouse=None):
+        return [
+            {
+                "sku": f"SKU-{i:05d}",
+                "name": f"Product {i}",
+                "measurement_unit": Product.MeasurementUnit.BOX,
+                "quantity": i,
+                "unit_price": "2.50",
+                "warehouse_id": str((warehouse or self.warehouse).id),
+            }
+            for i in range(count)
+        ]
+
+    def import_file(self, file, **data):
+        return self.client.post(import_endpoint, {"file": file, **data}, format="multipart")
+
+    def create_user(self, role):
+        with set_current_context(self.admin_user, skip_signal=True):
+            user = User.objects.create_user(
+                email=f"{role}@gmail.com",
+                username=role,
+                password="987654321@",
+                role=role,
+                warehouse_id=self.other_warehouse.id,
+            )
+            Employee.objects.create(
+                warehouse=self.other_warehouse,
+                user=user,
+                first_name="John",
+                last_name=role,
+                phone_number="+237659789941",
+                is_manager=role == User.ROLES.EMPLOYEE_MANAGER,
+            )
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+        return user
+
+    def test_csv_import(self):
+        csv_file = get_csv_file(
+            [
+                "sku,name,category,measurement_unit,quantity,unit_price,is_available,warehouse_id",
+                f"A1,Nitrile gloves,Gloves,box,12,4.75,true,{self.warehouse.id}",
+                f'A2,"Masks, surgical",,box,50,0.30,false,{self.warehouse.id}',
+            ]
+        )
+        response = self.import_file(csv_file)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"rows": 2, "created": 2, "updated": 0, "unchanged": 0, "failed": 0, "errors": {}},
+        )
+
+        gloves = Product.objects.get(warehouse=self.warehouse, sku="A1")
+        self.assertEqual(gloves.category, self.category)
+        self.assertEqual((gloves.quantity, gloves.unit_price), (12, Decimal("4.75")))
+        masks = Product.objects.get(warehouse=self.warehouse, sku="A2")
+        self.assertEqual(masks.name, "Masks, surgical")
+        self.assertIsNone(masks.category)
+        self.assertFalse(masks.is_available)
+
+    def test_ndjson_upsert(self):
+        self.import_file(get_ndjson_file(self.get_rows(3)))
+        product = Product.objects.get(sku="SKU-00001")
+
+        # Only the columns of the row change, by SKU within the warehouse
+        rows = [
+            {"sku": "SKU-00001", "quantity": 99, "warehouse_id": str(self.warehouse.id)},
+            {"sku": "SKU-00002", "quantity": 2, "warehouse_id": str(self.warehouse.id)},
+            *self.get_rows(1, self.other_warehouse),
+        ]
+        response = self.import_file(get_ndjson_file(rows))
+        self.assertEqual((response.data["created"], response.data["updated"], response.data["unchanged"]), (1, 1, 1))
+
+        updated = Product.objects.get(id=product.id)
+        self.assertEqual((updated.quantity, updated.name), (99, "Product 1"))
+        self.assertEqual(updated.created_at, product.created_at)
+        self.assertGreater(updated.modified_at, product.modified_at)
+        self.assertEqual(Product.objects.count(), 4)
+
+    def test_audit_events(self):
+        self.import_file(get_ndjson_file(self.get_rows(2)))
+        rows = [{"sku": "SKU-00000", "name": "Renamed", "warehouse_id": str(self.warehouse.id)}]
+        self.import_file(get_ndjson_file(rows))
+
+        events = CRUDEvent.objects.filter(
+            user=self.admin_user, content_type=ContentType.objects.get_for_model(Product)
+        )
+        self.assertEqual(events.filter(event_type=CRUDEvent.CREATE).count(), 2)
+        update = events.get(event_type=CRUDEvent.UPDATE)
+        self.assertEqual(update.object_id, str(Product.objects.get(sku="SKU-00000").id))
+        self.assertEqual(set(orjson.loads(update.changed_fields)), {"name", "modified_at"})
+
+    @override_settings(PRODUCT_IMPORT_CHUNK_SIZE=5)
+    def test_queries_per_chunk(self):
+        # Warehouses and products read, upsert and audit events in a savepoint
+        with self.assertNumQueries(6 + 2):
+            self.import_file(get_ndjson_file(self.get_rows(5)))
+        with self.assertNumQueries(2 * 6 + 2):
+            response = self.import_file(get_ndjson_file(self.get_rows(15)[5:]))
+        self.assertEqual(response.data["created"], 10)
+
+    def test_errors_are_reported_per_row(self):
+        rows = self.get_rows(6)
+        rows[1]["measurement_unit"] = "bucket"
+        rows[2]["category"] = "Unknown"
+        rows[3]["warehouse_id"] = str(self.admin_user.id)
+        rows[4]["sku"] = rows[0]["sku"]
+        del rows[5]["name"]
+        content = b"".join(orjson.dumps(row) + b"\n" for row in rows) + b"{not json\n"
+        response = self.import_file(SimpleUploadedFile("catalog.jsonl", content))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual((response.data["rows"], response.data["created"], response.data["failed"]), (7, 1, 6))
+        errors = response.data["errors"]
+        self.assertIn("measurement_unit", errors[2])
+        self.assertIn("category", errors[3])
+        self.assertIn("warehouse_id", errors[4])
+        self.assertIn("sku", errors[5])
+        self.assertIn("name", errors[6])
+        self.assertIn("non_field_errors", errors[7])
+        # The right rows are imported anyway
+        self.assertEqual(list(Product.objects.values_list("sku", flat=True)), ["SKU-00000"])
+
+    @override_settings(PRODUCT_IMPORT_MAX_ERRORS=2)
+    def test_listed_errors_are_capped(self):
+        rows = [{"sku": f"X{i}"} for i in range(5)]
+        response = self.import_file(get_ndjson_file(rows))
+        self.assertEqual(response.data["failed"], 5)
+        self.assertEqual(len(response.data["errors"]), 2)
+
+    def test_cached_representation_is_invalidated(self):
+        self.import_file(get_ndjson_file(self.get_rows(1)))
+        self.client.get(products_endpoint)
+        product = Product.objects.select_related("warehouse", "category").get()
+        old_key = product_fragment_cache.get_key(product)
+
+        rows = [{"sku": "SKU-00000", "quantity": 7, "warehouse_id": str(self.warehouse.id)}]
+        self.import_file(get_ndjson_file(rows))
+        self.assertIsNone(cache.get(old_key))
+        self.assertEqual(self.client.get(products_endpoint).data["results"][0]["quantity"], 7)
+
+    def test_manager_imports_to_their_warehouse(self):
+        self.create_user(User.ROLES.EMPLOYEE_MANAGER)
+        # Their warehouse, whatever the file says
+        response = self.import_file(get_ndjson_file(self.get_rows(2)))
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(set(Product.objects.values_list("warehouse_id", flat=True)), {self.other_warehouse.id})
+
+    def test_unknown_format(self):
+        response = self.import_file(SimpleUploadedFile("catalog.xlsx", b"..."))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("import_format", response.data)
+
+        # Given explicitly
+        response = self.import_file(get_ndjson_file(self.get_rows(1), name="catalog.txt"), import_format="ndjson")
+        self.assertEqual(response.data["created"], 1)
+
+    def test_sku_is_unique_within_the_warehouse(self):
+        self.import_file(get_ndjson_file(self.get_rows(2)))
+        product = Product.objects.get(sku="SKU-00000")
+        response = self.client.patch(f"{products_endpoint}{product.id}/", {"sku": "SKU-00001"}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("sku", response.data)
+
+    def test_blank_sku_is_stored_as_null(self):
+        self.import_file(get_ndjson_file(self.get_rows(1)))
+        product = Product.objects.get(sku="SKU-00000")
+        data = {
+            "name": "Product B",
+            "sku": "",
+            "measurement_unit": Product.MeasurementUnit.BOX,
+            "warehouse_id": str(self.warehouse.id),
+        }
+        for _ in range(2):
+            response = self.client.post(products_endpoint, data, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.patch(f"{products_endpoint}{product.id}/", {"sku": ""}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Product.objects.filter(warehouse=self.warehouse, sku__isnull=True).count(), 3)
+
+    def test_employees_cannot_import(self):
+        self.create_user(User.ROLES.EMPLOYEE)
+        response = self.import_file(get_ndjson_file(self.get_rows(1)))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.models import Category, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+from InventoryManagement.utils.query_metrics import registry
+
+User = get_user_model()
+
+products_endpoint = "http://localhost:8000/products/"
+metrics_endpoint = "http://localhost:8000/monitoring/metrics/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the per-endpoint query count and timings
+# ----------------------------------------------------------------------------------
+
+
+class QueryMetricsTestCase(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+
+    def test_response_headers(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(products_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The audit request event is saved on request_started, before any middleware
+        view_queries = [
+            query for query in context.captured_queries
+            if "easyaudit_requestevent" not in query["sql"]
+        ]
+        self.assertEqual(int(response["X-DB-Query-Count"]), len(view_queries))
+        self.assertGreater(float(response["X-Total-Time-Ms"]), 0)
+        self.assertLessEqual(
+            float(response["X-DB-Time-Ms"]), float(response["X-Total-Time-Ms"])
+        )
+
+    def test_metrics_are_aggregated_per_view_and_action(self):
+        self.client.get(products_endpoint)
+        self.client.get(products_endpoint)
+        response = self.client.get(f"{products_endpoint}{Product.objects.get().id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(metrics_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        product_list = response.data["ProductModelViewset.list"]
+        self.assertEqual(product_list["requests"], 2)
+        self.assertEqual(sum(product_list["query_count"]["buckets"].values()), 2)
+        self.assertEqual(response.data["ProductModelViewset.retrieve"]["requests"], 1)
+
+    def test_metrics_can_be_reset(self):
+        self.client.get(products_endpoint)
+
+        response = self.client.delete(metrics_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(metrics_endpoint)
+        self.assertNotIn("ProductModelViewset.list", response.data)
+
+    def test_metrics_are_reserved_to_superusers(self):
+        user = User.objects.create_user(
+            email="myuser@gmail.com", username="myuser", password="987654321@"
+        )
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {refresh.access_token}")
+
+        response = self.client.get(metrics_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
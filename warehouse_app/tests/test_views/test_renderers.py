@@ -0,0 +1,186 @@
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy
+
+from warehouse_app.models import Category, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+import msgpack
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+from InventoryManagement.utils.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+
+User = get_user_model()
+
+orders_endpoint = "http://localhost:8000/orders/"
+products_endpoint = "http://localhost:8000/products/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the orjson renderer and parser against DRF's json ones
+# ----------------------------------------------------------------------------------
+
+
+class ORJSONRendererTestCase(APITestCase):
+    def test_same_output_as_the_stdlib_renderer(self):
+        data = {
+            "id": uuid.uuid4(),
+            "price": Decimal("1500.50"),
+            "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            "local_time": datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=1))),
+            "duration": timedelta(minutes=5),
+            "label": gettext_lazy("Category"),
+            "months": {1: 10, 2: 20},
+            "items": [{"name": "Produit é", "quantity": 3, "available": True, "note": None}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        body = b'{"customer": "John Doe", "order_items": [{"quantity": 2}], "deposit": 25.5}'
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body))
+        )
+
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"customer": '))
+
+
+class ORJSONEndpointTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+
+    def test_order_page(self):
+        order = {
+            "customer": "John Doe",
+            "customer_phone_number": "+237658884014",
+            "order_items": [{"product": str(self.product.id), "quantity": 2}],
+            "initial_deposit": 2500.0,
+            "warehouse_id": str(self.warehouse.id),
+        }
+        response = self.client.post(orders_endpoint, data=order, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(orders_endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_malformed_body(self):
+        response = self.client.post(
+            orders_endpoint, data='{"customer": ', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the MessagePack renderer and parser
+# ----------------------------------------------------------------------------------
+
+
+class MessagePackTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+
+    def test_extension_types(self):
+        data = {
+            "id": uuid.uuid4(),
+            "remainder": Decimal("1500.50"),
+            "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            "label": gettext_lazy("Category"),
+        }
+        rendered = MessagePackRenderer().render(data)
+        parsed = MessagePackParser().parse(io.BytesIO(rendered))
+
+        self.assertEqual(parsed, {**data, "label": "Category"})
+        self.assertIsInstance(parsed["remainder"], Decimal)
+        self.assertIsInstance(parsed["id"], uuid.UUID)
+
+    def test_malformed_body(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\x93\x01"))
+
+    def test_product_list(self):
+        json_response = self.client.get(products_endpoint)
+        response = self.client.get(products_endpoint, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertNotEqual(response["ETag"], json_response["ETag"])
+        self.assertLess(len(response.content), len(json_response.content))
+
+        data = msgpack.unpackb(response.content, ext_hook=lambda code, data: data)
+        self.assertEqual(data, json.loads(json_response.content))
+
+    def test_msgpack_body(self):
+        order = {
+            "customer": "John Doe",
+            "customer_phone_number": "+237658884014",
+            "order_items": [{"product": self.product.id, "quantity": 2}],
+            "initial_deposit": Decimal("2500.00"),
+            "warehouse_id": self.warehouse.id,
+        }
+        response = self.client.post(
+            orders_endpoint,
+            data=MessagePackRenderer().render(order),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.content)
+
+        data = MessagePackParser().parse(io.BytesIO(response.content))
+        self.assertEqual(data["customer"], "John Doe")
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from InventoryManagement.utils.db_router import (
+    PrimaryReplicaRouter,
+    ReadReplicaMiddleware,
+    check_replica_pin_cache,
+)
+from warehouse_app.models import Product
+
+
+# ----------------------------------------------------------------------------------
+#           Testing which database the router picks during a request
+# ----------------------------------------------------------------------------------
+
+
+@mock.patch(
+    "InventoryManagement.utils.db_router.replica_is_configured", return_value=True
+)
+class ReplicaRoutingTestCase(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def run_request(self, method, model=Product, status_code=200, atomic=False):
+        """Run a request through the middleware and return the alias used for reads."""
+        chosen = {}
+
+        def view(request):
+            if atomic:
+                with transaction.atomic():
+                    chosen["db"] = self.router.db_for_read(model)
+            else:
+                chosen["db"] = self.router.db_for_read(model)
+            return HttpResponse(status=status_code)
+
+        request = getattr(self.factory, method)("/products/", HTTP_AUTHORIZATION="Token abc")
+        ReadReplicaMiddleware(view)(request)
+        return chosen["db"]
+
+    def test_safe_requests_read_from_replica(self, _):
+        self.assertEqual(self.run_request("get"), "replica")
+
+    def test_unsafe_requests_read_from_primary(self, _):
+        self.assertEqual(self.run_request("post"), "default")
+
+    def test_reads_in_atomic_blocks_stay_on_primary(self, _):
+        self.assertEqual(self.run_request("get", atomic=True), "default")
+
+    def test_other_apps_read_from_primary(self, _):
+        self.assertEqual(self.run_request("get", model=ContentType), "default")
+
+    def test_client_is_pinned_to_primary_after_a_write(self, _):
+        self.run_request("post")
+        self.assertEqual(self.run_request("get"), "default")
+
+    def test_failed_writes_do_not_pin_the_client(self, _):
+        self.run_request("post", status_code=400)
+        self.assertEqual(self.run_request("get"), "replica")
+
+    def test_reads_outside_requests_use_primary(self, _):
+        self.assertEqual(self.router.db_for_read(Product), "default")
+
+    def test_replica_needs_a_shared_cache(self, _):
+        per_process = {"default": {"BACKEND": "InventoryManagement.utils.cache_backends.InstrumentedLocMemCache"}}
+        with override_settings(CACHES=per_process):
+            errors = check_replica_pin_cache(None)
+        self.assertEqual([error.id for error in errors], ["InventoryManagement.E001"])
+
+        shared = {"default": {"BACKEND": "InventoryManagement.utils.cache_backends.InstrumentedRedisCache"}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_replica_pin_cache(None), [])
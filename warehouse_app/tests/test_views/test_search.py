@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from warehouse_app.filters import TrigramSearchFilter
+from warehouse_app.models import Category, Employee, Order, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+employee_endpoint = "http://localhost:8000/employees/"
+products_endpoint = "http://localhost:8000/products/"
+orders_endpoint = "http://localhost:8000/orders/"
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the trigram search of products, orders and employees
+# ----------------------------------------------------------------------------------
+
+
+class TrigramSearchTestCase(APITestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Trigram search only runs on PostgreSQL")
+
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            for name in ["Ibuprofen", "Ibuprofan gel", "Amoxicillin", "Paracetamol 500mg"]:
+                Product.objects.create(
+                    name=name,
+                    category=self.category,
+                    measurement_unit=Product.MeasurementUnit.BOX,
+                    quantity=100,
+                    unit_price=1500,
+                    warehouse=self.warehouse,
+                )
+            for customer in ["Jonathan Smith", "Mary Jones"]:
+                Order.objects.create(
+                    warehouse=self.warehouse,
+                    customer=customer,
+                    initiator=self.admin_user,
+                    total_price=1500,
+                )
+
+        with set_current_context(self.admin_user, skip_signal=True):
+            for first_name, last_name in [("John", "Smith"), ("John", "Doe"), ("Jane", "Smith")]:
+                user = User.objects.create_user(
+                    email=f"{first_name}.{last_name}@gmail.com".lower(),
+                    username=f"{first_name}{last_name}".lower(),
+                    password="987654321@",
+                )
+                Employee.objects.create(
+                    warehouse=self.warehouse,
+                    user=user,
+                    first_name=first_name,
+                    last_name=last_name,
+                    phone_number="+237659789941",
+                )
+
+    def search(self, endpoint, term):
+        response = self.client.get(endpoint, {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_search_matches_substrings(self):
+        results = self.search(products_endpoint, "CILL")
+        self.assertEqual([product["name"] for product in results], ["Amoxicillin"])
+
+    def test_search_tolerates_typos(self):
+        results = self.search(products_endpoint, "paracetmol")
+        self.assertEqual([product["name"] for product in results], ["Paracetamol 500mg"])
+
+    def test_search_ranks_closest_match_first(self):
+        results = self.search(products_endpoint, "ibuprofen")
+        self.assertEqual(
+            [product["name"] for product in results], ["Ibuprofen", "Ibuprofan gel"]
+        )
+
+    def test_search_orders_by_customer(self):
+        results = self.search(orders_endpoint, "smith")
+        self.assertEqual([order["customer"] for order in results], ["Jonathan Smith"])
+
+    def test_search_employees_matches_every_term(self):
+        results = self.search(employee_endpoint, "john smith")
+        self.assertEqual(
+            [(employee["first_name"], employee["last_name"]) for employee in results],
+            [("John", "Smith")],
+        )
+
+    def test_search_uses_trigram_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        request = mock.Mock(query_params={"search": "ibuprofen"})
+        view = mock.Mock(search_fields=["name"])
+
+        queryset = TrigramSearchFilter().filter_queryset(request, Product.objects.all(), view)
+        plan = queryset.explain()
+        self.assertIn("product_name_trgm_idx", plan, msg=plan)
+
+    def test_search_falls_back_to_icontains_on_other_databases(self):
+        with mock.patch("warehouse_app.filters.connections") as connections:
+            connections.__getitem__.return_value.vendor = "sqlite"
+            results = self.search(products_endpoint, "paracetmol")
+            self.assertEqual(results, [])
+
+            results = self.search(products_endpoint, "paracetamol")
+            self.assertEqual([product["name"] for product in results], ["Paracetamol 500mg"])
@@ -0,0 +1,134 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from warehouse_app.models import Category, Order, OrderPartialPayment, Product, Warehouse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from InventoryManagement.utils.context_manager import set_current_context
+
+User = get_user_model()
+
+warehouse_endpoint = "http://localhost:8000/warehouses/"
+products_endpoint = "http://localhost:8000/products/"
+orders_endpoint = "http://localhost:8000/orders/"
+
+
+def list_query(context, table):
+    """Helper method returning the query listing the rows of the table (not the page count)."""
+    return next(
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith(f'SELECT "{table}"."id"')
+    )
+
+
+# ----------------------------------------------------------------------------------
+#           Testing the ?fields= and ?expand= parameters of the list endpoints
+# ----------------------------------------------------------------------------------
+
+
+class SparseFieldsetTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME="localhost")
+
+        self.admin_user = User.objects.create_superuser(
+            email="myadmin@gmail.com", username="myadmin", password="987654321@"
+        )
+        admin_refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {admin_refresh.access_token}")
+
+        with set_current_context(self.admin_user):
+            self.warehouse = Warehouse.objects.create(name="Site 1", location="London")
+            self.category = Category.objects.create(name="Category 1")
+            self.product = Product.objects.create(
+                name="Product A",
+                category=self.category,
+                measurement_unit=Product.MeasurementUnit.BOX,
+                quantity=100,
+                unit_price=1500,
+                warehouse=self.warehouse,
+            )
+            self.order = Order.objects.create(
+                warehouse=self.warehouse,
+                customer="Customer 1",
+                initiator=self.admin_user,
+                total_price=1500,
+            )
+            self.payment = OrderPartialPayment.objects.create(order=self.order, amount=500)
+
+    def test_default_output_is_unchanged(self):
+        response = self.client.get(orders_endpoint)
+        order = response.data["results"][0]
+        self.assertEqual(order["warehouse"]["name"], "Site 1")
+        self.assertEqual(order["initiator"]["email"], "myadmin@gmail.com")
+        self.assertEqual(order["remainder"], 1000)
+
+    def test_fields_are_pruned(self):
+        response = self.client.get(products_endpoint, {"fields": "id,name,quantity"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": str(self.product.id), "name": "Product A", "quantity": 100}],
+        )
+
+    def test_not_expanded_relations_are_ids(self):
+        response = self.client.get(orders_endpoint, {"expand": "warehouse"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        order = response.data["results"][0]
+        self.assertEqual(order["warehouse"]["name"], "Site 1")
+        self.assertEqual(order["initiator"], self.admin_user.id)
+        self.assertEqual(order["partial_payments"], [self.payment.id])
+        self.assertEqual(order["remainder"], 1000)
+
+    def test_unknown_fields(self):
+        response = self.client.get(orders_endpoint, {"fields": "id,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["fields"], "Unknown fields: secret")
+
+        response = self.client.get(orders_endpoint, {"expand": "customer_wife"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_relations_of_pruned_fields_are_not_loaded(self):
+        with CaptureQueriesContext(connection) as default_context:
+            self.client.get(orders_endpoint)
+        with CaptureQueriesContext(connection) as sparse_context:
+            response = self.client.get(orders_endpoint, {"fields": "id,customer,initiator"})
+
+        self.assertEqual(response.data["results"][0]["initiator"]["email"], "myadmin@gmail.com")
+        self.assertIn("JOIN", list_query(default_context, "warehouse_app_order"))
+        self.assertNotIn("warehouse_app_warehouse", list_query(sparse_context, "warehouse_app_order"))
+        self.assertLess(len(sparse_context.captured_queries), len(default_context.captured_queries))
+
+    def test_collapsed_to_one_relations_are_not_joined(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(products_endpoint, {"expand": ""})
+
+        product = response.data["results"][0]
+        self.assertEqual(product["category"], self.category.id)
+        self.assertEqual(product["warehouse"], self.warehouse.id)
+        self.assertNotIn("JOIN", list_query(context, "warehouse_app_product"))
+
+    def test_warehouse_counts_are_only_annotated_when_requested(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(warehouse_endpoint, {"fields": "id,name,product_count"})
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": str(self.warehouse.id), "name": "Site 1", "product_count": 1}],
+        )
+        query = list_query(context, "warehouse_app_warehouse")
+        self.assertIn("warehouse_app_product", query)
+        self.assertNotIn("warehouse_app_order", query)
+
+    def test_write_requests_ignore_the_parameters(self):
+        response = self.client.patch(
+            f"{products_endpoint}{self.product.id}/?fields=id", {"quantity": 50}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["quantity"], 50)
@@ -9,6 +9,7 @@ from rest_framework.permissions import (
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.settings import api_settings
 
 from django_filters.rest_framework import DjangoFilterBackend
 from easyaudit.models import CRUDEvent
@@ -23,6 +24,15 @@ from warehouse_app.filters import (
     EmployeeFilter,
     OrderFilter,
     ProductFilter,
+    TrigramSearchFilter,
+)
+from warehouse_app.cache import category_cache
+from warehouse_app.mixins import (
+    CachedListMixin,
+    CompiledListMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    SparseFieldsetMixin,
 )
 from warehouse_app.models import (
     Category,
@@ -33,7 +43,7 @@ from warehouse_app.models import (
     OrderItem,
     OrderPartialPayment,
 )
-from warehouse_app.paginators import CustomPageNumberPagination
+from warehouse_app.paginators import CursorOrPageNumberPagination, CustomPageNumberPagination
 from warehouse_app.permissions import (
     IsSuperUserOrCanRead,
     IsSuperUserOrEmployeeOfWarehouseOfOrder,
@@ -45,6 +55,7 @@ from warehouse_app.permissions import (
 )
 from warehouse_app.serializers import (
     ActivateOrDeactivateUserSerializer,
+    BulkEmployeeActionSerializer,
     CategoryModelSerializer,
     CreateEmployeeSerializer,
     CreateOrderPartialPaymentSerializer,
@@ -53,6 +64,8 @@ from warehouse_app.serializers import (
     CrudEventModelSerializer,
     DashboardDataSerializer,
     EmployeeModelSerializer,
+    ImportEmployeesSerializer,
+    ImportProductsSerializer,
     OrderModelSerializer,
     ProductModelSerializer,
     ProductsCountSerializer,
@@ -70,19 +83,43 @@ from datetime import datetime
 from django.utils import timezone
 
 
-class WarehouseModelViewset(viewsets.ModelViewSet):
+class WarehouseModelViewset(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     http_method_names = ["get", "post", "put", "patch"]
     pagination_class = CustomPageNumberPagination
     permission_classes = [IsAuthenticated, IsSuperUserOrWarehouseManagerCanRead]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ["name", "location"]
     ordering_fields = ["created_at"]
+    # The users of the employees and the initiators of the orders are nested
+    etag_nests_users = True
+    field_relations = {
+        "employees": {"prefetch_related": ["employees__user", "employees__warehouse"]},
+        "products": {"prefetch_related": ["products__warehouse"]},
+        "orders": {"prefetch_related": ["orders__initiator", "orders__warehouse"]},
+    }
+
+    def get_etag_dependencies(self, queryset):
+        # The counts of the list and the rows nested in the detail
+        warehouses = queryset.values("pk")
+        return [
+            Employee.objects.filter(warehouse__in=warehouses),
+            Product.objects.filter(warehouse__in=warehouses),
+            Order.objects.filter(warehouse__in=warehouses),
+        ]
 
     def get_queryset(self):
+        # Only the counts that are rendered
+        counts = {
+            "employees_count": ("employee_count", Count('employees', distinct=True)),
+            "products_count": ("product_count", Count('products', distinct=True)),
+            "orders_count": ("order_count", Count('orders', distinct=True)),
+        }
         queryset = Warehouse.objects.annotate(
-            employees_count=Count('employees', distinct=True),
-            products_count=Count('products', distinct=True),
-            orders_count=Count('orders', distinct=True)
+            **{
+                annotation: count
+                for annotation, (field, count) in counts.items()
+                if self.is_field_requested(field)
+            }
         ).order_by("-created_at")
         
         if self.action == 'retrieve':
@@ -113,20 +150,35 @@ class WarehouseModelViewset(viewsets.ModelViewSet):
 
 
 # Add a new endpoint employee/me for the employees to view and update their info
-class EmployeeModelViewset(viewsets.ModelViewSet):
+class EmployeeModelViewset(SparseFieldsetMixin, CompiledListMixin, viewsets.ModelViewSet):
     http_method_names = ["get", "post", "patch"]
     pagination_class = CustomPageNumberPagination
     permission_classes = [IsAuthenticated, IsSuperUserOrIsWarehouseManager]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, OrderingFilter]
     parser_classes = [MultiPartParser, FormParser]
     filterset_class = EmployeeFilter
     search_fields = ["first_name", "last_name"]
     ordering_fields = ["created_at", "modified_at"]
+    field_relations = {
+        "user": {"select_related": ["user"]},
+        "warehouse": {"select_related": ["warehouse"]},
+    }
+    # Action: BulkEmployeeActionSerializer operation
+    bulk_actions = {
+        "bulk_block": "block",
+        "bulk_unblock": "unblock",
+        "bulk_set_manager": "set-manager",
+        "bulk_set_employee": "set-employee",
+    }
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             if self.action == "create":
                 return CreateEmployeeSerializer
+            elif self.action == "import_employees":
+                return ImportEmployeesSerializer
+            elif self.action in self.bulk_actions:
+                return BulkEmployeeActionSerializer
             else:
                 return ActivateOrDeactivateUserSerializer
         elif self.request.method == "GET":
@@ -181,6 +233,71 @@ class EmployeeModelViewset(viewsets.ModelViewSet):
         # Proceed with the normal filtering process
         return super().filter_queryset(queryset)
 
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="import",
+        parser_classes=api_settings.DEFAULT_PARSER_CLASSES,
+    )
+    def import_employees(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        employees = serializer.save()
+        return Response(
+            {"created": len(employees), "ids": [employee.id for employee in employees]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    def bulk_update_employees(self, request):
+        context = {
+            **self.get_serializer_context(),
+            "employees": self.get_queryset(),
+            "operation": self.bulk_actions[self.action],
+        }
+        serializer = self.get_serializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        employees = serializer.save()
+        return Response(
+            {"updated": len(employees), "ids": [employee.id for employee in employees]},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="bulk-block",
+        parser_classes=api_settings.DEFAULT_PARSER_CLASSES,
+    )
+    def bulk_block(self, request):
+        return self.bulk_update_employees(request)
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="bulk-unblock",
+        parser_classes=api_settings.DEFAULT_PARSER_CLASSES,
+    )
+    def bulk_unblock(self, request):
+        return self.bulk_update_employees(request)
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="bulk-set-manager",
+        parser_classes=api_settings.DEFAULT_PARSER_CLASSES,
+    )
+    def bulk_set_manager(self, request):
+        return self.bulk_update_employees(request)
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="bulk-set-employee",
+        parser_classes=api_settings.DEFAULT_PARSER_CLASSES,
+    )
+    def bulk_set_employee(self, request):
+        return self.bulk_update_employees(request)
+
     @action(
         detail=True,
         methods=["POST"],
@@ -320,7 +437,7 @@ class CrudEventReadOnlyModelViewset(viewsets.ReadOnlyModelViewSet):
                 elif user.role == User.ROLES.EMPLOYEE:
                     queryset = (
                         CRUDEvent.objects.select_related("user", "content_type")
-                        .filter(user=user)
+                        .filter(user__id=user.pk)
                         .order_by("-datetime")
                     )
                 else:
@@ -360,16 +477,37 @@ class CrudEventReadOnlyModelViewset(viewsets.ReadOnlyModelViewSet):
         return super().filter_queryset(queryset)
 
 
-class ProductModelViewset(viewsets.ModelViewSet):
+class ProductModelViewset(
+    ConditionalGetMixin, SparseFieldsetMixin, CompiledListMixin, ExportMixin, viewsets.ModelViewSet
+):
     http_method_names = ["get", "post", "patch"]
-    pagination_class = CustomPageNumberPagination
+    pagination_class = CursorOrPageNumberPagination
     serializer_class = ProductModelSerializer
     permission_classes = [IsAuthenticated, IsSuperUserOrIsWarehouseManagerOrReadOnly]
     parser_classes = [MultiPartParser, FormParser]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, OrderingFilter]
     filterset_class = ProductFilter
     search_fields = ["name"]
     ordering_fields = ["unit_price", "quantity"]
+    etag_related_fields = ["warehouse", "category"]
+    field_relations = {
+        "warehouse": {"select_related": ["warehouse"]},
+        "category": {"select_related": ["category"]},
+    }
+    export_columns = [
+        ("id", "id"),
+        ("name", "name"),
+        ("category", "category__name"),
+        ("warehouse", "warehouse__name"),
+        ("measurement_unit", "measurement_unit"),
+        ("quantity", "quantity"),
+        ("unit_price", "unit_price"),
+        ("is_available", "is_available"),
+        ("expiratory_date", "expiratory_date"),
+        ("created_at", "created_at"),
+        ("modified_at", "modified_at"),
+        ("sku", "sku"),
+    ]
 
     def get_queryset(self):
         user = self.request.user
@@ -395,6 +533,8 @@ class ProductModelViewset(viewsets.ModelViewSet):
         if self.request.method == "GET":
             return ProductModelSerializer
         elif self.request.method == "POST":
+            if self.action == "import_products":
+                return ImportProductsSerializer
             return CreateProductModelSerializer
         return UpdateProductModelSerializer
 
@@ -427,13 +567,31 @@ class ProductModelViewset(viewsets.ModelViewSet):
         # Proceed with the normal filtering process
         return super().filter_queryset(queryset)
 
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="import",
+    )
+    def import_products(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save(), status=status.HTTP_200_OK)
+
 
 
-class CategoryModelViewset(viewsets.ModelViewSet):
+class CategoryModelViewset(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     http_method_names = ["get", "post"]
     pagination_class = CustomPageNumberPagination
     permission_classes = [IsAuthenticated, IsSuperUserOrCanRead]
     serializer_class = CategoryModelSerializer
+    list_cache = category_cache
+    list_cache_max_age_setting = "CATEGORY_CACHE_MAX_AGE"
+
+    def get_etag_fingerprint(self, queryset):
+        # Any category change bumps the version of the cached pages
+        if self.action == "list":
+            return self.list_cache.get_version()
+        return super().get_etag_fingerprint(queryset)
 
     def get_queryset(self):
         queryset = Category.objects.all().order_by("-created_at")
@@ -454,14 +612,44 @@ class CategoryModelViewset(viewsets.ModelViewSet):
         return context
 
 
-class OrderModelViewset(viewsets.ModelViewSet):
+class OrderModelViewset(
+    ConditionalGetMixin, SparseFieldsetMixin, CompiledListMixin, ExportMixin, viewsets.ModelViewSet
+):
     http_method_names = ["get", "post"]
-    pagination_class = CustomPageNumberPagination
+    pagination_class = CursorOrPageNumberPagination
     permission_classes = [IsAuthenticated, IsSuperUserOrWarehouseEmployee]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, OrderingFilter]
     search_fields = ["customer"]
     filterset_class = OrderFilter
     ordering_fields = ["created_at", "modified_at"]
+    etag_related_fields = ["warehouse"]
+    # The initiator is nested
+    etag_nests_users = True
+    field_relations = {
+        "warehouse": {"select_related": ["warehouse"]},
+        "initiator": {"select_related": ["initiator"]},
+        "order_items": {"prefetch_related": ["order_items__product"]},
+        "partial_payments": {"prefetch_related": ["partial_payments"]},
+        # Computed from the payments
+        "remainder": {"prefetch_related": ["partial_payments"]},
+    }
+    export_columns = [
+        ("id", "id"),
+        ("tracking_id", "tracking_id"),
+        ("customer", "customer"),
+        ("customer_phone_number", "customer_phone_number"),
+        ("order_status", "order_status"),
+        ("warehouse", "warehouse__name"),
+        ("initiator", "initiator__email"),
+        ("total_price", "total_price"),
+        ("remainder", OrderModelSerializer.Meta.compiled_fields["remainder"]),
+        ("created_at", "created_at"),
+        ("modified_at", "modified_at"),
+    ]
+
+    def get_etag_dependencies(self, queryset):
+        # The ordered products are nested in the order items
+        return [Product.objects.filter(order_items__order__in=queryset.values("pk"))]
 
     def get_serializer_class(self):
         if self.request.method == "POST":